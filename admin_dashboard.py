@@ -5,6 +5,33 @@ import datetime
 import sqlite3
 import json
 from pathlib import Path
+from monitoring_writer import MonitoringWriter, configure_connection
+from table_models import CappedTableModel
+from db_status import OfflineBanner, db_status_notifier
+
+# Versi schema admin_monitoring.db (disimpan di PRAGMA user_version)
+MONITORING_SCHEMA_VERSION = 1
+
+# Batas baris di tabel dashboard (refresh hanya prepend baris baru)
+ACTIVITY_ROW_CAP = 200
+USER_ROW_CAP = 2000
+
+# SQL yang sama dengan normalize_action_code(), dipakai untuk backfill/trigger
+_ACTION_CODE_SQL = (
+    "CASE WHEN upper({col}) LIKE '%LOGIN%' THEN 'LOGIN' "
+    "ELSE upper(COALESCE({col}, '')) END"
+)
+
+
+def normalize_action_code(action) -> str:
+    """
+    Kode aksi yang sudah dinormalisasi untuk user_activities.action_code.
+    Semua varian login (LOGIN, USER_LOGIN, LOGIN_FAILED, ...) → 'LOGIN',
+    sama dengan filter lama `action LIKE '%LOGIN%'` tapi bisa pakai index.
+    """
+    action = (action or "").upper()
+    return "LOGIN" if "LOGIN" in action else action
+
 
 class EnhancedAdminDashboard(QtWidgets.QMainWindow):
     def __init__(self, username="admin"):
@@ -20,7 +47,11 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
         self.auto_refresh_timer = QtCore.QTimer()
         self.auto_refresh_timer.timeout.connect(self.auto_check_new_users)
         self.auto_refresh_enabled = True
-        self.last_user_count = 0
+        # High-water mark: id terakhir yang sudah ada di tabel. Baru dipakai
+        # untuk deteksi user baru setelah load_users() pertama sukses.
+        self.last_user_id = 0
+        self.users_loaded = False
+        self.last_activity_id = 0
         
         # Setup UI
         self.setup_ui()
@@ -38,6 +69,7 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
         """Setup database untuk monitoring."""
         self.monitoring_db = "admin_monitoring.db"
         with sqlite3.connect(self.monitoring_db) as conn:
+            configure_connection(conn)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS user_activities (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -72,6 +104,114 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
                     details TEXT
                 )
             """)
+            
+            if conn.execute("PRAGMA user_version").fetchone()[0] < MONITORING_SCHEMA_VERSION:
+                self.upgrade_monitoring_db(conn)
+        
+        # Semua insert monitoring lewat background writer (batch, non-blocking)
+        self.monitor_writer = MonitoringWriter(self.monitoring_db)
+        self.monitor_writer.start()
+        
+    def upgrade_monitoring_db(self, conn):
+        """
+        Schema v1: action_code ternormalisasi, index komposit, dan tabel
+        ringkasan per jam yang diisi trigger saat insert. Kartu monitoring
+        dan laporan membaca bucket ini, bukan full scan user_activities.
+        """
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(user_activities)")]
+        if "action_code" not in columns:
+            conn.execute("ALTER TABLE user_activities ADD COLUMN action_code TEXT")
+        conn.execute(f"""
+            UPDATE user_activities SET action_code = {_ACTION_CODE_SQL.format(col='action')}
+            WHERE action_code IS NULL
+        """)
+        
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_user_activities_action_time ON user_activities(action_code, timestamp)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_user_activities_user_time ON user_activities(username, timestamp)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_user_activities_time ON user_activities(timestamp)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_admin_actions_time ON admin_actions(timestamp)")
+        
+        # Ringkasan per jam (hour = 'YYYY-MM-DD HH:00:00', UTC seperti CURRENT_TIMESTAMP)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS activity_hourly (
+                hour TEXT NOT NULL,
+                action_code TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                failed INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (hour, action_code)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS user_activity_hourly (
+                hour TEXT NOT NULL,
+                username TEXT NOT NULL,
+                action_code TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (hour, username, action_code)
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS admin_actions_hourly (
+                hour TEXT PRIMARY KEY,
+                total INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_activity_hourly_action ON activity_hourly(action_code, hour)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_user_activity_hourly_action ON user_activity_hourly(action_code, hour)")
+        
+        # Trigger: update bucket setiap insert (INSERT OR IGNORE + UPDATE
+        # supaya jalan juga di SQLite lama tanpa UPSERT)
+        code = f"COALESCE(NEW.action_code, {_ACTION_CODE_SQL.format(col='NEW.action')})"
+        hour = "strftime('%Y-%m-%d %H:00:00', NEW.timestamp)"
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_user_activities_hourly
+            AFTER INSERT ON user_activities
+            BEGIN
+                INSERT OR IGNORE INTO activity_hourly (hour, action_code)
+                VALUES ({hour}, {code});
+                UPDATE activity_hourly
+                SET total = total + 1, failed = failed + (NEW.success = 0)
+                WHERE hour = {hour} AND action_code = {code};
+                
+                INSERT OR IGNORE INTO user_activity_hourly (hour, username, action_code)
+                VALUES ({hour}, COALESCE(NEW.username, ''), {code});
+                UPDATE user_activity_hourly SET total = total + 1
+                WHERE hour = {hour} AND username = COALESCE(NEW.username, '')
+                  AND action_code = {code};
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_admin_actions_hourly
+            AFTER INSERT ON admin_actions
+            BEGIN
+                INSERT OR IGNORE INTO admin_actions_hourly (hour) VALUES ({hour});
+                UPDATE admin_actions_hourly SET total = total + 1 WHERE hour = {hour};
+            END
+        """)
+        
+        # Backfill bucket dari data lama (sekali saja, saat upgrade)
+        conn.execute("DELETE FROM activity_hourly")
+        conn.execute("DELETE FROM user_activity_hourly")
+        conn.execute("DELETE FROM admin_actions_hourly")
+        conn.execute("""
+            INSERT INTO activity_hourly (hour, action_code, total, failed)
+            SELECT strftime('%Y-%m-%d %H:00:00', timestamp), action_code,
+                   COUNT(*), SUM(success = 0)
+            FROM user_activities GROUP BY 1, 2
+        """)
+        conn.execute("""
+            INSERT INTO user_activity_hourly (hour, username, action_code, total)
+            SELECT strftime('%Y-%m-%d %H:00:00', timestamp), COALESCE(username, ''),
+                   action_code, COUNT(*)
+            FROM user_activities GROUP BY 1, 2, 3
+        """)
+        conn.execute("""
+            INSERT INTO admin_actions_hourly (hour, total)
+            SELECT strftime('%Y-%m-%d %H:00:00', timestamp), COUNT(*)
+            FROM admin_actions GROUP BY 1
+        """)
+        
+        conn.execute(f"PRAGMA user_version = {MONITORING_SCHEMA_VERSION}")
         
     def setup_ui(self):
         central = QtWidgets.QWidget()
@@ -86,6 +226,10 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
         title.setStyleSheet("font-size: 20px; font-weight: 700; margin: 8px 0; color: #4f46e5;")
         main_layout.addWidget(title)
         
+        # Banner degraded state (muncul saat database offline)
+        main_layout.addWidget(OfflineBanner())
+        db_status_notifier().status_changed.connect(self._on_db_status_changed)
+        
         # Tab widget untuk berbagai fungsi
         self.tab_widget = QtWidgets.QTabWidget()
         main_layout.addWidget(self.tab_widget)
@@ -165,8 +309,12 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
         layout.addLayout(toolbar)
         
         # Tabel user
-        self.table = QtWidgets.QTableWidget(0, 5)
-        self.table.setHorizontalHeaderLabels(["ID", "Username", "Role", "Status", "Last Login"])
+        self.users_model = CappedTableModel(
+            ["ID", "Username", "Role", "Status", "Last Login"], max_rows=USER_ROW_CAP, parent=self
+        )
+        self.table = QtWidgets.QTableView()
+        self.table.setModel(self.users_model)
+        self.table.verticalHeader().setVisible(False)
         self.table.horizontalHeader().setStretchLastSection(True)
         self.table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
         self.table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
@@ -241,8 +389,13 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
         activities_group = QtWidgets.QGroupBox("📋 Recent User Activities")
         activities_layout = QtWidgets.QVBoxLayout(activities_group)
         
-        self.activities_table = QtWidgets.QTableWidget(0, 5)
-        self.activities_table.setHorizontalHeaderLabels(["Time", "Username", "Action", "Details", "Success"])
+        self.activities_model = CappedTableModel(
+            ["Time", "Username", "Action", "Details", "Success"], max_rows=ACTIVITY_ROW_CAP, parent=self
+        )
+        self.activities_table = QtWidgets.QTableView()
+        self.activities_table.setModel(self.activities_model)
+        self.activities_table.verticalHeader().setVisible(False)
+        self.activities_table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
         
         header = self.activities_table.horizontalHeader()
         header.setStretchLastSection(True)
@@ -354,22 +507,20 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
         return {'widget': card_widget, 'value_label': value_label}
         
     def log_admin_activity(self, action, details="", target_user=""):
-        """Log admin activities untuk monitoring."""
-        with sqlite3.connect(self.monitoring_db) as conn:
-            conn.execute("""
-                INSERT INTO admin_actions (admin_username, action, target_user, details)
-                VALUES (?, ?, ?, ?)
-            """, (self.username, action, target_user, details))
+        """Log admin activities untuk monitoring (async via writer thread)."""
+        self.monitor_writer.submit("""
+            INSERT INTO admin_actions (admin_username, action, target_user, details)
+            VALUES (?, ?, ?, ?)
+        """, (self.username, action, target_user, details))
         
         self.add_log(f"🔧 ADMIN: {action} - {details}")
         
     def log_user_activity(self, username, action, details="", success=True):
-        """Log user activities."""
-        with sqlite3.connect(self.monitoring_db) as conn:
-            conn.execute("""
-                INSERT INTO user_activities (username, action, details, success)
-                VALUES (?, ?, ?, ?)
-            """, (username, action, details, success))
+        """Log user activities (async via writer thread)."""
+        self.monitor_writer.submit("""
+            INSERT INTO user_activities (username, action, action_code, details, success)
+            VALUES (?, ?, ?, ?, ?)
+        """, (username, action, normalize_action_code(action), details, success))
             
     def load_monitoring_data(self):
         """Load monitoring data untuk tab monitoring."""
@@ -377,26 +528,22 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
             with sqlite3.connect(self.monitoring_db) as conn:
                 cursor = conn.cursor()
                 
-                # Total logins
-                cursor.execute("SELECT COUNT(*) FROM user_activities WHERE action LIKE '%LOGIN%'")
-                total_logins = cursor.fetchone()[0]
-                
-                # Active today
+                # Kartu dibaca dari bucket per jam (bukan scan user_activities)
                 cursor.execute("""
-                    SELECT COUNT(DISTINCT username) FROM user_activities 
-                    WHERE date(timestamp) = date('now') AND action LIKE '%LOGIN%'
+                    SELECT COALESCE(SUM(total), 0), COALESCE(SUM(failed), 0)
+                    FROM activity_hourly WHERE action_code = 'LOGIN'
                 """)
-                active_today = cursor.fetchone()[0]
+                total_logins, failed_attempts = cursor.fetchone()
                 
-                # Failed attempts
+                # Active today
                 cursor.execute("""
-                    SELECT COUNT(*) FROM user_activities 
-                    WHERE action LIKE '%LOGIN%' AND success = 0
+                    SELECT COUNT(DISTINCT username) FROM user_activity_hourly
+                    WHERE action_code = 'LOGIN' AND hour >= date('now')
                 """)
-                failed_attempts = cursor.fetchone()[0]
+                active_today = cursor.fetchone()[0]
                 
                 # Admin actions
-                cursor.execute("SELECT COUNT(*) FROM admin_actions")
+                cursor.execute("SELECT COALESCE(SUM(total), 0) FROM admin_actions_hourly")
                 admin_actions = cursor.fetchone()[0]
                 
                 # Update statistics cards
@@ -405,18 +552,23 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
                 self.stats_cards["failed_attempts"].setText(str(failed_attempts))
                 self.stats_cards["admin_actions"].setText(str(admin_actions))
                 
-                # Load recent activities
+                # Load activities baru saja (id > high-water mark)
                 cursor.execute("""
-                    SELECT timestamp, username, action, details, success
-                    FROM user_activities 
-                    ORDER BY timestamp DESC 
-                    LIMIT 50
-                """)
+                    SELECT id, timestamp, username, action, details, success
+                    FROM user_activities
+                    WHERE id > ?
+                    ORDER BY id DESC
+                    LIMIT ?
+                """, (self.last_activity_id, ACTIVITY_ROW_CAP))
                 
                 activities = cursor.fetchall()
-                self.activities_table.setRowCount(len(activities))
+                if not activities:
+                    return
+                self.last_activity_id = activities[0][0]
                 
-                for row, (timestamp, username, action, details, success) in enumerate(activities):
+                rows = []
+                backgrounds = []
+                for _, timestamp, username, action, details, success in activities:
                     # Format timestamp
                     try:
                         dt = datetime.datetime.fromisoformat(timestamp)
@@ -424,16 +576,14 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
                     except:
                         time_str = timestamp.split(' ')[-1] if ' ' in timestamp else timestamp
                     
-                    self.activities_table.setItem(row, 0, QtWidgets.QTableWidgetItem(time_str))
-                    self.activities_table.setItem(row, 1, QtWidgets.QTableWidgetItem(username or "N/A"))
-                    self.activities_table.setItem(row, 2, QtWidgets.QTableWidgetItem(action or "N/A"))
-                    self.activities_table.setItem(row, 3, QtWidgets.QTableWidgetItem(details or "N/A"))
-                    
+                    rows.append([
+                        time_str, username or "N/A", action or "N/A", details or "N/A",
+                        "✅" if success else "❌"
+                    ])
                     # Success indicator with color
-                    success_item = QtWidgets.QTableWidgetItem("✅" if success else "❌")
-                    if not success:
-                        success_item.setBackground(QtGui.QColor("#fecaca"))
-                    self.activities_table.setItem(row, 4, success_item)
+                    backgrounds.append([None, None, None, None, None if success else "#fecaca"])
+                
+                self.activities_model.prepend_rows(rows, backgrounds)
                     
         except Exception as e:
             self.add_log(f"❌ Error loading monitoring data: {str(e)}")
@@ -451,24 +601,26 @@ class EnhancedAdminDashboard(QtWidgets.QMainWindow):
             with sqlite3.connect(self.monitoring_db) as conn:
                 cursor = conn.cursor()
                 
-                # Generate statistics report
-                cursor.execute(f"""
-                    SELECT COUNT(*) FROM user_activities 
-                    WHERE timestamp > datetime('now', '-{days} days')
-                """)
+                # Generate statistics report dari bucket per jam
+                since = f"-{days} days"
+                cursor.execute("""
+                    SELECT COALESCE(SUM(total), 0) FROM activity_hourly
+                    WHERE hour >= strftime('%Y-%m-%d %H:00:00', 'now', ?)
+                """, (since,))
                 total_activities = cursor.fetchone()[0]
                 
-                cursor.execute(f"""
-                    SELECT COUNT(DISTINCT username) FROM user_activities 
-                    WHERE timestamp > datetime('now', '-{days} days') AND action LIKE '%LOGIN%'
-                """)
+                cursor.execute("""
+                    SELECT COUNT(DISTINCT username) FROM user_activity_hourly
+                    WHERE action_code = 'LOGIN'
+                      AND hour >= strftime('%Y-%m-%d %H:00:00', 'now', ?)
+                """, (since,))
                 unique_users = cursor.fetchone()[0]
                 
-                cursor.execute(f"""
-                    SELECT username, COUNT(*) as count FROM user_activities 
-                    WHERE timestamp > datetime('now', '-{days} days')
+                cursor.execute("""
+                    SELECT username, SUM(total) as count FROM user_activity_hourly
+                    WHERE hour >= strftime('%Y-%m-%d %H:00:00', 'now', ?)
                     GROUP BY username ORDER BY count DESC LIMIT 10
-                """)
+                """, (since,))
                 top_users = cursor.fetchall()
                 
                 # Format report
@@ -511,6 +663,9 @@ Generated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
             
             layout = QtWidgets.QVBoxLayout(report_dialog)
             
+            # Pastikan insert yang masih di queue ikut masuk laporan
+            self.monitor_writer.flush()
+            
             # Generate comprehensive report
             with sqlite3.connect(self.monitoring_db) as conn:
                 cursor = conn.cursor()
@@ -598,6 +753,7 @@ Admin: {self.username}
             )
             
             if filename:
+                self.monitor_writer.flush()
                 with sqlite3.connect(self.monitoring_db) as conn:
                     cursor = conn.cursor()
                     
@@ -683,23 +839,23 @@ Admin: {self.username}
             
     def auto_check_new_users(self):
         """Cek otomatis apakah ada user baru."""
+        if not self.users_loaded:
+            # Load awal gagal (database offline) → muat diam-diam, jangan
+            # anggap semua user yang ada sebagai user baru
+            self.load_users()
+            return
         try:
             conn, _ = connect()
             if not conn:
                 return
             cur = conn.cursor()
-            cur.execute("SELECT COUNT(*) FROM users")
-            current_count = cur.fetchone()[0]
+            # Hanya id di atas high-water mark: range scan pkey, bukan COUNT(*) seluruh tabel
+            cur.execute("SELECT COUNT(*) FROM users WHERE id > %s", (self.last_user_id,))
+            new_users = cur.fetchone()[0]
             conn.close()
             
-            if self.last_user_count == 0:
-                # First time initialization
-                self.last_user_count = current_count
-                return
-                
-            if current_count > self.last_user_count:
+            if new_users > 0:
                 # Ada user baru!
-                new_users = current_count - self.last_user_count
                 self.add_log(f"🚨 ALERT: {new_users} user baru terdeteksi!")
                 self.status_label.setText(f"🔔 {new_users} user baru terdeteksi! Memuat ulang data...")
                 self.status_label.setStyleSheet("color: #dc2626; font-weight: 600; padding: 8px; background: #fef2f2; border-radius: 6px; margin: 4px 0;")
@@ -707,10 +863,9 @@ Admin: {self.username}
                 # Log new user detection
                 self.log_admin_activity("NEW_USER_DETECTED", f"{new_users} new users detected")
                 
-                # Refresh table
+                # Refresh table (incremental: hanya user baru yang diambil)
                 self.load_users()
                 self.load_monitoring_data()  # Refresh monitoring data too
-                self.last_user_count = current_count
                 
                 # Show notification
                 QtWidgets.QMessageBox.information(
@@ -725,6 +880,13 @@ Admin: {self.username}
         except Exception as e:
             self.add_log(f"❌ Error saat auto-check: {str(e)}")
             
+    def _on_db_status_changed(self, online, message):
+        """Catat perubahan status koneksi database di log"""
+        if online:
+            self.add_log("🟢 Koneksi database pulih")
+        else:
+            self.add_log(f"🔴 Database offline (fail-fast aktif): {message}")
+            
     def reset_status_message(self):
         """Reset status message ke normal."""
         if self.auto_refresh_enabled:
@@ -735,17 +897,30 @@ Admin: {self.username}
         """Refresh manual oleh admin."""
         self.add_log("🔄 Refresh manual oleh admin")
         self.log_admin_activity("MANUAL_REFRESH", "Performed manual refresh of user data")
-        self.load_users()
+        self.load_users(full=True)
         self.load_monitoring_data()
         
-    def load_users(self):
-        """Ambil semua user dari database dan tampilkan di tabel."""
+    def load_users(self, full=False):
+        """
+        Muat user ke tabel secara incremental: hanya user dengan id di atas
+        high-water mark yang diambil lalu di-prepend.
+        full=True → muat ulang semua (refresh manual, supaya perubahan role
+        atau user yang dihapus ikut terlihat).
+        """
+        if full:
+            self.last_user_id = 0
+            self.users_loaded = False
+        initial = not self.users_loaded
         try:
             conn, _ = connect()
             if not conn:
                 return
             cur = conn.cursor()
-            cur.execute("SELECT id, username, role FROM users ORDER BY id DESC")  # DESC untuk user terbaru di atas
+            # DESC untuk user terbaru di atas
+            cur.execute(
+                "SELECT id, username, role FROM users WHERE id > %s ORDER BY id DESC LIMIT %s",
+                (self.last_user_id, USER_ROW_CAP)
+            )
             rows = cur.fetchall()
             conn.close()
         except Exception as e:
@@ -753,34 +928,30 @@ Admin: {self.username}
             self.add_log(f"❌ DB Error: {str(e)}")
             return
 
-        self.table.setRowCount(0)
-        for r, (uid, uname, role) in enumerate(rows):
-            self.table.insertRow(r)
-            self.table.setItem(r, 0, QtWidgets.QTableWidgetItem(str(uid)))
-            self.table.setItem(r, 1, QtWidgets.QTableWidgetItem(uname))
-            self.table.setItem(r, 2, QtWidgets.QTableWidgetItem(role))
-            
-            # Status column - highlight user baru (ID tinggi)
-            if uid > self.last_user_count - len(rows) + 5:  # Rough estimation for "new"
-                status_item = QtWidgets.QTableWidgetItem("🆕 Baru")
-                status_item.setBackground(QtCore.Qt.yellow)
+        if initial:
+            self.users_model.clear()
+        self.users_loaded = True
+        if not rows:
+            return
+        self.last_user_id = rows[0][0]
+
+        table_rows = []
+        backgrounds = []
+        # Last login masih placeholder (could be enhanced with actual login tracking)
+        for uid, uname, role in rows:
+            # Status column - user yang muncul setelah load pertama ditandai baru
+            if initial:
+                table_rows.append([uid, uname, role, "✅ Lama", "N/A"])
+                backgrounds.append([None] * 5)
             else:
-                status_item = QtWidgets.QTableWidgetItem("✅ Lama")
-            
-            self.table.setItem(r, 3, status_item)
-            
-            # Last login info (placeholder - could be enhanced with actual login tracking)
-            last_login_item = QtWidgets.QTableWidgetItem("N/A")
-            self.table.setItem(r, 4, last_login_item)
-            
+                table_rows.append([uid, uname, role, "🆕 Baru", "N/A"])
+                backgrounds.append([None, None, None, "yellow", None])
+
+        self.users_model.prepend_rows(table_rows, backgrounds)
         self.table.resizeColumnsToContents()
         
-        # Update last user count
-        if rows:
-            self.last_user_count = len(rows)
-            
         # Log user view action
-        self.log_admin_activity("VIEW_USERS", f"Viewed user list - {len(rows)} users total")
+        self.log_admin_activity("VIEW_USERS", f"Viewed user list - {len(rows)} users loaded")
         
     def copy_selected_rows(self):
         """Salin baris terpilih (ID, Username, Role) ke clipboard."""
@@ -790,17 +961,14 @@ Admin: {self.username}
             return
         lines = []
         for idx in sel:
-            rid = self.table.item(idx.row(), 0).text()
-            uname = self.table.item(idx.row(), 1).text()
-            role = self.table.item(idx.row(), 2).text()
-            status = self.table.item(idx.row(), 3).text()
+            rid, uname, role, status = self.users_model.row_values(idx.row())[:4]
             lines.append(f"{rid}\t{uname}\t{role}\t{status}")
         QtWidgets.QApplication.clipboard().setText("\n".join(lines))
         QtWidgets.QMessageBox.information(self, "Disalin", "Data user sudah disalin ke clipboard.")
         self.add_log(f"📋 Data {len(sel)} user disalin ke clipboard")
         
         # Log copy action
-        copied_users = [self.table.item(idx.row(), 1).text() for idx in sel]
+        copied_users = [self.users_model.row_values(idx.row())[1] for idx in sel]
         self.log_admin_activity("COPY_USER_DATA", f"Copied data for users: {', '.join(copied_users)}")
         
     def add_log(self, message):
@@ -818,6 +986,8 @@ Admin: {self.username}
         self.stop_auto_refresh()
         self.add_log("🔴 Enhanced Admin dashboard ditutup")
         self.log_admin_activity("ADMIN_LOGOUT", f"Admin {self.username} logged out from dashboard")
+        # Tulis semua insert yang tersisa sebelum window ditutup
+        self.monitor_writer.close()
         event.accept()
     
     def open_database_manager(self):
@@ -7,6 +7,8 @@ Features:
 - User Management (CRUD operations)
 - News Management (CRUD operations)
 - Database Statistics & Analytics
+- Performance (pg_stat_statements, table & index health)
+- Index Advisor (candidate indexes from the workload, CONCURRENTLY migrations)
 - Backup & Export (JSON, CSV)
 - Database Health Monitoring
 """
@@ -14,6 +16,9 @@ Features:
 from PyQt5 import QtWidgets, QtCore, QtGui
 from PyQt5.QtCore import Qt
 from app_db_fixed import connect
+from app_db_admin import get_performance_snapshot, get_database_summary, reconcile_counters
+from app_db_index_advisor import analyze_workload, build_migration, SOURCE_STATEMENTS, SOURCE_APP
+from qt_workers import run_in_background
 import json
 import csv
 import datetime
@@ -58,8 +63,12 @@ class DatabaseManagerWindow(QtWidgets.QMainWindow):
         self._setup_users_tab()
         self._setup_news_tab()
         self._setup_statistics_tab()
+        self._setup_performance_tab()
+        self._setup_index_advisor_tab()
         self._setup_backup_tab()
         
+        self.tab_widget.currentChanged.connect(self._on_tab_changed)
+        
         # Status bar
         self.status_bar = self.statusBar()
         self.status_bar.showMessage("✅ Connected to database")
@@ -256,11 +265,21 @@ class DatabaseManagerWindow(QtWidgets.QMainWindow):
         stats_tab = QtWidgets.QWidget()
         layout = QtWidgets.QVBoxLayout(stats_tab)
         
-        # Refresh button
+        # Controls
+        controls = QtWidgets.QHBoxLayout()
+        
         refresh_stats_btn = QtWidgets.QPushButton("🔄 Refresh Statistics")
         refresh_stats_btn.setObjectName("primaryBtn")
         refresh_stats_btn.clicked.connect(self._load_statistics)
-        layout.addWidget(refresh_stats_btn)
+        
+        # Default pakai estimasi katalog; COUNT(*) sungguhan hanya kalau diminta
+        self.stats_exact_check = QtWidgets.QCheckBox("Exact counts (slow on large tables)")
+        self.stats_exact_check.toggled.connect(self._load_statistics)
+        
+        controls.addWidget(refresh_stats_btn)
+        controls.addWidget(self.stats_exact_check)
+        controls.addStretch()
+        layout.addLayout(controls)
         
         # Stats display
         self.stats_text = QtWidgets.QTextEdit()
@@ -270,9 +289,152 @@ class DatabaseManagerWindow(QtWidgets.QMainWindow):
         layout.addWidget(self.stats_text)
         
         self.tab_widget.addTab(stats_tab, "📊 Statistics")
+        self.stats_worker = None
+        self.stats_reload_pending = False
+        
+    def _setup_performance_tab(self):
+        """Tab 6: Performance (pg_stat_* views, refreshed in background)"""
+        perf_tab = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(perf_tab)
+        
+        # Controls
+        controls = QtWidgets.QHBoxLayout()
+        
+        refresh_perf_btn = QtWidgets.QPushButton("🔄 Refresh Performance")
+        refresh_perf_btn.setObjectName("primaryBtn")
+        refresh_perf_btn.clicked.connect(self._load_performance)
+        
+        self.perf_auto_check = QtWidgets.QCheckBox("Auto-refresh (15s)")
+        self.perf_auto_check.setChecked(True)
+        
+        controls.addWidget(refresh_perf_btn)
+        controls.addWidget(self.perf_auto_check)
+        controls.addStretch()
+        layout.addLayout(controls)
+        
+        # Sub-tabs untuk setiap sumber statistik
+        perf_tabs = QtWidgets.QTabWidget()
+        
+        statement_headers = ["Query", "Calls", "Total (ms)", "Mean (ms)", "Rows"]
+        self.perf_total_table = self._create_perf_table(statement_headers)
+        self.perf_mean_table = self._create_perf_table(statement_headers)
+        self.perf_tables_table = self._create_perf_table(
+            ["Table", "Seq Scans", "Index Scans", "Live Rows", "Dead Rows", "Dead %", "Last Vacuum"]
+        )
+        self.perf_indexes_table = self._create_perf_table(["Table", "Index", "Size", "Scans"])
+        
+        perf_tabs.addTab(self.perf_total_table, "⏱️ Top by Total Time")
+        perf_tabs.addTab(self.perf_mean_table, "🐢 Top by Mean Time")
+        perf_tabs.addTab(self.perf_tables_table, "📋 Table Scans & Bloat")
+        perf_tabs.addTab(self.perf_indexes_table, "🧹 Unused Indexes")
+        layout.addWidget(perf_tabs)
+        
+        # Status
+        self.perf_status = QtWidgets.QLabel("Open this tab to load performance data")
+        self.perf_status.setObjectName("infoLabel")
+        layout.addWidget(self.perf_status)
+        
+        self.tab_widget.addTab(perf_tab, "🚀 Performance")
+        self.perf_tab = perf_tab
+        self.perf_worker = None
+        
+        # Auto-refresh hanya jalan selama tab Performance terbuka
+        self.perf_timer = QtCore.QTimer(self)
+        self.perf_timer.timeout.connect(self._load_performance)
+        self.perf_auto_check.toggled.connect(self._update_perf_timer)
+        
+    def _setup_index_advisor_tab(self):
+        """Tab 7: Index Advisor (workload → candidate indexes → migration)"""
+        advisor_tab = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(advisor_tab)
+        
+        # Controls
+        controls = QtWidgets.QHBoxLayout()
+        
+        self.advisor_source_combo = QtWidgets.QComboBox()
+        self.advisor_source_combo.addItem("pg_stat_statements (production workload)", SOURCE_STATEMENTS)
+        self.advisor_source_combo.addItem("App queries (every data-layer helper)", SOURCE_APP)
+        
+        self.advisor_limit_spin = QtWidgets.QSpinBox()
+        self.advisor_limit_spin.setRange(5, 200)
+        self.advisor_limit_spin.setValue(20)
+        self.advisor_limit_spin.setPrefix("Top ")
+        self.advisor_limit_spin.setSuffix(" queries")
+        
+        self.advisor_trial_check = QtWidgets.QCheckBox("Trial real indexes")
+        self.advisor_trial_check.setToolTip(
+            "Without hypopg, build each candidate index inside a rolled-back transaction to "
+            "estimate its benefit.\n⚠️ Builds the index and blocks writes to the table while it runs."
+        )
+        
+        self.advisor_analyze_btn = QtWidgets.QPushButton("🔍 Analyze Workload")
+        self.advisor_analyze_btn.setObjectName("primaryBtn")
+        self.advisor_analyze_btn.clicked.connect(self._analyze_workload)
+        
+        controls.addWidget(self.advisor_source_combo)
+        controls.addWidget(self.advisor_limit_spin)
+        controls.addWidget(self.advisor_trial_check)
+        controls.addWidget(self.advisor_analyze_btn)
+        controls.addStretch()
+        layout.addLayout(controls)
+        
+        # Candidates (centang = ikut ke migration)
+        self.advisor_table = self._create_perf_table(
+            ["Index", "Table", "Columns", "Cost Before", "Cost After", "Improvement", "Saved (ms)", "Queries", "Reason"]
+        )
+        self.advisor_table.itemChanged.connect(self._update_advisor_migration)
+        layout.addWidget(self.advisor_table, 3)
+        
+        # Migration preview
+        migration_label = QtWidgets.QLabel("📜 Migration (checked candidates):")
+        migration_label.setObjectName("sectionLabel")
+        layout.addWidget(migration_label)
+        
+        self.advisor_sql = QtWidgets.QTextEdit()
+        self.advisor_sql.setObjectName("sqlInput")
+        self.advisor_sql.setReadOnly(True)
+        layout.addWidget(self.advisor_sql, 2)
+        
+        actions = QtWidgets.QHBoxLayout()
+        
+        copy_sql_btn = QtWidgets.QPushButton("📋 Copy SQL")
+        copy_sql_btn.setObjectName("secondaryBtn")
+        copy_sql_btn.clicked.connect(
+            lambda: QtWidgets.QApplication.clipboard().setText(self.advisor_sql.toPlainText())
+        )
+        
+        self.advisor_save_btn = QtWidgets.QPushButton("💾 Save Migration")
+        self.advisor_save_btn.setObjectName("primaryBtn")
+        self.advisor_save_btn.setEnabled(False)
+        self.advisor_save_btn.clicked.connect(self._save_advisor_migration)
+        
+        actions.addWidget(copy_sql_btn)
+        actions.addWidget(self.advisor_save_btn)
+        actions.addStretch()
+        layout.addLayout(actions)
+        
+        # Status
+        self.advisor_status = QtWidgets.QLabel("Choose a workload source and click Analyze Workload")
+        self.advisor_status.setObjectName("infoLabel")
+        layout.addWidget(self.advisor_status)
+        
+        self.tab_widget.addTab(advisor_tab, "🧭 Index Advisor")
+        self.advisor_worker = None
+        self.advisor_candidates = []
+        self.advisor_migration_path = None
+        
+    def _create_perf_table(self, headers: List[str]) -> QtWidgets.QTableWidget:
+        """Create read-only table for performance data"""
+        table = QtWidgets.QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.setAlternatingRowColors(True)
+        table.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
         
     def _setup_backup_tab(self):
-        """Tab 6: Backup & Export"""
+        """Tab 8: Backup & Export"""
         backup_tab = QtWidgets.QWidget()
         layout = QtWidgets.QVBoxLayout(backup_tab)
         
@@ -311,7 +473,14 @@ class DatabaseManagerWindow(QtWidgets.QMainWindow):
         self.health_display.setReadOnly(True)
         self.health_display.setMaximumHeight(200)
         
+        self.reconcile_btn = QtWidgets.QPushButton("🧮 Reconcile Counters")
+        self.reconcile_btn.setObjectName("secondaryBtn")
+        self.reconcile_btn.setToolTip("Recount per-user like/bookmark counters")
+        self.reconcile_btn.clicked.connect(self._reconcile_counters)
+        self.reconcile_worker = None
+        
         health_layout.addWidget(check_health_btn)
+        health_layout.addWidget(self.reconcile_btn)
         health_layout.addWidget(self.health_display)
         
         layout.addWidget(health_group)
@@ -325,6 +494,12 @@ class DatabaseManagerWindow(QtWidgets.QMainWindow):
         self._load_news()
         self._load_statistics()
         
+    def _on_tab_changed(self, index: int):
+        """Start/stop performance refresh depending on visible tab"""
+        if self.tab_widget.widget(index) is self.perf_tab:
+            self._load_performance()
+        self._update_perf_timer()
+        
     # ==================== Database Explorer ====================
     
     def _load_table_data(self):
@@ -770,16 +945,48 @@ class DatabaseManagerWindow(QtWidgets.QMainWindow):
     # ==================== Statistics ====================
     
     def _load_statistics(self):
-        """Load database statistics"""
-        try:
-            conn, _ = connect()
-            if not conn:
-                self.stats_text.setPlainText("❌ Failed to connect to database")
-                return
-                
-            cur = conn.cursor()
+        """Load database statistics (single round trip, background thread)"""
+        if self.stats_worker is not None:
+            # Previous load still running; reload once it ends (e.g. exact toggled)
+            self.stats_reload_pending = True
+            return
             
-            stats = f"""
+        self.stats_text.setPlainText("⏳ Loading statistics...")
+        self.stats_worker = run_in_background(
+            get_database_summary,
+            exact=self.stats_exact_check.isChecked(),
+            on_result=self._on_statistics_loaded,
+            on_error=lambda msg: self.stats_text.setPlainText(f"❌ Error loading statistics:\n\n{msg}"),
+            parent=self
+        )
+        self.stats_worker.finished.connect(self._on_statistics_finished)
+        
+    def _on_statistics_finished(self):
+        """Allow the next statistics load once the worker ends"""
+        self.stats_worker = None
+        if self.stats_reload_pending:
+            self.stats_reload_pending = False
+            self._load_statistics()
+        
+    def _on_statistics_loaded(self, summary: dict):
+        """Render statistics summary (runs on UI thread)"""
+        if summary.get('error'):
+            self.stats_text.setPlainText(f"❌ Error loading statistics:\n\n{summary['error']}")
+            return
+            
+        counts = summary['counts']
+        sources = summary['count_sources']
+        
+        def fmt(table):
+            count = counts.get(table)
+            if count is None:
+                return "N/A"
+            # Estimasi katalog ditandai "~"
+            return f"~{count:,}" if sources.get(table) == 'estimate' else f"{count:,}"
+        
+        approx = "~" if summary['aggregates_source'] == 'estimate' else ""
+        
+        stats = f"""
 ╔══════════════════════════════════════════════════════════════╗
 ║        🗄️ CRYPTO INSIGHT DATABASE STATISTICS 🗄️            ║
 ╚══════════════════════════════════════════════════════════════╝
@@ -791,73 +998,194 @@ class DatabaseManagerWindow(QtWidgets.QMainWindow):
 
 📊 USERS
 """
+        stats += f"   Total Users: {fmt('users')}\n"
+        for role, count in summary['users_by_role']:
+            stats += f"   • {role}: {approx}{count:,}\n"
+        
+        # News stats
+        stats += "\n📰 NEWS\n"
+        stats += f"   Total Articles: {fmt('news')}\n"
+        for status, count in summary['news_by_status']:
+            stats += f"   • {status}: {approx}{count:,}\n"
+        stats += f"   Total Views: {approx}{summary['total_views']:,}\n"
+        
+        # Session stats
+        stats += "\n🔗 SESSIONS\n"
+        stats += f"   Total Sessions: {fmt('user_sessions')}\n"
+        stats += f"   Online Now: {summary['online_sessions']}\n"
+        
+        # Interaction stats (if tables exist)
+        if counts.get('article_likes') is not None:
+            stats += "\n💝 INTERACTIONS\n"
+            stats += f"   Total Likes: {fmt('article_likes')}\n"
+            stats += f"   Total Bookmarks: {fmt('article_bookmarks')}\n"
+            stats += f"   Total Article Views: {fmt('article_views')}\n"
+        
+        if summary['aggregates_source'] == 'exact':
+            source_note = "exact COUNT(*)"
+        else:
+            source_note = "~ = catalog estimate (pg_class / pg_stats, as of last ANALYZE)"
+        
+        stats += "\n════════════════════════════════════════════════════════════════\n"
+        stats += f"ℹ️ Counts: {source_note}\n"
+        stats += "✅ Statistics loaded successfully\n"
+        
+        self.stats_text.setPlainText(stats)
+            
+    # ==================== Performance ====================
+    
+    def _update_perf_timer(self):
+        """Run auto-refresh only while Performance tab is visible"""
+        visible = self.tab_widget.currentWidget() is self.perf_tab
+        if visible and self.perf_auto_check.isChecked():
+            if not self.perf_timer.isActive():
+                self.perf_timer.start(15000)
+        else:
+            self.perf_timer.stop()
+            
+    def _load_performance(self):
+        """Load performance snapshot on a background thread"""
+        if self.perf_worker is not None:
+            return  # Previous refresh still running
+            
+        self.perf_status.setText("⏳ Loading performance data...")
+        self.perf_worker = run_in_background(
+            get_performance_snapshot,
+            on_result=self._on_performance_loaded,
+            on_error=self._on_performance_error,
+            parent=self
+        )
+        self.perf_worker.finished.connect(self._on_performance_finished)
+        
+    def _on_performance_finished(self):
+        """Allow the next refresh once the worker thread ends"""
+        self.perf_worker = None
+        
+    def _on_performance_error(self, message: str):
+        """Show worker error"""
+        self.perf_status.setText(f"❌ Error: {message}")
+        
+    def _on_performance_loaded(self, snapshot: dict):
+        """Populate performance tables (runs on UI thread)"""
+        if snapshot.get('error'):
+            self.perf_status.setText(f"❌ Error: {snapshot['error']}")
+            return
             
-            # User stats
-            cur.execute("SELECT COUNT(*) FROM users")
-            total_users = cur.fetchone()[0]
-            
-            cur.execute("SELECT role, COUNT(*) FROM users GROUP BY role")
-            role_counts = cur.fetchall()
-            
-            stats += f"   Total Users: {total_users}\n"
-            for role, count in role_counts:
-                stats += f"   • {role}: {count}\n"
-            
-            # News stats
-            stats += "\n📰 NEWS\n"
-            cur.execute("SELECT COUNT(*) FROM news")
-            total_news = cur.fetchone()[0]
-            
-            cur.execute("SELECT status, COUNT(*) FROM news GROUP BY status")
-            status_counts = cur.fetchall()
-            
-            cur.execute("SELECT COALESCE(SUM(views), 0) FROM news")
-            total_views = cur.fetchone()[0]
-            
-            stats += f"   Total Articles: {total_news}\n"
-            for status, count in status_counts:
-                stats += f"   • {status}: {count}\n"
-            stats += f"   Total Views: {total_views}\n"
-            
-            # Session stats
-            stats += "\n🔗 SESSIONS\n"
-            cur.execute("SELECT COUNT(*) FROM user_sessions")
-            total_sessions = cur.fetchone()[0]
-            
-            cur.execute("SELECT COUNT(*) FROM user_sessions WHERE status = 'online'")
-            online_sessions = cur.fetchone()[0]
+        self._fill_perf_table(self.perf_total_table, snapshot['top_by_total'])
+        self._fill_perf_table(self.perf_mean_table, snapshot['top_by_mean'])
+        self._fill_perf_table(self.perf_tables_table, snapshot['tables'])
+        self._fill_perf_table(self.perf_indexes_table, snapshot['unused_indexes'])
+        
+        status = f"✅ Updated {datetime.datetime.now().strftime('%H:%M:%S')}"
+        if not snapshot['statements_available']:
+            status += f"  •  ⚠️ pg_stat_statements unavailable: {snapshot['statements_error']}"
+        self.perf_status.setText(status)
+        
+    def _fill_perf_table(self, table: QtWidgets.QTableWidget, rows: List[Tuple]):
+        """Fill a performance table with rows"""
+        table.setRowCount(len(rows))
+        for row_idx, row_data in enumerate(rows):
+            for col_idx, cell_data in enumerate(row_data):
+                item = QtWidgets.QTableWidgetItem(str(cell_data) if cell_data is not None else "-")
+                if col_idx == 0 and isinstance(cell_data, str):
+                    item.setToolTip(cell_data)
+                table.setItem(row_idx, col_idx, item)
+        table.resizeColumnsToContents()
+        
+    # ==================== Index Advisor ====================
+    
+    def _analyze_workload(self):
+        """Run the index advisor on a background thread"""
+        if self.advisor_worker is not None:
+            return
             
-            stats += f"   Total Sessions: {total_sessions}\n"
-            stats += f"   Online Now: {online_sessions}\n"
+        self.advisor_analyze_btn.setEnabled(False)
+        self.advisor_status.setText("⏳ Collecting workload and explaining queries...")
+        self.advisor_worker = run_in_background(
+            analyze_workload,
+            self.advisor_source_combo.currentData(),
+            self.advisor_limit_spin.value(),
+            self.advisor_trial_check.isChecked(),
+            on_result=self._on_workload_analyzed,
+            on_error=lambda msg: self.advisor_status.setText(f"❌ Error: {msg}"),
+            parent=self
+        )
+        self.advisor_worker.finished.connect(self._on_advisor_finished)
+        
+    def _on_advisor_finished(self):
+        self.advisor_worker = None
+        self.advisor_analyze_btn.setEnabled(True)
+        
+    def _on_workload_analyzed(self, result: dict):
+        """Show candidate indexes (runs on UI thread)"""
+        if result['error']:
+            self.advisor_status.setText(f"❌ Error: {result['error']}")
+            return
             
-            # Interaction stats (if tables exist)
+        self.advisor_candidates = result['candidates']
+        fmt = lambda value, spec: format(value, spec) if value is not None else "-"
+        
+        self.advisor_table.blockSignals(True)
+        self.advisor_table.setRowCount(len(self.advisor_candidates))
+        for row_idx, c in enumerate(self.advisor_candidates):
+            cells = [
+                c['name'], c['table'], ", ".join(f"{col} {d}".strip() for col, d in c['columns']),
+                fmt(c['cost_before'], ".1f"), fmt(c['cost_after'], ".1f"),
+                fmt(c['improvement_pct'], ".0f") + ("%" if c['improvement_pct'] is not None else ""),
+                fmt(c['saved_ms'], ".1f"), str(len(c['queries'])), ", ".join(c['reasons']),
+            ]
+            for col_idx, text in enumerate(cells):
+                item = QtWidgets.QTableWidgetItem(text)
+                if col_idx == 0:
+                    item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                    item.setCheckState(Qt.Checked)
+                    item.setToolTip(c['definition'] + "\n\n" + "\n".join(c['labels'][:10]))
+                self.advisor_table.setItem(row_idx, col_idx, item)
+        self.advisor_table.blockSignals(False)
+        self.advisor_table.resizeColumnsToContents()
+        self._update_advisor_migration()
+        
+        self.advisor_status.setText(
+            f"✅ {result['explained']}/{result['queries']} queries explained  •  "
+            f"{len(self.advisor_candidates)} candidate(s)  •  Estimates: {result['estimate_note']}"
+        )
+        
+    def _checked_candidates(self) -> List[dict]:
+        return [c for row_idx, c in enumerate(self.advisor_candidates)
+                if self.advisor_table.item(row_idx, 0).checkState() == Qt.Checked]
+        
+    def _update_advisor_migration(self, *_):
+        """Regenerate migration preview from checked candidates"""
+        selected = self._checked_candidates()
+        if not selected:
+            self.advisor_migration_path = None
+            self.advisor_sql.setPlainText("")
+            self.advisor_save_btn.setEnabled(False)
+            return
+        self.advisor_migration_path, sql = build_migration(selected)
+        self.advisor_sql.setPlainText(sql)
+        self.advisor_save_btn.setEnabled(True)
+        
+    def _save_advisor_migration(self):
+        """Save migration file (default: next version in migrations/)"""
+        filename, _ = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Save Index Migration",
+            self.advisor_migration_path,
+            "SQL Files (*.sql)"
+        )
+        
+        if filename:
             try:
-                cur.execute("SELECT COUNT(*) FROM article_likes")
-                total_likes = cur.fetchone()[0]
-                
-                cur.execute("SELECT COUNT(*) FROM article_bookmarks")
-                total_bookmarks = cur.fetchone()[0]
-                
-                cur.execute("SELECT COUNT(*) FROM article_views")
-                total_article_views = cur.fetchone()[0]
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(self.advisor_sql.toPlainText())
+                QtWidgets.QMessageBox.information(self, "Success",
+                    f"Migration saved to:\n{filename}\n\n"
+                    f"Apply with: python run_migration.py")
+                self._update_advisor_migration()
+            except Exception as e:
+                QtWidgets.QMessageBox.critical(self, "Error",
+                    f"Failed to save migration:\n{str(e)}")
                 
-                stats += "\n💝 INTERACTIONS\n"
-                stats += f"   Total Likes: {total_likes}\n"
-                stats += f"   Total Bookmarks: {total_bookmarks}\n"
-                stats += f"   Total Article Views: {total_article_views}\n"
-            except:
-                pass
-            
-            stats += "\n════════════════════════════════════════════════════════════════\n"
-            stats += "✅ Statistics loaded successfully\n"
-            
-            conn.close()
-            
-            self.stats_text.setPlainText(stats)
-            
-        except Exception as e:
-            self.stats_text.setPlainText(f"❌ Error loading statistics:\n\n{str(e)}")
-            
     # ==================== Backup & Export ====================
     
     def _export_to_json(self):
@@ -977,6 +1305,41 @@ class DatabaseManagerWindow(QtWidgets.QMainWindow):
         except Exception as e:
             self.health_display.setPlainText(f"❌ Health check failed:\n\n{str(e)}")
             
+    def _reconcile_counters(self):
+        """Recount trigger-maintained per-user counters (background thread)"""
+        if self.reconcile_worker is not None:
+            return
+        self.reconcile_btn.setEnabled(False)
+        self.health_display.setPlainText("⏳ Reconciling counters...")
+        self.reconcile_worker = run_in_background(
+            reconcile_counters,
+            on_result=self._on_counters_reconciled,
+            on_error=lambda msg: self.health_display.setPlainText(f"❌ Reconcile failed:\n\n{msg}"),
+            parent=self
+        )
+        self.reconcile_worker.finished.connect(self._on_reconcile_finished)
+        
+    def _on_reconcile_finished(self):
+        self.reconcile_worker = None
+        self.reconcile_btn.setEnabled(True)
+        
+    def _on_counters_reconciled(self, result: dict):
+        if result['error']:
+            self.health_display.setPlainText(f"❌ Reconcile failed:\n\n{result['error']}")
+            return
+        self.health_display.setPlainText(
+            "✅ Counters reconciled\n\n"
+            f"Per-user like/bookmark counters corrected: {result['users_fixed']}\n"
+        )
+        
+    def closeEvent(self, event):
+        """Stop background refresh before closing"""
+        self.perf_timer.stop()
+        for worker in (self.perf_worker, self.stats_worker, self.reconcile_worker, self.advisor_worker):
+            if worker is not None:
+                worker.wait(2000)
+        event.accept()
+        
     def _apply_cyberpunk_style(self):
         """Apply cyberpunk theme"""
         self.setStyleSheet("""
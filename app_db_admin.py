@@ -0,0 +1,343 @@
+# app_db_admin.py — Admin diagnostics backend (PostgreSQL statistics views)
+"""
+Backend functions untuk Database Manager admin:
+- Top queries dari pg_stat_statements (by total & mean time)
+- Table health dari pg_stat_user_tables (seq vs index scans, dead tuples, autovacuum)
+- Unused indexes dari pg_stat_user_indexes
+- Ringkasan statistik (estimasi katalog, atau COUNT(*) kalau diminta) dalam satu query
+- Reconcile counter per user yang dijaga trigger
+
+Semua dibaca dalam satu koneksi supaya refresh tab Performance/Statistics murah.
+"""
+
+from app_db_fixed import connect
+from typing import Dict, List, Tuple
+
+# ============================================
+# PERFORMANCE SNAPSHOT
+# ============================================
+
+def _statements_time_columns(cur) -> Tuple[str, str]:
+    """
+    pg_stat_statements rename kolom di PostgreSQL 13:
+    total_time/mean_time → total_exec_time/mean_exec_time.
+    """
+    cur.execute("SHOW server_version_num;")
+    version = int(cur.fetchone()[0])
+    if version >= 130000:
+        return "total_exec_time", "mean_exec_time"
+    return "total_time", "mean_time"
+
+
+def _get_top_statements(cur, order_column: str, total_col: str, mean_col: str,
+                        limit: int) -> List[Tuple]:
+    """
+    Top statements untuk database saat ini.
+    Returns: [(query, calls, total_ms, mean_ms, rows), ...]
+    """
+    cur.execute(f"""
+        SELECT
+            LEFT(regexp_replace(s.query, '\\s+', ' ', 'g'), 300) AS query,
+            s.calls,
+            ROUND(s.{total_col}::numeric, 2) AS total_ms,
+            ROUND(s.{mean_col}::numeric, 2) AS mean_ms,
+            s.rows
+        FROM pg_stat_statements s
+        JOIN pg_database d ON d.oid = s.dbid
+        WHERE d.datname = current_database()
+        ORDER BY s.{order_column} DESC
+        LIMIT %s;
+    """, (limit,))
+    return cur.fetchall()
+
+
+def get_performance_snapshot(limit: int = 15) -> Dict:
+    """
+    Ambil snapshot performa database dalam satu koneksi.
+    Returns: {
+        'statements_available': bool,
+        'statements_error': str,
+        'top_by_total': [(query, calls, total_ms, mean_ms, rows), ...],
+        'top_by_mean': [(query, calls, total_ms, mean_ms, rows), ...],
+        'tables': [(table, seq_scan, idx_scan, live, dead, dead_pct, last_autovacuum), ...],
+        'unused_indexes': [(table, index, size, idx_scan), ...],
+        'error': str (kosong jika sukses)
+    }
+    """
+    snapshot = {
+        'statements_available': False,
+        'statements_error': '',
+        'top_by_total': [],
+        'top_by_mean': [],
+        'tables': [],
+        'unused_indexes': [],
+        'error': ''
+    }
+
+    try:
+        conn, _ = connect()
+        if not conn:
+            snapshot['error'] = "Database connection failed"
+            return snapshot
+
+        # Read-only snapshot; autocommit supaya error di pg_stat_statements
+        # tidak membatalkan query berikutnya
+        conn.autocommit = True
+        cur = conn.cursor()
+
+        # --- pg_stat_statements (extension mungkin belum terpasang) ---
+        cur.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements';")
+        if cur.fetchone():
+            try:
+                total_col, mean_col = _statements_time_columns(cur)
+                snapshot['top_by_total'] = _get_top_statements(cur, total_col, total_col, mean_col, limit)
+                snapshot['top_by_mean'] = _get_top_statements(cur, mean_col, total_col, mean_col, limit)
+                snapshot['statements_available'] = True
+            except Exception as e:
+                # Biasanya: shared_preload_libraries belum berisi pg_stat_statements
+                snapshot['statements_error'] = str(e).strip()
+        else:
+            snapshot['statements_error'] = (
+                "Extension pg_stat_statements belum terpasang "
+                "(CREATE EXTENSION pg_stat_statements;)"
+            )
+
+        # --- pg_stat_user_tables ---
+        cur.execute("""
+            SELECT
+                relname,
+                COALESCE(seq_scan, 0),
+                COALESCE(idx_scan, 0),
+                n_live_tup,
+                n_dead_tup,
+                ROUND(100.0 * n_dead_tup / GREATEST(n_live_tup + n_dead_tup, 1), 1) AS dead_pct,
+                to_char(GREATEST(last_autovacuum, last_vacuum) AT TIME ZONE 'UTC',
+                        'YYYY-MM-DD HH24:MI UTC') AS last_vacuum
+            FROM pg_stat_user_tables
+            ORDER BY n_dead_tup DESC, seq_scan DESC;
+        """)
+        snapshot['tables'] = cur.fetchall()
+
+        # --- pg_stat_user_indexes (index yang belum pernah dipakai) ---
+        cur.execute("""
+            SELECT
+                s.relname,
+                s.indexrelname,
+                pg_size_pretty(pg_relation_size(s.indexrelid)) AS index_size,
+                s.idx_scan
+            FROM pg_stat_user_indexes s
+            JOIN pg_index i ON i.indexrelid = s.indexrelid
+            WHERE s.idx_scan = 0
+              AND NOT i.indisunique
+              AND NOT i.indisprimary
+            ORDER BY pg_relation_size(s.indexrelid) DESC;
+        """)
+        snapshot['unused_indexes'] = cur.fetchall()
+
+        conn.close()
+        return snapshot
+
+    except Exception as e:
+        print(f"❌ Error getting performance snapshot: {e}")
+        snapshot['error'] = str(e)
+        return snapshot
+
+
+# ============================================
+# DATABASE SUMMARY (Statistics tab)
+# ============================================
+
+SUMMARY_TABLES = (
+    "users", "news", "user_sessions",
+    "article_likes", "article_bookmarks", "article_views"
+)
+
+ONLINE_WINDOW_SECONDS = 45
+
+# Ambil satu nilai bigint dari query dinamis tanpa round trip tambahan.
+# query_to_xml hanya dievaluasi kalau cabang CASE-nya terpilih, jadi tabel
+# yang belum ada (misal sebelum migration) tidak bikin seluruh query gagal.
+_DYNAMIC_BIGINT = (
+    "(xpath('/row/c/text()', query_to_xml({sql}, false, true, '')))[1]::text::bigint"
+)
+
+_EXACT_COUNT_SQL = """
+    SELECT CASE WHEN to_regclass(format('public.%%I', w.name)) IS NULL THEN NULL
+                ELSE {exact} END AS n,
+           'exact' AS source
+""".format(exact=_DYNAMIC_BIGINT.format(
+    sql="format('SELECT COUNT(*) AS c FROM public.%%I', w.name)"
+))
+
+# Estimasi jumlah baris dari katalog (tanpa menyentuh tabelnya)
+_ESTIMATED_ROWS_SQL = """
+    SELECT GREATEST(c.reltuples, COALESCE(s.n_live_tup, 0))::bigint AS n
+    FROM pg_class c
+    LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
+    WHERE c.oid = {regclass}
+"""
+
+_FAST_COUNT_SQL = """
+    SELECT est.n, 'estimate' AS source
+    FROM ({estimate}) est
+""".format(estimate=_ESTIMATED_ROWS_SQL.format(
+    regclass="to_regclass(format('public.%%I', w.name))"
+))
+
+
+def _estimated_distribution_sql(table: str, column: str, null_label: str) -> str:
+    """
+    Distribusi nilai satu kolom dari pg_stats (most_common_vals/freqs dan
+    null_frac hasil ANALYZE) dikali estimasi jumlah baris tabel.
+    Cocok untuk kolom low-cardinality seperti users.role dan news.status;
+    kosong kalau tabel belum pernah di-ANALYZE.
+    """
+    estimate = _ESTIMATED_ROWS_SQL.format(regclass=f"to_regclass('public.{table}')")
+    return f"""
+        SELECT json_agg(json_build_array(v, n) ORDER BY v)
+        FROM (
+            SELECT COALESCE(m.v, {null_label}) AS v, ROUND(SUM(m.f) * e.n)::bigint AS n
+            FROM pg_stats st
+            CROSS JOIN LATERAL (
+                SELECT * FROM unnest(st.most_common_vals::text::text[],
+                                     st.most_common_freqs) AS x(v, f)
+                UNION ALL
+                SELECT NULL, st.null_frac
+            ) m
+            CROSS JOIN ({estimate}) e
+            WHERE st.schemaname = 'public'
+              AND st.tablename = '{table}'
+              AND st.attname = '{column}'
+              AND m.f > 0
+            GROUP BY 1
+        ) d
+    """
+
+
+_EXACT_AGGREGATES_SQL = """
+    'users_by_role', (
+        SELECT json_agg(json_build_array(role, n) ORDER BY role)
+        FROM (SELECT COALESCE(role, 'user') AS role, COUNT(*) AS n
+              FROM users GROUP BY 1) r
+    ),
+    'news_by_status', (
+        SELECT json_agg(json_build_array(status, n) ORDER BY status)
+        FROM (SELECT status, COUNT(*) AS n FROM news GROUP BY status) s
+    ),
+    'total_views', (SELECT COALESCE(SUM(views), 0) FROM news)
+"""
+
+# news.views dinaikkan trigger untuk setiap baris article_views
+# (migrations/002), jadi estimasi baris article_views ≈ SUM(news.views)
+_FAST_AGGREGATES_SQL = """
+    'users_by_role', ({roles}),
+    'news_by_status', ({statuses}),
+    'total_views', ({views})
+""".format(
+    roles=_estimated_distribution_sql("users", "role", "'user'"),
+    statuses=_estimated_distribution_sql("news", "status", "NULL"),
+    views=_ESTIMATED_ROWS_SQL.format(regclass="to_regclass('public.article_views')"),
+)
+
+
+def get_database_summary(exact: bool = False) -> Dict:
+    """
+    Ringkasan statistik database dalam SATU query (satu round trip).
+
+    exact=False → hanya katalog: row count dari pg_class.reltuples /
+                  pg_stat_user_tables, role/status dari pg_stats, total views
+                  dari estimasi baris article_views. Tidak ada scan tabel.
+    exact=True  → COUNT(*), GROUP BY dan SUM sungguhan (lambat di tabel besar).
+
+    Returns: {
+        'counts': {table: int or None},
+        'count_sources': {table: 'exact' | 'estimate'},
+        'users_by_role': [(role, count), ...],
+        'news_by_status': [(status, count), ...],
+        'total_views': int,
+        'aggregates_source': 'exact' | 'estimate',
+        'online_sessions': int,
+        'error': str (kosong jika sukses)
+    }
+    """
+    summary = {
+        'counts': {},
+        'count_sources': {},
+        'users_by_role': [],
+        'news_by_status': [],
+        'total_views': 0,
+        'aggregates_source': 'exact' if exact else 'estimate',
+        'online_sessions': 0,
+        'error': ''
+    }
+
+    try:
+        conn, _ = connect()
+        if not conn:
+            summary['error'] = "Database connection failed"
+            return summary
+
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT json_build_object(
+                'counts', (
+                    SELECT json_object_agg(w.name, json_build_array(c.n, c.source))
+                    FROM unnest(%(tables)s::text[]) AS w(name)
+                    LEFT JOIN LATERAL ({_EXACT_COUNT_SQL if exact else _FAST_COUNT_SQL}) c ON TRUE
+                ),
+                {_EXACT_AGGREGATES_SQL if exact else _FAST_AGGREGATES_SQL},
+                'online_sessions', (
+                    SELECT COUNT(*) FROM user_sessions
+                    WHERE status = 'online'
+                      AND last_seen > NOW() - INTERVAL '{ONLINE_WINDOW_SECONDS} seconds'
+                )
+            );
+        """, {'tables': list(SUMMARY_TABLES)})
+
+        data = cur.fetchone()[0]
+        conn.close()
+
+        for table, (count, source) in (data.get('counts') or {}).items():
+            summary['counts'][table] = count
+            summary['count_sources'][table] = source
+        summary['users_by_role'] = [tuple(r) for r in data.get('users_by_role') or []]
+        summary['news_by_status'] = [tuple(r) for r in data.get('news_by_status') or []]
+        summary['total_views'] = data.get('total_views') or 0
+        summary['online_sessions'] = data.get('online_sessions') or 0
+        return summary
+
+    except Exception as e:
+        print(f"❌ Error getting database summary: {e}")
+        summary['error'] = str(e)
+        return summary
+
+
+# ============================================
+# COUNTER RECONCILE
+# ============================================
+
+def reconcile_counters() -> Dict:
+    """
+    Hitung ulang counter per user yang dijaga trigger
+    (user_interaction_counts) dari tabel sumbernya, dalam satu transaksi.
+    Returns: {'users_fixed': int, 'error': str (kosong jika sukses)}
+    """
+    result = {'users_fixed': 0, 'error': ''}
+    try:
+        conn, _ = connect()
+        if not conn:
+            result['error'] = "Database connection failed"
+            return result
+
+        cur = conn.cursor()
+        # Fungsi dari migrations/005_user_interaction_counters.sql
+        cur.execute("SELECT reconcile_user_interaction_counts();")
+        result['users_fixed'] = cur.fetchone()[0]
+        conn.commit()
+        conn.close()
+        return result
+
+    except Exception as e:
+        print(f"❌ Error reconciling counters: {e}")
+        result['error'] = str(e)
+        return result
@@ -1,8 +1,10 @@
 # app_db_fixed.py — Railway PostgreSQL helpers with IMPROVED ERROR HANDLING
-import os, sys, configparser, hashlib
-from typing import Optional, Tuple, List
+import os, sys, re, configparser, contextlib, hashlib, threading, time, random, weakref
+from typing import Optional, Tuple, List, Callable, Dict, Sequence
 import psycopg2
 from psycopg2 import OperationalError, DatabaseError
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+import startup_profiler
 
 # ---------- Config ----------
 def _app_dir() -> str:
@@ -11,8 +13,14 @@ def _app_dir() -> str:
         return os.path.dirname(sys.executable)
     return os.path.dirname(os.path.abspath(__file__))
 
+@startup_profiler.timed("config load")
 def _load_database_url() -> Optional[str]:
     """Load DATABASE_URL from config.ini, environment, or .env file"""
+    # 0) Override eksplisit (load test / benchmark ke Postgres lokal)
+    url = os.getenv("CRYPTO_INSIGHT_DATABASE_URL")
+    if url and url.startswith("postgresql://"):
+        return url
+
     # 1) config.ini (with BOM handling)
     ini = os.path.join(_app_dir(), "config.ini")
     if os.path.exists(ini):
@@ -49,96 +57,617 @@ def _load_database_url() -> Optional[str]:
 
 DATABASE_URL: Optional[str] = _load_database_url()
 
+def ssl_kwargs() -> dict:
+    """
+    sslmode untuk psycopg2.connect: Railway wajib TLS (default "require"),
+    tapi ?sslmode=... di DATABASE_URL dihormati (mis. sslmode=disable untuk
+    Postgres lokal saat menguji gateway).
+    """
+    if DATABASE_URL and "sslmode=" in DATABASE_URL:
+        return {}
+    return {"sslmode": "require"}
+
+@startup_profiler.timed("config load")
+def _load_client_settings() -> dict:
+    """
+    [client] di config.ini: cara aplikasi desktop mengakses data.
+      TRANSPORT     = direct (default, koneksi langsung ke Postgres)
+                    | gateway (lewat data_gateway.py)
+      GATEWAY_URL   = http://127.0.0.1:8765
+      GATEWAY_TOKEN = (opsional, harus sama dengan [gateway] TOKEN)
+    Environment CRYPTO_INSIGHT_TRANSPORT menimpa TRANSPORT.
+    """
+    settings = {"transport": "direct", "gateway_url": "http://127.0.0.1:8765", "gateway_token": ""}
+    ini = os.path.join(_app_dir(), "config.ini")
+    if os.path.exists(ini):
+        try:
+            cfg = configparser.ConfigParser()
+            cfg.read(ini, encoding="utf-8-sig")
+            if "client" in cfg:
+                section = cfg["client"]
+                settings["transport"] = section.get("TRANSPORT", settings["transport"]).strip().lower()
+                settings["gateway_url"] = section.get("GATEWAY_URL", settings["gateway_url"]).strip()
+                settings["gateway_token"] = section.get("GATEWAY_TOKEN", "").strip()
+        except Exception as e:
+            print(f"⚠️ Error reading [client] from config.ini: {e}")
+    settings["transport"] = os.getenv("CRYPTO_INSIGHT_TRANSPORT", settings["transport"]).strip().lower()
+    if settings["transport"] not in ("direct", "gateway"):
+        print(f"⚠️ Unknown TRANSPORT '{settings['transport']}', using direct")
+        settings["transport"] = "direct"
+    return settings
+
+CLIENT_SETTINGS = _load_client_settings()
+
+def using_gateway() -> bool:
+    return CLIENT_SETTINGS["transport"] == "gateway"
+
+STORAGE_BACKENDS = ("postgres", "sqlite")
+
+@startup_profiler.timed("config load")
+def _load_storage_settings() -> dict:
+    """
+    [storage] di config.ini: implementasi penyimpanan di belakang helper.
+      BACKEND     = postgres (default, Railway / DATABASE_URL)
+                  | sqlite (in-process, tanpa server — untuk benchmark & load test)
+      SQLITE_PATH = :memory: (default) atau path file .db
+    Environment CRYPTO_INSIGHT_BACKEND / CRYPTO_INSIGHT_SQLITE_PATH menimpa.
+    """
+    settings = {"backend": "postgres", "sqlite_path": ":memory:"}
+    ini = os.path.join(_app_dir(), "config.ini")
+    if os.path.exists(ini):
+        try:
+            cfg = configparser.ConfigParser()
+            cfg.read(ini, encoding="utf-8-sig")
+            if "storage" in cfg:
+                section = cfg["storage"]
+                settings["backend"] = section.get("BACKEND", settings["backend"]).strip().lower()
+                settings["sqlite_path"] = section.get("SQLITE_PATH", settings["sqlite_path"]).strip()
+        except Exception as e:
+            print(f"⚠️ Error reading [storage] from config.ini: {e}")
+    settings["backend"] = os.getenv("CRYPTO_INSIGHT_BACKEND", settings["backend"]).strip().lower()
+    settings["sqlite_path"] = os.getenv("CRYPTO_INSIGHT_SQLITE_PATH", settings["sqlite_path"]).strip()
+    if settings["backend"] not in STORAGE_BACKENDS:
+        print(f"⚠️ Unknown BACKEND '{settings['backend']}', using postgres")
+        settings["backend"] = "postgres"
+    return settings
+
+STORAGE_SETTINGS = _load_storage_settings()
+
+def using_direct_postgres() -> bool:
+    """True kalau helper menjalankan SQL Postgres sendiri (bukan gateway / SQLite)"""
+    return not using_gateway() and STORAGE_SETTINGS["backend"] == "postgres"
+
+# ---------- Circuit Breaker ----------
+# Kalau Railway lambat/down, setiap connect() bisa blocking sampai timeout.
+# Breaker membuka setelah beberapa kegagalan beruntun: selama open, connect()
+# langsung mengembalikan (None, None) tanpa menyentuh jaringan. Setelah
+# cooldown (exponential backoff + jitter), satu panggilan boleh lewat sebagai
+# probe (half-open); sukses → closed, gagal → open lagi dengan cooldown 2x.
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+BREAKER_FAILURE_THRESHOLD = 2      # kegagalan connect beruntun sebelum open
+BREAKER_BASE_COOLDOWN = 2.0        # detik, cooldown open pertama
+BREAKER_MAX_COOLDOWN = 60.0
+
+CONNECT_DEADLINE = 10.0            # total waktu maksimum satu connect()
+CONNECT_ATTEMPT_TIMEOUT = 5        # connect_timeout per percobaan (detik, min 2)
+CONNECT_RETRIES = 2                # retry tambahan (membuka koneksi selalu idempotent)
+PROBE_TIMEOUT = 3                  # connect_timeout untuk probe half-open
+
+
+class CircuitBreaker:
+    """Circuit breaker thread-safe untuk lapisan koneksi"""
+
+    def __init__(self, failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+                 base_cooldown: float = BREAKER_BASE_COOLDOWN,
+                 max_cooldown: float = BREAKER_MAX_COOLDOWN):
+        self.failure_threshold = failure_threshold
+        self.base_cooldown = base_cooldown
+        self.max_cooldown = max_cooldown
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.open_count = 0
+        self.retry_at = 0.0
+        self.last_error = ""
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[str, str], None]] = []
+
+    def add_listener(self, callback: Callable[[str, str], None]):
+        """callback(state, last_error) dipanggil setiap state berubah (dari thread mana pun)"""
+        self._listeners.append(callback)
+
+    def allow(self) -> Tuple[bool, bool]:
+        """
+        Boleh mencoba koneksi?
+        Returns: (allowed, is_probe)
+        """
+        with self._lock:
+            if self.state == BREAKER_CLOSED:
+                return True, False
+            if self.state == BREAKER_OPEN and time.monotonic() >= self.retry_at:
+                self._set_state(BREAKER_HALF_OPEN)
+            if self.state == BREAKER_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True, True
+            return False, False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.open_count = 0
+            self._probe_in_flight = False
+            if self.state != BREAKER_CLOSED:
+                self.last_error = ""
+                self._set_state(BREAKER_CLOSED)
+
+    def record_failure(self, error: str):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            was_probe = self._probe_in_flight
+            self._probe_in_flight = False
+            if was_probe or self.failures >= self.failure_threshold:
+                cooldown = min(self.base_cooldown * (2 ** self.open_count), self.max_cooldown)
+                self.open_count += 1
+                # Jitter supaya banyak client tidak probe bersamaan
+                self.retry_at = time.monotonic() + cooldown * random.uniform(0.8, 1.2)
+                self._set_state(BREAKER_OPEN)
+
+    def seconds_until_retry(self) -> float:
+        return max(0.0, self.retry_at - time.monotonic())
+
+    def _set_state(self, state: str):
+        # Dipanggil dengan self._lock dipegang → listener tidak boleh
+        # memanggil method breaker (cukup emit signal / set flag)
+        if state == self.state:
+            return
+        self.state = state
+        for callback in list(self._listeners):
+            try:
+                callback(state, self.last_error)
+            except Exception as e:
+                print(f"⚠️ Breaker listener error: {e}")
+
+
+_breaker = CircuitBreaker()
+
+
+def connection_breaker() -> CircuitBreaker:
+    """Breaker global (untuk listener status di dashboard)"""
+    return _breaker
+
+
+def is_offline() -> bool:
+    """True kalau breaker sedang open (database dianggap tidak bisa dihubungi)"""
+    return _breaker.state == BREAKER_OPEN
+
+
+# ---------- Error reporting ----------
+# Helper mengembalikan default ([], False, 0, ...) saat database error, sama
+# seperti hasil kosong yang sah. Jalur error memanggil report_db_error()
+# supaya pemanggil (data gateway) bisa membedakannya, mis. untuk tidak
+# meng-cache default. Hitungan per thread, karena helper jalan di thread
+# pemanggil.
+_db_errors = threading.local()
+
+
+def report_db_error():
+    """Tandai bahwa panggilan helper di thread ini berakhir di jalur error"""
+    _db_errors.count = getattr(_db_errors, "count", 0) + 1
+
+
+def db_error_count() -> int:
+    """Jumlah error yang dilaporkan di thread ini (bandingkan sebelum/sesudah panggilan)"""
+    return getattr(_db_errors, "count", 0)
+
+
+# ---------- Connection Pool ----------
+# Koneksi ke Railway butuh TLS handshake (ratusan ms). Pool menyimpan koneksi
+# yang sudah terbuka; conn.close() dari helper mengembalikannya ke pool.
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = 8
+# Koneksi yang idle lebih lama dari ini dicek dengan SELECT 1 sebelum dipakai:
+# server yang memutus koneksi idle tidak mengubah conn.closed di sisi client.
+POOL_VALIDATE_IDLE_SECONDS = 30
+
+# TCP keepalive: koneksi idle tidak diputus NAT/proxy, dan koneksi yang
+# sudah mati terdeteksi oleh OS (bukan oleh query pertama helper).
+KEEPALIVE_KWARGS = {
+    "keepalives": 1,
+    "keepalives_idle": 30,
+    "keepalives_interval": 10,
+    "keepalives_count": 3,
+}
+
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+_idle_since = weakref.WeakKeyDictionary()   # koneksi di pool -> waktu dikembalikan
+
+# connect_timeout untuk percobaan koneksi di thread ini (diatur connect())
+_attempt = threading.local()
+
+
+def _attempt_timeout() -> int:
+    return getattr(_attempt, "timeout", CONNECT_ATTEMPT_TIMEOUT)
+
+
+class _DeadlinePool(ThreadedConnectionPool):
+    """ThreadedConnectionPool dengan connect_timeout per percobaan"""
+
+    def _connect(self, key=None):
+        # Dipanggil dengan lock pool dipegang, jadi aman mengubah _kwargs
+        self._kwargs["connect_timeout"] = _attempt_timeout()
+        conn = super()._connect(key)
+        # Koneksi minconn dibuat saat pool dibuat dan bisa lama idle sebelum dipakai
+        _idle_since[conn] = time.monotonic()
+        return conn
+
+
+class PooledConnection:
+    """
+    Proxy tipis di atas koneksi psycopg2 dari pool.
+    Semua atribut diteruskan ke koneksi asli, kecuali close() yang
+    mengembalikan koneksi ke pool (rollback dulu kalau ada transaksi terbuka).
+    """
+
+    def __init__(self, pool: ThreadedConnectionPool, conn):
+        object.__setattr__(self, "_pool", pool)
+        object.__setattr__(self, "_conn", conn)
+        if conn not in _prepared_by_conn:
+            _prepared_by_conn[conn] = _PreparedState(_schema_generation)
+
+    def __getattr__(self, name):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            raise psycopg2.InterfaceError("connection already closed")
+        return getattr(conn, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._conn, name, value)
+
+    def __enter__(self):
+        return self._conn.__enter__()
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    def close(self):
+        conn = object.__getattribute__(self, "_conn")
+        if conn is None:
+            return
+        object.__setattr__(self, "_conn", None)
+        discard = bool(conn.closed)
+        if not discard:
+            try:
+                conn.rollback()
+                conn.autocommit = False
+            except Exception:
+                discard = True
+        if not discard:
+            _idle_since[conn] = time.monotonic()
+        try:
+            self._pool.putconn(conn, close=discard)
+        except Exception:
+            # Pool sudah ditutup (close_pool) → tutup koneksinya saja
+            conn.close()
+
+    def __del__(self):
+        # Helper yang lupa close() jangan sampai menghabiskan slot pool
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def _new_connection():
+    return psycopg2.connect(DATABASE_URL, connect_timeout=_attempt_timeout(),
+                            **KEEPALIVE_KWARGS, **ssl_kwargs())
+
+
+def _get_pool() -> ThreadedConnectionPool:
+    """Buat pool saat pertama kali dipakai (thread-safe)"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = _DeadlinePool(
+                    POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS,
+                    DATABASE_URL, connect_timeout=_attempt_timeout(),
+                    **KEEPALIVE_KWARGS, **ssl_kwargs()
+                )
+    return _pool
+
+
+def _is_alive(conn) -> bool:
+    """
+    Koneksi masih bisa dipakai? conn.closed hanya berubah kalau client yang
+    menutup; koneksi yang diputus server (idle timeout Railway) baru ketahuan
+    saat dipakai, jadi koneksi yang lama idle dicek dengan SELECT 1.
+    """
+    if conn.closed:
+        return False
+    idle_since = _idle_since.pop(conn, None)
+    if idle_since is None or time.monotonic() - idle_since < POOL_VALIDATE_IDLE_SECONDS:
+        return True
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1;")
+        cur.close()
+        conn.rollback()
+        return True
+    except Exception:
+        return False
+
+
+def _checkout():
+    """
+    Ambil koneksi sehat dari pool. Koneksi yang ditutup atau gagal validasi
+    (lihat _is_alive) dibuang dan diganti. Kalau pool penuh, fallback ke
+    koneksi biasa (tidak di-pool).
+    """
+    pool = _get_pool()
+    for _ in range(POOL_MAX_CONNECTIONS + 1):
+        try:
+            conn = pool.getconn()
+        except PoolError:
+            return _new_connection()
+        if _is_alive(conn):
+            return PooledConnection(pool, conn)
+        pool.putconn(conn, close=True)
+    return _new_connection()
+
+
+def warm_pool(connections: int = 2) -> int:
+    """
+    Buka beberapa koneksi di depan (dipanggil dari splash screen) supaya
+    login pertama tidak menunggu TLS handshake.
+    Returns: jumlah koneksi yang siap di pool.
+    """
+    if not DATABASE_URL:
+        return 0
+    held = []
+    try:
+        for _ in range(max(1, min(connections, POOL_MAX_CONNECTIONS))):
+            conn, _ = connect()
+            if not conn:
+                break
+            if not isinstance(conn, PooledConnection):
+                conn.close()
+                break
+            conn.cursor().execute("SELECT 1;")
+            held.append(conn)
+        return len(held)
+    except Exception as e:
+        print(f"⚠️ Pool warm-up failed: {str(e)}")
+        return len(held)
+    finally:
+        for conn in held:
+            conn.close()
+
+
+def close_pool():
+    """Tutup semua koneksi di pool (saat aplikasi keluar)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
+# ---------- Prepared Statements ----------
+# Query helper yang paling sering jalan (cek like, heartbeat, stats, ...)
+# di-PREPARE sekali per koneksi pool, lalu dipanggil lewat EXECUTE nama(...):
+# server tidak perlu parse + plan ulang. Koneksi di luar pool (fallback saat
+# pool penuh) menjalankan SQL aslinya, karena koneksinya segera dibuang.
+#
+# Setelah schema berubah (migrate()), invalidate_prepared_statements()
+# menaikkan generasi schema; setiap koneksi menjalankan DEALLOCATE ALL
+# sebelum EXECUTE berikutnya dan PREPARE ulang dengan schema baru.
+
+_PREPARED_NAME_RE = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+_prepared_statements: Dict[str, Tuple[str, str]] = {}   # name -> (sql asli, sql PREPARE)
+_prepared_by_conn = weakref.WeakKeyDictionary()         # koneksi pool -> _PreparedState
+_schema_generation = 0
+
+
+class _PreparedState:
+    """Statement yang sudah di-PREPARE di satu koneksi"""
+
+    __slots__ = ("generation", "names")
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.names = set()
+
+
+def register_prepared(name: str, sql: str) -> str:
+    """
+    Daftarkan statement (placeholder %s) supaya bisa dipanggil lewat
+    execute_prepared(cur, name, params). Dipanggil sekali saat import modul.
+    Returns: name
+    """
+    if not _PREPARED_NAME_RE.match(name):
+        raise ValueError(f"Invalid prepared statement name: {name!r}")
+    if name in _prepared_statements and _prepared_statements[name][0] != sql:
+        raise ValueError(f"Prepared statement {name!r} already registered with different SQL")
+
+    counter = iter(range(1, sql.count("%s") + 1))
+    body = re.sub(r"%s", lambda _: f"${next(counter)}", sql).replace("%%", "%")
+    body = body.strip().rstrip(";")
+    _prepared_statements[name] = (sql, f"PREPARE {name} AS {body};")
+    return name
+
+
+def invalidate_prepared_statements():
+    """Tandai semua prepared statement basi (panggil setelah DDL/migration)"""
+    global _schema_generation
+    _schema_generation += 1
+
+
+def execute_prepared(cur, name: str, params: Sequence = ()):
+    """
+    cur.execute() untuk statement terdaftar: PREPARE sekali per koneksi,
+    selanjutnya EXECUTE. Pakai sebagai statement pertama di transaksinya
+    (kalau plan basi, transaksi di-rollback lalu statement diulang).
+    """
+    sql, prepare_sql = _prepared_statements[name]
+    conn = cur.connection
+    state = _prepared_by_conn.get(conn)
+    if state is None:
+        cur.execute(sql, params)
+        return
+
+    if state.generation != _schema_generation:
+        if state.names:
+            cur.execute("DEALLOCATE ALL;")
+        state.generation = _schema_generation
+        state.names.clear()
+
+    if name not in state.names:
+        cur.execute(prepare_sql)
+        state.names.add(name)
+
+    execute_sql = f"EXECUTE {name}" + (f" ({', '.join(['%s'] * len(params))});" if params else ";")
+    try:
+        cur.execute(execute_sql, params)
+    except psycopg2.Error as e:
+        # 0A000: "cached plan must not change result type" (kolom berubah
+        # di luar migrate()). Buang plan lama, PREPARE ulang, coba sekali lagi.
+        if e.pgcode != "0A000":
+            raise
+        conn.rollback()
+        cur.execute(f"DEALLOCATE {name};")
+        cur.execute(prepare_sql)
+        cur.execute(execute_sql, params)
+
+
+# ---------- Connection Override (per thread) ----------
+# Tool diagnostik (verify_query_plans, index advisor) menjalankan helper
+# dengan koneksi pengganti. Override hanya berlaku di thread pemanggil, jadi
+# helper dari thread lain (heartbeat, refresh dashboard) tetap ke pool biasa.
+_override = threading.local()
+
+
+@contextlib.contextmanager
+def connection_override(factory: Callable[[], Tuple]):
+    """Selama blok ini connect() di thread pemanggil mengembalikan factory()"""
+    previous = getattr(_override, "factory", None)
+    _override.factory = factory
+    try:
+        yield
+    finally:
+        _override.factory = previous
+
+
 # ---------- Core DB with Error Handling ----------
-def connect() -> Tuple[Optional[psycopg2.extensions.connection], Optional[str]]:
+def connect(deadline: float = CONNECT_DEADLINE,
+            retries: int = CONNECT_RETRIES) -> Tuple[Optional[psycopg2.extensions.connection], Optional[str]]:
     """
     Connect to PostgreSQL database with comprehensive error handling.
+    Koneksi diambil dari pool; conn.close() mengembalikannya ke pool.
+
+    - Breaker open → langsung (None, None), tanpa menunggu jaringan
+    - Gagal connect → retry dengan backoff + jitter, total dibatasi `deadline` detik
+    - Setelah cooldown, satu panggilan jadi probe (tanpa retry, timeout pendek)
+
     Returns: (connection, db_type) or (None, None) on failure
     """
+    factory = getattr(_override, "factory", None)
+    if factory is not None:
+        return factory()
+
     if not DATABASE_URL:
         print("❌ DATABASE_URL tidak ditemukan!")
         print("   Pastikan file config.ini ada dan berisi DATABASE_URL yang valid.")
         print("   Atau set environment variable DATABASE_URL.")
+        report_db_error()
         return None, None
     
-    try:
-        conn = psycopg2.connect(DATABASE_URL, sslmode="require", connect_timeout=10)
-        return conn, "postgres"
-    except OperationalError as e:
-        print(f"❌ Database connection failed (Operational Error):")
-        print(f"   {str(e)}")
-        print("\n   Possible causes:")
-        print("   - Internet connection issue")
-        print("   - Wrong credentials in DATABASE_URL")
-        print("   - Database server is down")
-        print("   - Firewall blocking connection")
-        return None, None
-    except DatabaseError as e:
-        print(f"❌ Database error: {str(e)}")
-        return None, None
-    except Exception as e:
-        print(f"❌ Unexpected error connecting to database: {str(e)}")
+    allowed, is_probe = _breaker.allow()
+    if not allowed:
+        report_db_error()
         return None, None
+    
+    started = time.monotonic()
+    attempts = 1 if is_probe else retries + 1
+    for attempt in range(attempts):
+        remaining = deadline - (time.monotonic() - started)
+        if remaining <= 0:
+            break
+        timeout = PROBE_TIMEOUT if is_probe else CONNECT_ATTEMPT_TIMEOUT
+        # libpq membulatkan connect_timeout < 2 menjadi 2 detik
+        _attempt.timeout = max(2, int(min(timeout, remaining)))
+        try:
+            conn = _checkout()
+            _breaker.record_success()
+            return conn, "postgres"
+        except OperationalError as e:
+            _breaker.record_failure(str(e).strip())
+            if attempt == 0:
+                print(f"❌ Database connection failed (Operational Error):")
+                print(f"   {str(e)}")
+                print("\n   Possible causes:")
+                print("   - Internet connection issue")
+                print("   - Wrong credentials in DATABASE_URL")
+                print("   - Database server is down")
+                print("   - Firewall blocking connection")
+        except DatabaseError as e:
+            print(f"❌ Database error: {str(e)}")
+            _breaker.record_failure(str(e).strip())
+            report_db_error()
+            return None, None
+        except Exception as e:
+            print(f"❌ Unexpected error connecting to database: {str(e)}")
+            _breaker.record_failure(str(e).strip())
+            report_db_error()
+            return None, None
+        
+        # Jangan retry kalau breaker sudah open (fail fast)
+        if _breaker.state == BREAKER_OPEN:
+            break
+        backoff = min(0.25 * (2 ** attempt), 2.0) * random.uniform(0.5, 1.5)
+        if time.monotonic() - started + backoff >= deadline:
+            break
+        time.sleep(backoff)
+    
+    if _breaker.state == BREAKER_OPEN:
+        print(f"⚠️ Database offline, retry in {_breaker.seconds_until_retry():.0f}s")
+    report_db_error()
+    return None, None
 
 def setup_database() -> bool:
     """
-    Setup database tables. Returns True if successful, False otherwise.
+    Apply migration yang pending (migrations/*.sql). Hanya untuk tool
+    operator: run_migration.py, data_gateway.py --migrate, seed_data.py.
+    Returns True if successful, False otherwise.
     """
-    conn, _ = connect()
-    if not conn:
-        print("✖ Cannot setup database: Connection failed")
-        return False
-    
-    try:
-        cur = conn.cursor()
-
-        # Tabel users
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id SERIAL PRIMARY KEY,
-                username VARCHAR(100) UNIQUE NOT NULL,
-                password VARCHAR(256) NOT NULL,
-                role VARCHAR(50) DEFAULT 'user'
-            );
-        """)
-
-        # Tabel presence
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS user_sessions (
-              id SERIAL PRIMARY KEY,
-              username VARCHAR(100) NOT NULL,
-              started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-              last_seen  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
-              status     VARCHAR(16) NOT NULL DEFAULT 'online'
-            );
-        """)
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_username ON user_sessions(username);")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_user_sessions_last_seen ON user_sessions(last_seen);")
-
-        # Tabel berita (khusus role 'penerbit')
-        cur.execute("""
-            CREATE TABLE IF NOT EXISTS news (
-              id SERIAL PRIMARY KEY,
-              title VARCHAR(200) NOT NULL,
-              content TEXT NOT NULL,
-              author VARCHAR(100) NOT NULL,
-              status VARCHAR(20) NOT NULL DEFAULT 'draft',
-              created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
-            );
-        """)
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_news_created_at ON news(created_at DESC);")
-        cur.execute("CREATE INDEX IF NOT EXISTS idx_news_author ON news(author);")
-
-        conn.commit()
-        conn.close()
+    from app_db_migrations import migrate
+    ok = migrate()
+    if ok:
         print("✅ Database setup completed successfully")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Error setting up database tables: {str(e)}")
-        if conn:
-            conn.close()
+    return ok
+
+def ensure_schema() -> bool:
+    """
+    Cek schema_migrations dengan satu query, tanpa DDL. Client tidak pernah
+    apply migration sendiri (backfill dan CREATE INDEX CONCURRENTLY tidak
+    boleh jalan dari splash screen); yang pending hanya dilaporkan.
+    Returns True kalau schema up to date.
+    """
+    from app_db_migrations import pending_migrations
+    pending = pending_migrations()
+    if pending is None:
         return False
+    if pending:
+        names = ", ".join(f"{m.version:03d}_{m.name}" for m in pending)
+        print(f"⚠️ {len(pending)} pending migration(s): {names} "
+              f"— run python run_migration.py")
+        return False
+    return True
 
 # ---------- Users with Error Handling ----------
 def user_exists(username: str) -> bool:
@@ -156,6 +685,7 @@ def user_exists(username: str) -> bool:
         conn.close()
         return bool(r)
     except Exception as e:
+        report_db_error()
         print(f"❌ Error checking user existence: {str(e)}")
         return False
 
@@ -180,6 +710,7 @@ def create_user(username: str, password: str, role: str = "user") -> bool:
         conn.close()
         return True
     except Exception as e:
+        report_db_error()
         print(f"❌ Error creating user: {str(e)}")
         return False
 
@@ -199,9 +730,103 @@ def verify_user(username: str, password: str) -> Optional[str]:
         conn.close()
         return row[0] if row else None
     except Exception as e:
+        report_db_error()
         print(f"❌ Error verifying user: {str(e)}")
         return None
 
+# ---------- Combined auth (satu round trip) ----------
+# Alasan gagal dari login()/register()
+AUTH_INVALID_INPUT = "invalid_input"
+AUTH_UNKNOWN_USER = "unknown_user"
+AUTH_WRONG_PASSWORD = "wrong_password"
+AUTH_USERNAME_TAKEN = "username_taken"
+AUTH_CONNECTION_FAILED = "connection_failed"
+AUTH_DB_ERROR = "db_error"
+
+def login(username: str, password: str) -> Tuple[Optional[str], Optional[int], str]:
+    """
+    Verifikasi password dan buka session dalam SATU statement
+    (pengganti verify_user() + start_session()).
+    Returns: (role, session_id, "") kalau sukses,
+             (None, None, reason) kalau gagal — reason salah satu AUTH_*.
+    """
+    if not username or not password:
+        return None, None, AUTH_INVALID_INPUT
+
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None, None, AUTH_CONNECTION_FAILED
+        cur = conn.cursor()
+        hashed = hashlib.sha256(password.encode()).hexdigest()
+        cur.execute("""
+            WITH u AS (
+                -- role NULL (kolom nullable) = default 'user', bukan login gagal
+                SELECT id, COALESCE(role, 'user') AS role, password = %(hashed)s AS password_ok
+                FROM users WHERE username = %(username)s
+            ), s AS (
+                INSERT INTO user_sessions (user_id, username, status)
+                SELECT u.id, %(username)s, 'online' FROM u WHERE u.password_ok
+                RETURNING id
+            )
+            SELECT (SELECT role FROM u), (SELECT password_ok FROM u), (SELECT id FROM s);
+        """, {"username": username, "hashed": hashed})
+        role, password_ok, sid = cur.fetchone()
+        conn.commit()
+        conn.close()
+
+        if password_ok is None:
+            return None, None, AUTH_UNKNOWN_USER
+        if not password_ok:
+            return None, None, AUTH_WRONG_PASSWORD
+        return role, sid, ""
+    except Exception as e:
+        report_db_error()
+        print(f"❌ Error during login: {str(e)}")
+        return None, None, AUTH_DB_ERROR
+
+def register(username: str, password: str, role: str = "user",
+             open_session: bool = True) -> Tuple[Optional[str], Optional[int], str]:
+    """
+    Buat user (dan langsung buka session kalau open_session=True) dalam
+    SATU statement (pengganti user_exists() + create_user()).
+    Returns: (role, session_id or None, "") kalau sukses,
+             (None, None, reason) kalau gagal — reason salah satu AUTH_*.
+    """
+    if not username or not password:
+        return None, None, AUTH_INVALID_INPUT
+
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None, None, AUTH_CONNECTION_FAILED
+        cur = conn.cursor()
+        hashed = hashlib.sha256(password.encode()).hexdigest()
+        cur.execute("""
+            WITH ins AS (
+                INSERT INTO users (username, password, role)
+                VALUES (%(username)s, %(hashed)s, %(role)s)
+                ON CONFLICT (username) DO NOTHING
+                RETURNING id, role
+            ), s AS (
+                INSERT INTO user_sessions (user_id, username, status)
+                SELECT ins.id, %(username)s, 'online' FROM ins WHERE %(open_session)s
+                RETURNING id
+            )
+            SELECT (SELECT role FROM ins), (SELECT id FROM s);
+        """, {"username": username, "hashed": hashed, "role": role, "open_session": open_session})
+        created_role, sid = cur.fetchone()
+        conn.commit()
+        conn.close()
+
+        if created_role is None:
+            return None, None, AUTH_USERNAME_TAKEN
+        return created_role, sid, ""
+    except Exception as e:
+        report_db_error()
+        print(f"❌ Error during registration: {str(e)}")
+        return None, None, AUTH_DB_ERROR
+
 # ---------- Presence (online tracking) ----------
 ONLINE_WINDOW_SECONDS = 45
 
@@ -215,18 +840,24 @@ def start_session(username: str) -> Optional[int]:
         if not conn:
             return None
         cur = conn.cursor()
-        cur.execute(
-            "INSERT INTO user_sessions (username, status) VALUES (%s, 'online') RETURNING id;",
-            (username,)
-        )
-        sid = cur.fetchone()[0]
+        cur.execute("""
+            INSERT INTO user_sessions (user_id, username, status)
+            SELECT id, username, 'online' FROM users WHERE username = %s
+            RETURNING id;
+        """, (username,))
+        row = cur.fetchone()
         conn.commit()
         conn.close()
-        return sid
+        return row[0] if row else None
     except Exception as e:
+        report_db_error()
         print(f"❌ Error starting session: {str(e)}")
         return None
 
+_HEARTBEAT = register_prepared(
+    "ps_heartbeat", "UPDATE user_sessions SET last_seen = NOW() WHERE id = %s;"
+)
+
 def heartbeat(session_id: int) -> bool:
     """Update session heartbeat. Returns True if successful."""
     if not session_id:
@@ -237,11 +868,12 @@ def heartbeat(session_id: int) -> bool:
         if not conn:
             return False
         cur = conn.cursor()
-        cur.execute("UPDATE user_sessions SET last_seen = NOW() WHERE id = %s;", (session_id,))
+        execute_prepared(cur, _HEARTBEAT, (session_id,))
         conn.commit()
         conn.close()
         return True
     except Exception as e:
+        report_db_error()
         print(f"⚠️ Heartbeat failed: {str(e)}")
         return False
 
@@ -260,6 +892,7 @@ def end_session(session_id: int) -> bool:
         conn.close()
         return True
     except Exception as e:
+        report_db_error()
         print(f"⚠️ End session failed: {str(e)}")
         return False
 
@@ -275,28 +908,30 @@ def latest_presence_per_user() -> List[tuple]:
         cur = conn.cursor()
         cur.execute(f"""
             WITH latest AS (
-                SELECT username, MAX(last_seen) AS ls
+                SELECT user_id, MAX(last_seen) AS ls
                 FROM user_sessions
-                GROUP BY username
+                WHERE user_id IS NOT NULL
+                GROUP BY user_id
             )
-            SELECT l.username,
+            SELECT u.username,
                    COALESCE(u.role, 'user') AS role,
                    EXISTS(
                      SELECT 1 FROM user_sessions s
-                     WHERE s.username = l.username
+                     WHERE s.user_id = l.user_id
                        AND s.last_seen = l.ls
                        AND s.status = 'online'
                        AND s.last_seen > NOW() - INTERVAL '{ONLINE_WINDOW_SECONDS} seconds'
                    ) AS is_online,
                    to_char(l.ls AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI:SS UTC') AS last_seen_utc
             FROM latest l
-            LEFT JOIN users u ON u.username = l.username
-            ORDER BY l.username;
+            JOIN users u ON u.id = l.user_id
+            ORDER BY u.username;
         """)
         rows = cur.fetchall()
         conn.close()
         return [(r[0], r[1], bool(r[2]), r[3]) for r in rows]
     except Exception as e:
+        report_db_error()
         print(f"⚠️ Error fetching presence: {str(e)}")
         return []
 
@@ -320,6 +955,7 @@ def create_news(author: str, title: str, content: str, publish: bool = True) ->
         conn.close()
         return True
     except Exception as e:
+        report_db_error()
         print(f"❌ Error creating news: {str(e)}")
         return False
 
@@ -344,9 +980,60 @@ def list_my_news(author: str, limit: int = 50) -> List[tuple]:
         conn.close()
         return rows
     except Exception as e:
+        report_db_error()
         print(f"⚠️ Error fetching news: {str(e)}")
         return []
 
+def get_author_summary(author: str) -> dict:
+    """
+    Ringkasan artikel satu author dalam satu aggregate query
+    (index scan di idx_news_author_status, lihat migrations/006).
+    Returns: {
+        'total': int,
+        'by_status': {status: int},
+        'published': int,
+        'draft': int,
+        'views': int,
+        'likes': int,
+        'bookmarks': int
+    }
+    """
+    summary = {'total': 0, 'by_status': {}, 'published': 0, 'draft': 0,
+               'views': 0, 'likes': 0, 'bookmarks': 0}
+    if not author:
+        return summary
+        
+    try:
+        conn, _ = connect()
+        if not conn:
+            return summary
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT status, COUNT(*),
+                   COALESCE(SUM(views), 0),
+                   COALESCE(SUM(like_count), 0),
+                   COALESCE(SUM(bookmark_count), 0)
+            FROM news
+            WHERE author = %s
+            GROUP BY status;
+        """, (author,))
+        rows = cur.fetchall()
+        conn.close()
+    except Exception as e:
+        report_db_error()
+        print(f"⚠️ Error fetching author summary: {str(e)}")
+        return summary
+    
+    for status, count, views, likes, bookmarks in rows:
+        summary['by_status'][status] = count
+        summary['total'] += count
+        summary['views'] += views
+        summary['likes'] += likes
+        summary['bookmarks'] += bookmarks
+    summary['published'] = summary['by_status'].get('published', 0)
+    summary['draft'] = summary['total'] - summary['published']
+    return summary
+
 def list_published_news(limit: int = 50) -> List[tuple]:
     """Get published news feed."""
     try:
@@ -365,6 +1052,7 @@ def list_published_news(limit: int = 50) -> List[tuple]:
         conn.close()
         return rows
     except Exception as e:
+        report_db_error()
         print(f"⚠️ Error fetching published news: {str(e)}")
         return []
 
@@ -382,3 +1070,19 @@ def health_check() -> bool:
         return result is not None
     except:
         return False
+
+# ---------- Transport / storage backend ----------
+# TRANSPORT = gateway → helper publik di atas diganti stub yang memanggil
+# data_gateway.py (lihat gateway_client.py).
+# BACKEND = sqlite → helper publik diganti method SqliteBackend (lihat
+# storage_backend.py). Versi Postgres tetap tersimpan di registry, jadi
+# kedua backend bisa dibandingkan dalam satu proses.
+# connect() tetap langsung, jadi tool admin dan migration masih butuh DATABASE_URL.
+from storage_backend import register_postgres_functions, install_backend_functions
+register_postgres_functions(globals(), "app_db_fixed")
+if using_gateway():
+    from gateway_client import install_remote_functions, warm_gateway
+    install_remote_functions(globals(), "app_db_fixed")
+    warm_pool = warm_gateway
+elif not using_direct_postgres():
+    install_backend_functions(globals(), "app_db_fixed")
@@ -0,0 +1,463 @@
+# app_db_index_advisor.py — Index advisor untuk Database Manager (PostgreSQL)
+"""
+Saran index dari workload nyata:
+
+1. Workload
+   - pg_stat_statements: top query by total time (teks ter-normalisasi $1..$n,
+     di-EXPLAIN sebagai generic plan: PREPARE + plan_cache_mode)
+   - app: semua helper data layer di-capture lewat verify_query_plans
+     (EXPLAIN saja, tidak ada yang dieksekusi) — dipakai kalau
+     pg_stat_statements tidak terpasang. Koneksi EXPLAIN hanya dipakai
+     thread advisor (connection_override); helper dari thread lain tetap
+     jalan normal
+2. Kandidat dari plan:
+   - Seq Scan / Bitmap Heap Scan dengan Filter → (kolom =, lalu kolom range)
+   - Sort di atas scan satu tabel → (kolom = dari scan, lalu kolom sort)
+   Kandidat yang sudah tertutup index lain (prefix kolom sama) dibuang.
+3. Estimasi: EXPLAIN sebelum/sesudah per kandidat
+   - hypopg terpasang → hypothetical index (tanpa build, tanpa lock)
+   - trial_real_indexes=True → CREATE INDEX betulan di savepoint lalu
+     di-rollback (membangun index & mengunci write tabel selama build!)
+   - selain itu kandidat tetap ditampilkan tanpa estimasi
+4. build_migration() → file migrations/NNN_index_advisor.sql dengan
+   CREATE INDEX CONCURRENTLY, siap untuk python run_migration.py
+
+Semua jalan di satu koneksi baru (bukan pool) dalam transaksi yang
+di-rollback, jadi setting sesi/hypothetical index tidak bocor ke aplikasi.
+"""
+
+import os
+import re
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+from app_db_fixed import _new_connection
+
+SOURCE_STATEMENTS = "pg_stat_statements"
+SOURCE_APP = "app"
+
+MAX_INDEX_COLUMNS = 3
+MIN_IMPROVEMENT_PCT = 1.0
+
+# Query workload: teks, jumlah parameter $n (None = literal), statistik
+Query = namedtuple("Query", "text params calls mean_ms total_ms label")
+
+_SCAN_NODES = ("Seq Scan", "Bitmap Heap Scan", "Index Scan", "Index Only Scan")
+_CONDITION_RE = re.compile(
+    r"\b([A-Za-z_]\w*)\)*(?:::[\w\s]+?)?\)*\s*(=|<=|>=|<>|!=|<|>)"
+)
+_SKIP_QUERY_RE = re.compile(r"\b(pg_catalog|pg_stat\w*|information_schema|schema_migrations)\b", re.I)
+_DML_RE = re.compile(r"^\s*(SELECT|WITH|UPDATE|DELETE|INSERT)\b", re.I)
+
+
+# ============================================
+# WORKLOAD
+# ============================================
+
+def _statements_workload(cur, limit: int) -> List[Query]:
+    from app_db_admin import _statements_time_columns
+    total_col, mean_col = _statements_time_columns(cur)
+    cur.execute(f"""
+        SELECT s.query, s.calls, s.{mean_col}, s.{total_col}
+        FROM pg_stat_statements s
+        JOIN pg_database d ON d.oid = s.dbid
+        WHERE d.datname = current_database()
+        ORDER BY s.{total_col} DESC
+        LIMIT %s;
+    """, (limit * 3,))
+    queries = []
+    for text, calls, mean_ms, total_ms in cur.fetchall():
+        if not _DML_RE.match(text) or _SKIP_QUERY_RE.search(text):
+            continue
+        params = max((int(n) for n in re.findall(r"\$(\d+)", text)), default=0)
+        label = re.sub(r"\s+", " ", text).strip()[:120]
+        queries.append(Query(text, params, calls, float(mean_ms), float(total_ms), label))
+        if len(queries) >= limit:
+            break
+    return queries
+
+
+def _app_workload(conn) -> List[Query]:
+    from verify_query_plans import capture_all
+    queries = []
+    for name, statements in capture_all(conn).items():
+        for statement in statements:
+            if statement.plan and not _SKIP_QUERY_RE.search(statement.query):
+                queries.append(Query(statement.query, None, 1, None, None, name))
+    return queries
+
+
+# ============================================
+# EXPLAIN
+# ============================================
+
+def _explain(cur, query: Query) -> Optional[dict]:
+    """Root plan query (generic plan untuk teks $n), None kalau gagal"""
+    cur.execute("SAVEPOINT advisor_explain;")
+    prepared = False
+    try:
+        if query.params is None:
+            cur.execute("EXPLAIN (FORMAT JSON) " + query.text)
+            plan = cur.fetchone()[0][0]["Plan"]
+        else:
+            # PREPARE ulang setiap kali: plan cache tidak tahu soal hypothetical index
+            cur.execute("PREPARE advisor_q AS " + query.text)
+            prepared = True
+            args = f"({', '.join(['NULL'] * query.params)})" if query.params else ""
+            cur.execute(f"EXPLAIN (FORMAT JSON) EXECUTE advisor_q{args}")
+            plan = cur.fetchone()[0][0]["Plan"]
+            cur.execute("DEALLOCATE advisor_q;")
+            prepared = False
+        cur.execute("RELEASE SAVEPOINT advisor_explain;")
+        return plan
+    except Exception:
+        # Rollback dulu (transaksi aborted menolak DEALLOCATE), baru DEALLOCATE:
+        # prepared statement tidak ikut hilang oleh ROLLBACK TO SAVEPOINT,
+        # dan kalau bocor setiap PREPARE advisor_q berikutnya gagal
+        cur.execute("ROLLBACK TO SAVEPOINT advisor_explain;")
+        if prepared:
+            cur.execute("DEALLOCATE advisor_q;")
+        return None
+
+
+def _walk(plan: dict):
+    from verify_query_plans import walk_plan
+    return walk_plan(plan)
+
+
+def _relations(plan: dict) -> set:
+    return {node["Relation Name"] for node in _walk(plan) if node.get("Relation Name")}
+
+
+# ============================================
+# CANDIDATES
+# ============================================
+
+def _condition_columns(condition: str, columns: set) -> Tuple[List[str], List[str]]:
+    """(kolom equality, kolom range) dari teks Filter / Index Cond"""
+    equality, ranges = [], []
+    for column, op in _CONDITION_RE.findall(condition or ""):
+        if column not in columns:
+            continue
+        target = equality if op == "=" else ranges if op in ("<", ">", "<=", ">=") else None
+        if target is not None and column not in equality + ranges:
+            target.append(column)
+    return equality, ranges
+
+
+def _sort_columns(sort_keys: List[str], alias: str, columns: set) -> Optional[List[Tuple[str, str]]]:
+    """Sort Key semua dari alias scan → [(kolom, 'DESC'|'')], selain itu None"""
+    result = []
+    for key in sort_keys:
+        match = re.match(r"^\(?(?:(\w+)\.)?(\w+)\)?(?:::\w+)?(\s+DESC)?", key.strip())
+        if not match or (match.group(1) and match.group(1) != alias) or match.group(2) not in columns:
+            return None
+        result.append((match.group(2), "DESC" if match.group(3) else ""))
+    return result
+
+
+def _scan_below(node: dict) -> Optional[dict]:
+    """Scan tabel pertama di bawah node (lewat Limit/Incremental Sort/Gather dst.)"""
+    for child in node.get("Plans", []):
+        if child["Node Type"] in _SCAN_NODES:
+            return child
+        if len(child.get("Plans", [])) == 1:
+            found = _scan_below(child)
+            if found:
+                return found
+    return None
+
+
+def _candidates_from_plan(plan: dict, table_columns: Dict[str, set]) -> List[Tuple[str, tuple, str]]:
+    """[(table, ((kolom, arah), ...), alasan), ...]"""
+    found = []
+    for node in _walk(plan):
+        node_type = node["Node Type"]
+        if node_type in ("Seq Scan", "Bitmap Heap Scan") and node.get("Filter"):
+            table = node["Relation Name"]
+            columns = table_columns.get(table, set())
+            equality, ranges = _condition_columns(node["Filter"], columns)
+            keys = [(c, "") for c in equality + ranges[:1]]
+            if keys:
+                found.append((table, tuple(keys[:MAX_INDEX_COLUMNS]), f"{node_type} filter"))
+        elif node_type in ("Sort", "Incremental Sort") and node.get("Sort Key"):
+            scan = node["Plans"][0] if node["Plans"][0]["Node Type"] in _SCAN_NODES else _scan_below(node)
+            if not scan or not scan.get("Relation Name"):
+                continue
+            table = scan["Relation Name"]
+            columns = table_columns.get(table, set())
+            order = _sort_columns(node["Sort Key"], scan.get("Alias", table), columns)
+            if not order:
+                continue
+            condition = " AND ".join(filter(None, (scan.get("Index Cond"), scan.get("Filter"),
+                                                   scan.get("Recheck Cond"))))
+            equality, _ = _condition_columns(condition, columns)
+            keys = [(c, "") for c in equality if c not in dict(order)] + order
+            found.append((table, tuple(keys[:MAX_INDEX_COLUMNS]), "Sort above scan"))
+    return found
+
+
+def _table_columns(cur, tables: set) -> Dict[str, set]:
+    cur.execute("""
+        SELECT c.relname, array_agg(a.attname::text)
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace AND n.nspname = 'public'
+        JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+        WHERE c.relname = ANY(%s)
+        GROUP BY c.relname;
+    """, (list(tables),))
+    return {table: set(columns) for table, columns in cur.fetchall()}
+
+
+def _existing_index_keys(cur, tables: set) -> Dict[str, List[List[str]]]:
+    """Kolom key setiap index non-partial per tabel, urut"""
+    cur.execute("""
+        SELECT t.relname,
+               array_agg(a.attname::text ORDER BY k.ord)
+        FROM pg_index i
+        JOIN pg_class t ON t.oid = i.indrelid
+        CROSS JOIN LATERAL unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+        WHERE t.relname = ANY(%s) AND i.indpred IS NULL AND k.ord <= i.indnkeyatts
+        GROUP BY t.relname, i.indexrelid;
+    """, (list(tables),))
+    existing: Dict[str, List[List[str]]] = {}
+    for table, columns in cur.fetchall():
+        existing.setdefault(table, []).append(list(columns))
+    return existing
+
+
+def _covered(columns: tuple, existing: List[List[str]]) -> bool:
+    names = [c for c, _ in columns]
+    return any(index[:len(names)] == names for index in existing)
+
+
+def _superseded(candidate: dict, candidates) -> bool:
+    """Ada kandidat lain di tabel sama yang diawali kolom ini dan minimal sama bagus"""
+    names = [c for c, _ in candidate['columns']]
+    for other in candidates:
+        other_names = [c for c, _ in other['columns']]
+        if (other is not candidate and other['table'] == candidate['table']
+                and len(other_names) > len(names) and other_names[:len(names)] == names
+                and (other['improvement_pct'] or 0) >= (candidate['improvement_pct'] or 0)):
+            return True
+    return False
+
+
+def index_name(table: str, columns: tuple) -> str:
+    return f"idx_{table}_{'_'.join(c for c, _ in columns)}"[:63]
+
+
+def index_definition(table: str, columns: tuple, concurrently: bool = False) -> str:
+    """CONCURRENTLY = bentuk untuk file migration; tanpa = untuk trial/hypopg"""
+    cols = ", ".join(f"{c} {d}".strip() for c, d in columns)
+    if concurrently:
+        return (f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name(table, columns)}\n"
+                f"    ON {table} ({cols})")
+    return f"CREATE INDEX {index_name(table, columns)} ON {table} ({cols})"
+
+
+# ============================================
+# ESTIMATE
+# ============================================
+
+def _estimate(cur, candidate: dict, queries: List[Query], mode: str) -> Tuple[Optional[float], Optional[float]]:
+    """(cost sesudah untuk query kandidat, ms dihemat) — None kalau tidak diestimasi"""
+    if mode == "none":
+        return None, None
+    cur.execute("SAVEPOINT advisor_index;")
+    try:
+        if mode == "hypopg":
+            cur.execute("SELECT indexrelid FROM hypopg_create_index(%s);",
+                        (index_definition(candidate['table'], candidate['columns']),))
+        else:
+            cur.execute(index_definition(candidate['table'], candidate['columns']) + ";")
+        after_total, saved_ms = 0.0, 0.0
+        for i in candidate['queries']:
+            plan = _explain(cur, queries[i])
+            before = candidate['costs'][i]
+            after = min(plan["Total Cost"], before) if plan else before
+            after_total += after
+            if queries[i].total_ms is not None and before > 0:
+                saved_ms += queries[i].total_ms * (before - after) / before
+        return after_total, saved_ms
+    finally:
+        # hypothetical index tidak transaksional: reset setelah rollback
+        cur.execute("ROLLBACK TO SAVEPOINT advisor_index;")
+        if mode == "hypopg":
+            cur.execute("SELECT hypopg_reset();")
+
+
+def _estimate_mode(cur, trial_real_indexes: bool) -> Tuple[str, str]:
+    """('hypopg' | 'real' | 'none', catatan untuk admin)"""
+    cur.execute("""
+        SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'hypopg'),
+               EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'hypopg');
+    """)
+    installed, available = cur.fetchone()
+    if installed:
+        return "hypopg", "hypothetical indexes (hypopg)"
+    hint = "CREATE EXTENSION hypopg;" if available else "install the hypopg extension"
+    if trial_real_indexes:
+        return "real", f"real indexes built and rolled back ({hint} for cheaper estimates)"
+    return "none", f"no estimate — {hint} or enable trial indexes"
+
+
+# ============================================
+# ADVISOR
+# ============================================
+
+def analyze_workload(source: str = SOURCE_STATEMENTS, limit: int = 20,
+                     trial_real_indexes: bool = False) -> Dict:
+    """
+    Kumpulkan workload, cari kandidat index, estimasi manfaatnya.
+    Returns: {
+        'source': str, 'queries': int, 'explained': int,
+        'estimate_mode': 'hypopg' | 'real' | 'none', 'estimate_note': str,
+        'candidates': [{'table', 'columns', 'name', 'definition', 'reasons',
+                        'queries': [idx], 'labels': [str], 'cost_before',
+                        'cost_after', 'improvement_pct', 'saved_ms'}, ...],
+        'error': str (kosong jika sukses)
+    }
+    """
+    result = {'source': source, 'queries': 0, 'explained': 0, 'estimate_mode': 'none',
+              'estimate_note': '', 'candidates': [], 'error': ''}
+    try:
+        conn = _new_connection()
+    except Exception as e:
+        result['error'] = f"Database connection failed: {e}"
+        return result
+
+    try:
+        if source == SOURCE_APP:
+            conn.autocommit = True
+            queries = _app_workload(conn)
+            conn.autocommit = False
+        else:
+            cur = conn.cursor()
+            cur.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements';")
+            if not cur.fetchone():
+                result['error'] = ("pg_stat_statements is not installed "
+                                   "(CREATE EXTENSION pg_stat_statements;) — use the app workload instead")
+                return result
+            queries = _statements_workload(cur, limit)
+            conn.rollback()
+        result['queries'] = len(queries)
+
+        cur = conn.cursor()
+        try:
+            # SET LOCAL: hanya untuk transaksi ini (PostgreSQL 12+)
+            cur.execute("SAVEPOINT advisor_setup;")
+            cur.execute("SET LOCAL plan_cache_mode = force_generic_plan;")
+            cur.execute("RELEASE SAVEPOINT advisor_setup;")
+        except Exception:
+            cur.execute("ROLLBACK TO SAVEPOINT advisor_setup;")
+
+        plans = [_explain(cur, q) for q in queries]
+        result['explained'] = sum(1 for p in plans if p)
+        tables = set().union(*(_relations(p) for p in plans if p)) if any(plans) else set()
+        if not tables:
+            return result
+        table_columns = _table_columns(cur, tables)
+        existing = _existing_index_keys(cur, tables)
+
+        candidates: Dict[Tuple[str, tuple], dict] = {}
+        for i, plan in enumerate(plans):
+            if not plan:
+                continue
+            for table, columns, reason in _candidates_from_plan(plan, table_columns):
+                if _covered(columns, existing.get(table, [])):
+                    continue
+                candidate = candidates.setdefault((table, columns), {
+                    'table': table, 'columns': columns, 'name': index_name(table, columns),
+                    'definition': index_definition(table, columns, concurrently=True),
+                    'reasons': [], 'queries': [], 'labels': [], 'costs': {},
+                })
+                if reason not in candidate['reasons']:
+                    candidate['reasons'].append(reason)
+        # Estimasi terhadap semua query yang menyentuh tabel kandidat
+        for candidate in candidates.values():
+            for i, plan in enumerate(plans):
+                if plan and candidate['table'] in _relations(plan):
+                    candidate['queries'].append(i)
+                    candidate['labels'].append(queries[i].label)
+                    candidate['costs'][i] = plan["Total Cost"]
+
+        mode, note = _estimate_mode(cur, trial_real_indexes)
+        result['estimate_mode'], result['estimate_note'] = mode, note
+        for candidate in candidates.values():
+            before = sum(candidate['costs'].values())
+            after, saved_ms = _estimate(cur, candidate, queries, mode)
+            candidate['cost_before'] = before
+            candidate['cost_after'] = after
+            candidate['improvement_pct'] = (100.0 * (before - after) / before
+                                            if after is not None and before > 0 else None)
+            candidate['saved_ms'] = saved_ms if source == SOURCE_STATEMENTS else None
+            del candidate['costs']
+
+        ranked = [c for c in candidates.values()
+                  if (c['improvement_pct'] is None or c['improvement_pct'] >= MIN_IMPROVEMENT_PCT)
+                  and not _superseded(c, candidates.values())]
+        ranked.sort(key=lambda c: (-(c['saved_ms'] or 0), -(c['improvement_pct'] or 0), c['name']))
+        result['candidates'] = ranked
+        return result
+
+    except Exception as e:
+        print(f"❌ Error analyzing workload: {e}")
+        result['error'] = str(e)
+        return result
+
+    finally:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        conn.close()
+
+
+# ============================================
+# MIGRATION
+# ============================================
+
+def build_migration(candidates: List[dict]) -> Tuple[str, str]:
+    """
+    File migration untuk kandidat terpilih.
+    Returns: (path di migrations/, isi SQL)
+    """
+    from app_db_migrations import MIGRATIONS_DIR, discover_migrations
+    import datetime
+    version = max((m.version for m in discover_migrations()), default=0) + 1
+    path = os.path.join(MIGRATIONS_DIR, f"{version:03d}_index_advisor.sql")
+
+    lines = [
+        "-- migrate:no-transaction",
+        "-- ============================================",
+        "-- CRYPTO INSIGHT - INDEX ADVISOR",
+        f"-- Dibuat Database Manager → Index Advisor, {datetime.date.today().isoformat()}",
+        "-- ============================================",
+        "--",
+        "-- Dibuat CONCURRENTLY supaya tabel tidak terkunci saat migrate.",
+        "-- Cek hasilnya dengan python verify_query_plans.py.",
+        "--",
+        "-- ============================================",
+        "",
+    ]
+    for c in candidates:
+        estimate = (f"estimated cost -{c['improvement_pct']:.0f}%" if c.get('improvement_pct') is not None
+                    else "not estimated")
+        lines.append(f"-- {', '.join(c['reasons'])}; {len(c['queries'])} query(s); {estimate}")
+        for label in c['labels'][:3]:
+            lines.append(f"--   {label[:100]}")
+        lines.append(c['definition'] + ";")
+        lines.append("")
+
+    lines += [
+        "-- ============================================",
+        "-- ROLLBACK SCRIPT",
+        f"-- (lalu DELETE FROM schema_migrations WHERE version = {version})",
+        "-- ============================================",
+        "/*",
+    ]
+    lines += [f"DROP INDEX CONCURRENTLY IF EXISTS {c['name']};" for c in candidates]
+    lines.append("*/")
+    return path, "\n".join(lines) + "\n"
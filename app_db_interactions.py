@@ -11,14 +11,32 @@ Author: Claude + Reza
 Version: 1.0 - Phase 1 Complete
 """
 
-from app_db_fixed import connect
-from typing import Optional, List, Tuple, Dict
+from app_db_fixed import (
+    connect, register_prepared, execute_prepared, using_gateway, using_direct_postgres,
+    report_db_error,
+)
+from typing import Optional, List, Tuple, Dict, Set
 import psycopg2
 
+# Interaksi & session di-key users.id (migrations/008_user_id_foreign_keys.sql).
+# Helper tetap menerima username; id-nya di-resolve di query yang sama lewat
+# users_username_key, lalu semua filter/join membandingkan integer.
+_USER_ID = "(SELECT id FROM users WHERE username = %s)"
+
 # ============================================
 # LIKE FUNCTIONS
 # ============================================
 
+# Dual-write: username tetap diisi selama transisi (client lama masih membacanya)
+_LIKE_SQL = """
+    INSERT INTO article_likes (article_id, user_id, username)
+    SELECT %s, id, username FROM users WHERE username = %s
+    ON CONFLICT (article_id, user_id) DO NOTHING
+    RETURNING id;
+"""
+_LIKE_STMT = register_prepared("ps_like_article", _LIKE_SQL)
+
+
 def like_article(article_id: int, username: str) -> bool:
     """
     User likes an article.
@@ -33,12 +51,7 @@ def like_article(article_id: int, username: str) -> bool:
         cur = conn.cursor()
         
         # Insert like (will fail if already liked due to UNIQUE constraint)
-        cur.execute("""
-            INSERT INTO article_likes (article_id, username)
-            VALUES (%s, %s)
-            ON CONFLICT (article_id, username) DO NOTHING
-            RETURNING id;
-        """, (article_id, username))
+        execute_prepared(cur, _LIKE_STMT, (article_id, username))
         
         result = cur.fetchone()
         conn.commit()
@@ -53,10 +66,19 @@ def like_article(article_id: int, username: str) -> bool:
         return success
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error liking article: {e}")
         return False
 
 
+_UNLIKE_SQL = f"""
+    DELETE FROM article_likes
+    WHERE article_id = %s AND user_id = {_USER_ID}
+    RETURNING id;
+"""
+_UNLIKE_STMT = register_prepared("ps_unlike_article", _UNLIKE_SQL)
+
+
 def unlike_article(article_id: int, username: str) -> bool:
     """
     User unlikes an article.
@@ -71,11 +93,7 @@ def unlike_article(article_id: int, username: str) -> bool:
         cur = conn.cursor()
         
         # Delete like
-        cur.execute("""
-            DELETE FROM article_likes
-            WHERE article_id = %s AND username = %s
-            RETURNING id;
-        """, (article_id, username))
+        execute_prepared(cur, _UNLIKE_STMT, (article_id, username))
         
         result = cur.fetchone()
         conn.commit()
@@ -90,10 +108,18 @@ def unlike_article(article_id: int, username: str) -> bool:
         return success
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error unliking article: {e}")
         return False
 
 
+_IS_LIKED_SQL = f"""
+    SELECT 1 FROM article_likes
+    WHERE article_id = %s AND user_id = {_USER_ID};
+"""
+_IS_LIKED_STMT = register_prepared("ps_is_article_liked", _IS_LIKED_SQL)
+
+
 def is_article_liked(article_id: int, username: str) -> bool:
     """
     Check if user has liked an article.
@@ -105,16 +131,14 @@ def is_article_liked(article_id: int, username: str) -> bool:
             return False
         
         cur = conn.cursor()
-        cur.execute("""
-            SELECT 1 FROM article_likes
-            WHERE article_id = %s AND username = %s;
-        """, (article_id, username))
+        execute_prepared(cur, _IS_LIKED_STMT, (article_id, username))
         
         result = cur.fetchone()
         conn.close()
         return result is not None
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error checking like status: {e}")
         return False
 
@@ -139,6 +163,7 @@ def get_article_likes_count(article_id: int) -> int:
         return result[0] if result else 0
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting likes count: {e}")
         return 0
 
@@ -154,7 +179,7 @@ def get_user_liked_articles(username: str, limit: int = 50) -> List[Tuple]:
             return []
         
         cur = conn.cursor()
-        cur.execute("""
+        cur.execute(f"""
             SELECT 
                 n.id,
                 n.title,
@@ -163,7 +188,7 @@ def get_user_liked_articles(username: str, limit: int = 50) -> List[Tuple]:
                 to_char(al.liked_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as liked_at
             FROM article_likes al
             JOIN news n ON al.article_id = n.id
-            WHERE al.username = %s
+            WHERE al.user_id = {_USER_ID}
             AND n.status = 'published'
             ORDER BY al.liked_at DESC
             LIMIT %s;
@@ -174,6 +199,7 @@ def get_user_liked_articles(username: str, limit: int = 50) -> List[Tuple]:
         return rows
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting liked articles: {e}")
         return []
 
@@ -191,11 +217,12 @@ def get_article_likers(article_id: int, limit: int = 50) -> List[Tuple]:
         cur = conn.cursor()
         cur.execute("""
             SELECT 
-                username,
-                to_char(liked_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as liked_at
-            FROM article_likes
-            WHERE article_id = %s
-            ORDER BY liked_at DESC
+                u.username,
+                to_char(al.liked_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as liked_at
+            FROM article_likes al
+            JOIN users u ON u.id = al.user_id
+            WHERE al.article_id = %s
+            ORDER BY al.liked_at DESC
             LIMIT %s;
         """, (article_id, limit))
         
@@ -204,6 +231,7 @@ def get_article_likers(article_id: int, limit: int = 50) -> List[Tuple]:
         return rows
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting article likers: {e}")
         return []
 
@@ -212,6 +240,13 @@ def get_article_likers(article_id: int, limit: int = 50) -> List[Tuple]:
 # VIEW TRACKING
 # ============================================
 
+_TRACK_VIEW_SQL = f"""
+    INSERT INTO article_views (article_id, user_id, username, ip_address)
+    VALUES (%s, {_USER_ID}, %s, %s);
+"""
+_TRACK_VIEW_STMT = register_prepared("ps_track_article_view", _TRACK_VIEW_SQL)
+
+
 def track_article_view(article_id: int, username: Optional[str] = None, ip_address: str = "0.0.0.0") -> bool:
     """
     Track an article view.
@@ -225,16 +260,14 @@ def track_article_view(article_id: int, username: Optional[str] = None, ip_addre
         cur = conn.cursor()
         
         # Insert view record
-        cur.execute("""
-            INSERT INTO article_views (article_id, username, ip_address)
-            VALUES (%s, %s, %s);
-        """, (article_id, username, ip_address))
+        execute_prepared(cur, _TRACK_VIEW_STMT, (article_id, username, username, ip_address))
         
         conn.commit()
         conn.close()
         return True
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error tracking view: {e}")
         return False
 
@@ -259,6 +292,7 @@ def get_article_views(article_id: int) -> int:
         return result[0] if result else 0
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting views: {e}")
         return 0
 
@@ -295,6 +329,7 @@ def get_trending_articles(limit: int = 10, days: int = 7) -> List[Tuple]:
         return rows
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting trending articles: {e}")
         return []
 
@@ -330,6 +365,7 @@ def get_popular_articles(limit: int = 10) -> List[Tuple]:
         return rows
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting popular articles: {e}")
         return []
 
@@ -365,6 +401,7 @@ def get_most_liked_articles(limit: int = 10) -> List[Tuple]:
         return rows
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting most liked articles: {e}")
         return []
 
@@ -373,6 +410,15 @@ def get_most_liked_articles(limit: int = 10) -> List[Tuple]:
 # BOOKMARK FUNCTIONS
 # ============================================
 
+_BOOKMARK_SQL = """
+    INSERT INTO article_bookmarks (article_id, user_id, username)
+    SELECT %s, id, username FROM users WHERE username = %s
+    ON CONFLICT (article_id, user_id) DO NOTHING
+    RETURNING id;
+"""
+_BOOKMARK_STMT = register_prepared("ps_bookmark_article", _BOOKMARK_SQL)
+
+
 def bookmark_article(article_id: int, username: str) -> bool:
     """
     User bookmarks an article.
@@ -387,12 +433,7 @@ def bookmark_article(article_id: int, username: str) -> bool:
         cur = conn.cursor()
         
         # Insert bookmark
-        cur.execute("""
-            INSERT INTO article_bookmarks (article_id, username)
-            VALUES (%s, %s)
-            ON CONFLICT (article_id, username) DO NOTHING
-            RETURNING id;
-        """, (article_id, username))
+        execute_prepared(cur, _BOOKMARK_STMT, (article_id, username))
         
         result = cur.fetchone()
         conn.commit()
@@ -407,10 +448,19 @@ def bookmark_article(article_id: int, username: str) -> bool:
         return success
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error bookmarking article: {e}")
         return False
 
 
+_UNBOOKMARK_SQL = f"""
+    DELETE FROM article_bookmarks
+    WHERE article_id = %s AND user_id = {_USER_ID}
+    RETURNING id;
+"""
+_UNBOOKMARK_STMT = register_prepared("ps_unbookmark_article", _UNBOOKMARK_SQL)
+
+
 def unbookmark_article(article_id: int, username: str) -> bool:
     """
     User removes bookmark from an article.
@@ -425,11 +475,7 @@ def unbookmark_article(article_id: int, username: str) -> bool:
         cur = conn.cursor()
         
         # Delete bookmark
-        cur.execute("""
-            DELETE FROM article_bookmarks
-            WHERE article_id = %s AND username = %s
-            RETURNING id;
-        """, (article_id, username))
+        execute_prepared(cur, _UNBOOKMARK_STMT, (article_id, username))
         
         result = cur.fetchone()
         conn.commit()
@@ -444,10 +490,18 @@ def unbookmark_article(article_id: int, username: str) -> bool:
         return success
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error unbookmarking article: {e}")
         return False
 
 
+_IS_BOOKMARKED_SQL = f"""
+    SELECT 1 FROM article_bookmarks
+    WHERE article_id = %s AND user_id = {_USER_ID};
+"""
+_IS_BOOKMARKED_STMT = register_prepared("ps_is_article_bookmarked", _IS_BOOKMARKED_SQL)
+
+
 def is_article_bookmarked(article_id: int, username: str) -> bool:
     """
     Check if user has bookmarked an article.
@@ -459,16 +513,14 @@ def is_article_bookmarked(article_id: int, username: str) -> bool:
             return False
         
         cur = conn.cursor()
-        cur.execute("""
-            SELECT 1 FROM article_bookmarks
-            WHERE article_id = %s AND username = %s;
-        """, (article_id, username))
+        execute_prepared(cur, _IS_BOOKMARKED_STMT, (article_id, username))
         
         result = cur.fetchone()
         conn.close()
         return result is not None
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error checking bookmark status: {e}")
         return False
 
@@ -493,6 +545,7 @@ def get_article_bookmarks_count(article_id: int) -> int:
         return result[0] if result else 0
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting bookmarks count: {e}")
         return 0
 
@@ -508,7 +561,7 @@ def get_user_bookmarked_articles(username: str, limit: int = 50) -> List[Tuple]:
             return []
         
         cur = conn.cursor()
-        cur.execute("""
+        cur.execute(f"""
             SELECT 
                 n.id,
                 n.title,
@@ -517,7 +570,7 @@ def get_user_bookmarked_articles(username: str, limit: int = 50) -> List[Tuple]:
                 to_char(ab.bookmarked_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as bookmarked_at
             FROM article_bookmarks ab
             JOIN news n ON ab.article_id = n.id
-            WHERE ab.username = %s
+            WHERE ab.user_id = {_USER_ID}
             AND n.status = 'published'
             ORDER BY ab.bookmarked_at DESC
             LIMIT %s;
@@ -528,6 +581,7 @@ def get_user_bookmarked_articles(username: str, limit: int = 50) -> List[Tuple]:
         return rows
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting bookmarked articles: {e}")
         return []
 
@@ -536,6 +590,27 @@ def get_user_bookmarked_articles(username: str, limit: int = 50) -> List[Tuple]:
 # STATISTICS & ANALYTICS
 # ============================================
 
+_ARTICLE_STATS_SQL = """
+    SELECT 
+        COALESCE(views, 0) as views,
+        COALESCE(like_count, 0) as likes,
+        COALESCE(bookmark_count, 0) as bookmarks
+    FROM news 
+    WHERE id = %s;
+"""
+_ARTICLE_STATS_STMT = register_prepared("ps_article_stats", _ARTICLE_STATS_SQL)
+
+
+def _article_stats_from_row(result) -> Dict[str, int]:
+    if result:
+        return {
+            'views': result[0],
+            'likes': result[1],
+            'bookmarks': result[2]
+        }
+    return {'views': 0, 'likes': 0, 'bookmarks': 0}
+
+
 def get_article_stats(article_id: int) -> Dict[str, int]:
     """
     Get all statistics for an article.
@@ -547,34 +622,30 @@ def get_article_stats(article_id: int) -> Dict[str, int]:
             return {'views': 0, 'likes': 0, 'bookmarks': 0}
         
         cur = conn.cursor()
-        cur.execute("""
-            SELECT 
-                COALESCE(views, 0) as views,
-                COALESCE(like_count, 0) as likes,
-                COALESCE(bookmark_count, 0) as bookmarks
-            FROM news 
-            WHERE id = %s;
-        """, (article_id,))
+        execute_prepared(cur, _ARTICLE_STATS_STMT, (article_id,))
         
         result = cur.fetchone()
         conn.close()
-        
-        if result:
-            return {
-                'views': result[0],
-                'likes': result[1],
-                'bookmarks': result[2]
-            }
-        return {'views': 0, 'likes': 0, 'bookmarks': 0}
+        return _article_stats_from_row(result)
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting article stats: {e}")
         return {'views': 0, 'likes': 0, 'bookmarks': 0}
 
 
+# Counter dijaga trigger like/bookmark (migrations/005_user_interaction_counters.sql)
+_USER_SUMMARY_STMT = register_prepared("ps_user_interaction_summary", """
+    SELECT liked_count, bookmarked_count
+    FROM user_interaction_counts
+    WHERE username = %s;
+""")
+
+
 def get_user_interaction_summary(username: str) -> Dict[str, int]:
     """
     Get summary of user's interactions.
+    Satu baris lewat primary key (user tanpa interaksi belum punya baris → 0).
     Returns: {'liked': int, 'bookmarked': int}
     """
     try:
@@ -583,31 +654,62 @@ def get_user_interaction_summary(username: str) -> Dict[str, int]:
             return {'liked': 0, 'bookmarked': 0}
         
         cur = conn.cursor()
-        
-        # Count likes
-        cur.execute("""
-            SELECT COUNT(*) FROM article_likes WHERE username = %s;
-        """, (username,))
-        liked = cur.fetchone()[0]
-        
-        # Count bookmarks
-        cur.execute("""
-            SELECT COUNT(*) FROM article_bookmarks WHERE username = %s;
-        """, (username,))
-        bookmarked = cur.fetchone()[0]
-        
+        execute_prepared(cur, _USER_SUMMARY_STMT, (username,))
+        row = cur.fetchone()
         conn.close()
         
+        liked, bookmarked = row if row else (0, 0)
         return {
             'liked': liked,
             'bookmarked': bookmarked
         }
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting user summary: {e}")
         return {'liked': 0, 'bookmarked': 0}
 
 
+# Index-only scan di (user_id, article_id) — migrations/009_user_id_indexes.sql
+_INTERACTION_IDS_SQL = """
+    WITH u AS (SELECT id FROM users WHERE username = %s)
+    SELECT 'liked', article_id FROM article_likes WHERE user_id = (SELECT id FROM u)
+    UNION ALL
+    SELECT 'bookmarked', article_id FROM article_bookmarks WHERE user_id = (SELECT id FROM u);
+"""
+
+
+def _interaction_ids_from_rows(rows) -> Dict[str, Set[int]]:
+    ids = {'liked': set(), 'bookmarked': set()}
+    for kind, article_id in rows:
+        ids[kind].add(article_id)
+    return ids
+
+
+def get_user_interaction_ids(username: str) -> Optional[Dict[str, Set[int]]]:
+    """
+    ID artikel yang sudah di-like dan di-bookmark user, dalam satu query.
+    Dipakai dashboard untuk set status tombol like/bookmark tanpa query per kartu.
+    Returns: {'liked': {article_id, ...}, 'bookmarked': {article_id, ...}}
+             atau None kalau gagal (status dianggap belum diketahui).
+    """
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None
+        
+        cur = conn.cursor()
+        cur.execute(_INTERACTION_IDS_SQL, (username,))
+        ids = _interaction_ids_from_rows(cur.fetchall())
+        conn.close()
+        return ids
+        
+    except Exception as e:
+        report_db_error()
+        print(f"❌ Error getting user interaction ids: {e}")
+        return None
+
+
 def get_penerbit_stats(author: str) -> Dict[str, int]:
     """
     Get statistics for a penerbit (author).
@@ -668,6 +770,7 @@ def get_penerbit_stats(author: str) -> Dict[str, int]:
         }
         
     except Exception as e:
+        report_db_error()
         print(f"❌ Error getting penerbit stats: {e}")
         return {
             'total_articles': 0,
@@ -679,6 +782,12 @@ def get_penerbit_stats(author: str) -> Dict[str, int]:
         }
 
 
+def _engagement_rate(views: int, likes: int, bookmarks: int) -> float:
+    if views == 0:
+        return 0.0
+    return round((likes + bookmarks) / views * 100, 2)
+
+
 def get_engagement_rate(article_id: int) -> float:
     """
     Calculate engagement rate for an article.
@@ -686,22 +795,67 @@ def get_engagement_rate(article_id: int) -> float:
     Returns: float (percentage)
     """
     stats = get_article_stats(article_id)
-    
-    if stats['views'] == 0:
-        return 0.0
-    
-    engagement = stats['likes'] + stats['bookmarks']
-    rate = (engagement / stats['views']) * 100
-    return round(rate, 2)
+    return _engagement_rate(stats['views'], stats['likes'], stats['bookmarks'])
 
 
 # ============================================
 # UTILITY FUNCTIONS
 # ============================================
 
+# Satu round trip: artikel + counter + status like/bookmark user.
+# Kalau username NULL, kedua EXISTS otomatis false.
+_ARTICLE_FULL_INFO_SQL = f"""
+    SELECT
+        n.id,
+        n.title,
+        n.content,
+        n.author,
+        to_char(n.created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as created_at,
+        COALESCE(n.views, 0) as views,
+        COALESCE(n.like_count, 0) as likes,
+        COALESCE(n.bookmark_count, 0) as bookmarks,
+        EXISTS (
+            SELECT 1 FROM article_likes l
+            WHERE l.article_id = n.id AND l.user_id = {_USER_ID}
+        ) as is_liked,
+        EXISTS (
+            SELECT 1 FROM article_bookmarks b
+            WHERE b.article_id = n.id AND b.user_id = {_USER_ID}
+        ) as is_bookmarked
+    FROM news n
+    WHERE n.id = %s AND n.status = 'published';
+"""
+_ARTICLE_FULL_INFO_STMT = register_prepared("ps_article_full_info", _ARTICLE_FULL_INFO_SQL)
+
+
+def _article_full_info_from_row(result, username: Optional[str]) -> Optional[Dict]:
+    if not result:
+        return None
+    
+    article_info = {
+        'id': result[0],
+        'title': result[1],
+        'content': result[2],
+        'author': result[3],
+        'created_at': result[4],
+        'views': result[5],
+        'likes': result[6],
+        'bookmarks': result[7],
+        'engagement_rate': _engagement_rate(result[5], result[6], result[7])
+    }
+    
+    # Add user interaction status if username provided
+    if username:
+        article_info['is_liked'] = result[8]
+        article_info['is_bookmarked'] = result[9]
+    
+    return article_info
+
+
 def get_article_full_info(article_id: int, username: Optional[str] = None) -> Optional[Dict]:
     """
     Get complete article information including stats and user interaction status.
+    Satu koneksi, satu query (counter dan status user ikut dibaca lewat EXISTS).
     Returns: {
         'id': int,
         'title': str,
@@ -722,50 +876,255 @@ def get_article_full_info(article_id: int, username: Optional[str] = None) -> Op
             return None
         
         cur = conn.cursor()
-        cur.execute("""
-            SELECT 
-                id,
-                title,
-                content,
-                author,
-                to_char(created_at AT TIME ZONE 'UTC', 'YYYY-MM-DD HH24:MI UTC') as created_at,
-                COALESCE(views, 0) as views,
-                COALESCE(like_count, 0) as likes,
-                COALESCE(bookmark_count, 0) as bookmarks
-            FROM news
-            WHERE id = %s AND status = 'published';
-        """, (article_id,))
+        execute_prepared(cur, _ARTICLE_FULL_INFO_STMT, (username, username, article_id))
         
         result = cur.fetchone()
         conn.close()
+        return _article_full_info_from_row(result, username)
         
-        if not result:
+    except Exception as e:
+        report_db_error()
+        print(f"❌ Error getting article info: {e}")
+        return None
+
+
+# ============================================
+# REPLICA SYNC (feed_replica.py)
+# ============================================
+# Timestamp dikirim sebagai teks ISO UTC supaya watermark bisa disimpan di
+# SQLite dan lewat gateway JSON tanpa konversi.
+
+_UTC_ISO = "'YYYY-MM-DD\"T\"HH24:MI:SS.US'"
+
+
+def get_news_changes(since: Optional[str] = None, after_id: int = 0, limit: int = 500) -> Optional[Dict]:
+    """
+    Baris news dengan (updated_at, id) > (since, after_id), urut keyset.
+    Tombstone (artikel yang dihapus sejak `since`) hanya ikut di halaman
+    pertama (after_id == 0).
+    Returns: {'rows': [(id, title, author, status, views, likes, bookmarks,
+              created_at, updated_at), ...], 'deleted': [id, ...]}
+             atau None kalau gagal (beda dengan "tidak ada perubahan")
+    """
+    try:
+        conn, _ = connect()
+        if not conn:
             return None
-        
-        article_info = {
-            'id': result[0],
-            'title': result[1],
-            'content': result[2],
-            'author': result[3],
-            'created_at': result[4],
-            'views': result[5],
-            'likes': result[6],
-            'bookmarks': result[7],
-            'engagement_rate': get_engagement_rate(article_id)
+
+        since = since or "1970-01-01T00:00:00"
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT
+                id, title, author, status,
+                COALESCE(views, 0), COALESCE(like_count, 0), COALESCE(bookmark_count, 0),
+                to_char(created_at AT TIME ZONE 'UTC', {_UTC_ISO}),
+                to_char(updated_at AT TIME ZONE 'UTC', {_UTC_ISO})
+            FROM news
+            WHERE (updated_at, id) > (%s::timestamp AT TIME ZONE 'UTC', %s)
+            ORDER BY updated_at, id
+            LIMIT %s;
+        """, (since, after_id, limit))
+        rows = cur.fetchall()
+
+        deleted = []
+        if after_id == 0:
+            cur.execute("""
+                SELECT id FROM news_tombstones
+                WHERE deleted_at > %s::timestamp AT TIME ZONE 'UTC';
+            """, (since,))
+            deleted = [r[0] for r in cur.fetchall()]
+
+        conn.close()
+        return {'rows': rows, 'deleted': deleted}
+
+    except Exception as e:
+        report_db_error()
+        print(f"❌ Error getting news changes: {e}")
+        return None
+
+
+def get_news_counters(after_id: int = 0, limit: int = 5000) -> Optional[List[Tuple]]:
+    """
+    Counter artikel published, urut id (keyset). Update counter tidak
+    menggeser news.updated_at (migrations/007), jadi replica menyegarkan
+    counter lewat helper ini dengan jadwal yang lebih jarang dari delta.
+    Returns: [(id, views, likes, bookmarks), ...] atau None kalau gagal
+    """
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None
+
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT id, COALESCE(views, 0), COALESCE(like_count, 0), COALESCE(bookmark_count, 0)
+            FROM news
+            WHERE status = 'published' AND id > %s
+            ORDER BY id
+            LIMIT %s;
+        """, (after_id, limit))
+        rows = cur.fetchall()
+        conn.close()
+        return rows
+
+    except Exception as e:
+        report_db_error()
+        print(f"❌ Error getting news counters: {e}")
+        return None
+
+
+def get_user_interaction_changes(username: str, since: Optional[str] = None) -> Optional[Dict]:
+    """
+    Like/bookmark user untuk replica. user_interaction_counts.updated_at
+    berubah di setiap like/unlike/bookmark/unbookmark, jadi kalau sama dengan
+    `since` tidak ada yang perlu ditarik ('' = user belum punya baris counter).
+    Returns: {'version': str|None, 'changed': bool,
+              'liked': [(article_id, liked_at), ...],
+              'bookmarked': [(article_id, bookmarked_at), ...]}
+             atau None kalau gagal
+    """
+    try:
+        conn, _ = connect()
+        if not conn:
+            return None
+
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT to_char(updated_at AT TIME ZONE 'UTC', {_UTC_ISO})
+            FROM user_interaction_counts WHERE username = %s;
+        """, (username,))
+        row = cur.fetchone()
+        version = row[0] if row else None
+        if since is not None and (version or '') == since:
+            conn.close()
+            return {'version': version, 'changed': False, 'liked': [], 'bookmarked': []}
+
+        cur.execute(f"""
+            WITH u AS (SELECT id FROM users WHERE username = %s)
+            SELECT 'L', article_id, to_char(liked_at AT TIME ZONE 'UTC', {_UTC_ISO})
+            FROM article_likes WHERE user_id = (SELECT id FROM u)
+            UNION ALL
+            SELECT 'B', article_id, to_char(bookmarked_at AT TIME ZONE 'UTC', {_UTC_ISO})
+            FROM article_bookmarks WHERE user_id = (SELECT id FROM u);
+        """, (username,))
+        rows = cur.fetchall()
+        conn.close()
+        return {
+            'version': version,
+            'changed': True,
+            'liked': [(r[1], r[2]) for r in rows if r[0] == 'L'],
+            'bookmarked': [(r[1], r[2]) for r in rows if r[0] == 'B'],
         }
-        
-        # Add user interaction status if username provided
-        if username:
-            article_info['is_liked'] = is_article_liked(article_id, username)
-            article_info['is_bookmarked'] = is_article_bookmarked(article_id, username)
-        
-        return article_info
-        
+
     except Exception as e:
-        print(f"❌ Error getting article info: {e}")
+        report_db_error()
+        print(f"❌ Error getting user interaction changes: {e}")
         return None
 
 
+# ============================================
+# ASYNC VARIANTS (event loop Qt, lihat async_db.py)
+# ============================================
+# Query yang sama dengan versi sync, tapi tidak blocking dan tanpa thread:
+# mengembalikan AsyncResult, pakai .then(callback). Saat error, hasilnya
+# default yang sama dengan versi sync. Hanya untuk UI thread.
+
+def _async_query(sql: str, params: tuple, transform, default, label: str, args: tuple):
+    """
+    `label` = nama helper sync, `args` = argumennya. Di mode gateway / backend
+    SQLite tidak ada koneksi Postgres langsung, jadi helper (stub gateway atau
+    method backend) dijalankan di worker thread.
+    """
+    from async_db import async_database  # lazy: modul ini tetap bisa dipakai tanpa Qt
+    if not using_direct_postgres():
+        return async_database().call(globals()[label], *args, default=default, label=label)
+    return async_database().query(sql, params, transform=transform, default=default, label=label)
+
+
+def _row_returned(cur) -> bool:
+    return cur.fetchone() is not None
+
+
+def like_article_async(article_id: int, username: str):
+    """AsyncResult[bool] — lihat like_article()"""
+    return _async_query(_LIKE_SQL, (article_id, username), _row_returned, False,
+                        "like_article", (article_id, username))
+
+
+def unlike_article_async(article_id: int, username: str):
+    """AsyncResult[bool] — lihat unlike_article()"""
+    return _async_query(_UNLIKE_SQL, (article_id, username), _row_returned, False,
+                        "unlike_article", (article_id, username))
+
+
+def is_article_liked_async(article_id: int, username: str):
+    """AsyncResult[bool] — lihat is_article_liked()"""
+    return _async_query(_IS_LIKED_SQL, (article_id, username), _row_returned, False,
+                        "is_article_liked", (article_id, username))
+
+
+def bookmark_article_async(article_id: int, username: str):
+    """AsyncResult[bool] — lihat bookmark_article()"""
+    return _async_query(_BOOKMARK_SQL, (article_id, username), _row_returned, False,
+                        "bookmark_article", (article_id, username))
+
+
+def unbookmark_article_async(article_id: int, username: str):
+    """AsyncResult[bool] — lihat unbookmark_article()"""
+    return _async_query(_UNBOOKMARK_SQL, (article_id, username), _row_returned, False,
+                        "unbookmark_article", (article_id, username))
+
+
+def is_article_bookmarked_async(article_id: int, username: str):
+    """AsyncResult[bool] — lihat is_article_bookmarked()"""
+    return _async_query(_IS_BOOKMARKED_SQL, (article_id, username), _row_returned, False,
+                        "is_article_bookmarked", (article_id, username))
+
+
+def track_article_view_async(article_id: int, username: Optional[str] = None,
+                             ip_address: str = "0.0.0.0"):
+    """AsyncResult[bool] — lihat track_article_view()"""
+    return _async_query(_TRACK_VIEW_SQL, (article_id, username, username, ip_address),
+                        lambda cur: True, False,
+                        "track_article_view", (article_id, username, ip_address))
+
+
+def get_article_stats_async(article_id: int):
+    """AsyncResult[dict] — lihat get_article_stats()"""
+    return _async_query(_ARTICLE_STATS_SQL, (article_id,),
+                        lambda cur: _article_stats_from_row(cur.fetchone()),
+                        {'views': 0, 'likes': 0, 'bookmarks': 0}, "get_article_stats", (article_id,))
+
+
+def get_article_full_info_async(article_id: int, username: Optional[str] = None):
+    """AsyncResult[dict | None] — lihat get_article_full_info()"""
+    return _async_query(_ARTICLE_FULL_INFO_SQL, (username, username, article_id),
+                        lambda cur: _article_full_info_from_row(cur.fetchone(), username),
+                        None, "get_article_full_info", (article_id, username))
+
+
+def get_user_interaction_ids_async(username: str):
+    """AsyncResult[dict | None] — lihat get_user_interaction_ids()"""
+    return _async_query(_INTERACTION_IDS_SQL, (username,),
+                        lambda cur: _interaction_ids_from_rows(cur.fetchall()),
+                        None, "get_user_interaction_ids", (username,))
+
+
+# ============================================
+# TRANSPORT / STORAGE BACKEND
+# ============================================
+# TRANSPORT = gateway → helper di atas dipanggil lewat data_gateway.py
+# BACKEND = sqlite → helper di atas diganti method SqliteBackend
+
+from storage_backend import register_postgres_functions, install_backend_functions
+register_postgres_functions(globals(), "app_db_interactions")
+if using_gateway():
+    from gateway_client import install_remote_functions
+    install_remote_functions(globals(), "app_db_interactions")
+elif not using_direct_postgres():
+    install_backend_functions(globals(), "app_db_interactions")
+
+
 # ============================================
 # TESTING
 # ============================================
@@ -0,0 +1,303 @@
+# app_db_migrations.py — Versioned schema migrations (PostgreSQL)
+"""
+Satu engine migration untuk semua perubahan schema:
+- File SQL di folder migrations/ dengan nama NNN_nama.sql (NNN = versi)
+- Versi yang sudah jalan dicatat di schema_migrations (+ checksum SHA-256)
+- Startup cukup satu query untuk tahu apakah ada migration pending
+- Migration biasa jalan dalam satu transaksi bersama pencatatannya
+- File yang diawali `-- migrate:no-transaction` dijalankan per statement
+  di autocommit (wajib untuk CREATE INDEX CONCURRENTLY). Tulis statement
+  di file seperti ini secara idempotent (IF NOT EXISTS), karena kalau gagal
+  di tengah, statement sebelumnya tidak ikut di-rollback.
+
+Pakai:
+    python run_migration.py            # apply semua yang pending
+    python run_migration.py --status   # lihat status tiap versi
+"""
+
+import hashlib
+import os
+import re
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+from app_db_fixed import connect, invalidate_prepared_statements, _app_dir
+
+MIGRATIONS_DIR = os.path.join(_app_dir(), "migrations")
+
+NO_TRANSACTION_MARKER = "-- migrate:no-transaction"
+
+# Kunci advisory lock supaya dua client tidak migrate bersamaan
+MIGRATION_LOCK_KEY = 73190412
+
+Migration = namedtuple("Migration", "version name path checksum transactional")
+
+_FILENAME_RE = re.compile(r"^(\d+)_([\w\-]+)\.sql$")
+
+
+# ============================================
+# DISCOVERY
+# ============================================
+
+def discover_migrations(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """Semua file migration, urut berdasarkan versi."""
+    migrations = []
+    if not os.path.isdir(directory):
+        return migrations
+
+    seen = {}
+    for filename in os.listdir(directory):
+        match = _FILENAME_RE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in seen:
+            raise ValueError(f"Duplicate migration version {version}: {seen[version]}, {filename}")
+        seen[version] = filename
+
+        path = os.path.join(directory, filename)
+        with open(path, "r", encoding="utf-8") as f:
+            sql = f.read()
+        migrations.append(Migration(
+            version=version,
+            name=match.group(2),
+            path=path,
+            checksum=hashlib.sha256(sql.encode("utf-8")).hexdigest(),
+            transactional=not sql.lstrip().startswith(NO_TRANSACTION_MARKER),
+        ))
+    return sorted(migrations, key=lambda m: m.version)
+
+
+def split_statements(sql: str) -> List[str]:
+    """
+    Pecah file SQL jadi statement terpisah (untuk mode no-transaction).
+    Titik koma di dalam string, komentar, dan blok $$ ... $$ diabaikan.
+    """
+    statements = []
+    current = []
+    i = 0
+    length = len(sql)
+    while i < length:
+        ch = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = length if end == -1 else end
+            current.append(sql[i:end])
+            i = end
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            end = length if end == -1 else end + 2
+            current.append(sql[i:end])
+            i = end
+        elif ch == "'":
+            end = i + 1
+            while end < length:
+                if sql[end] == "'" and sql.startswith("''", end):
+                    end += 2
+                elif sql[end] == "'":
+                    break
+                else:
+                    end += 1
+            current.append(sql[i:end + 1])
+            i = end + 1
+        elif ch == "$" and re.match(r"\$\w*\$", sql[i:]):
+            tag = re.match(r"\$\w*\$", sql[i:]).group(0)
+            end = sql.find(tag, i + len(tag))
+            end = length if end == -1 else end + len(tag)
+            current.append(sql[i:end])
+            i = end
+        elif ch == ";":
+            statements.append("".join(current))
+            current = []
+            i += 1
+        else:
+            current.append(ch)
+            i += 1
+    statements.append("".join(current))
+
+    # Buang statement yang isinya hanya komentar/whitespace
+    result = []
+    for statement in statements:
+        code = re.sub(r"--[^\n]*|/\*.*?\*/", "", statement, flags=re.S).strip()
+        if code:
+            result.append(statement.strip())
+    return result
+
+
+# ============================================
+# STATE
+# ============================================
+
+def _ensure_migrations_table(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            checksum CHAR(64) NOT NULL,
+            applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            duration_ms INTEGER
+        );
+    """)
+
+
+def _applied_migrations(cur) -> Dict[int, str]:
+    """{version: checksum} dari schema_migrations (kosong kalau tabel belum ada)."""
+    cur.execute("""
+        SELECT CASE WHEN to_regclass('public.schema_migrations') IS NULL THEN NULL
+                    ELSE (xpath('/row/v/text()', query_to_xml(
+                        'SELECT string_agg(version || '':'' || checksum, '','') AS v
+                         FROM public.schema_migrations', false, true, '')))[1]::text
+               END;
+    """)
+    row = cur.fetchone()[0]
+    applied = {}
+    for item in (row or "").split(","):
+        if item:
+            version, checksum = item.split(":", 1)
+            applied[int(version)] = checksum.strip()
+    return applied
+
+
+def pending_migrations(migrations: Optional[List[Migration]] = None) -> Optional[List[Migration]]:
+    """
+    Migration yang belum jalan (satu query, tanpa DDL).
+    Returns None kalau database tidak bisa dihubungi.
+    """
+    if migrations is None:
+        migrations = discover_migrations()
+    conn, _ = connect()
+    if not conn:
+        return None
+    try:
+        cur = conn.cursor()
+        applied = _applied_migrations(cur)
+        conn.close()
+    except Exception as e:
+        print(f"⚠️ Error reading schema_migrations: {str(e)}")
+        conn.close()
+        return None
+
+    for m in migrations:
+        if m.version in applied and applied[m.version] != m.checksum:
+            print(f"⚠️ Migration {m.version:03d}_{m.name} changed after it was applied (checksum mismatch)")
+    return [m for m in migrations if m.version not in applied]
+
+
+def migration_status() -> List[tuple]:
+    """
+    Status setiap migration.
+    Returns: [(version, name, 'applied' | 'pending' | 'changed'), ...]
+    """
+    migrations = discover_migrations()
+    conn, _ = connect()
+    if not conn:
+        return []
+    try:
+        cur = conn.cursor()
+        applied = _applied_migrations(cur)
+        conn.close()
+    except Exception as e:
+        print(f"⚠️ Error reading schema_migrations: {str(e)}")
+        conn.close()
+        return []
+
+    status = []
+    for m in migrations:
+        if m.version not in applied:
+            state = "pending"
+        elif applied[m.version] != m.checksum:
+            state = "changed"
+        else:
+            state = "applied"
+        status.append((m.version, m.name, state))
+    return status
+
+
+# ============================================
+# APPLY
+# ============================================
+
+def _apply(conn, migration: Migration):
+    """Jalankan satu migration dan catat di schema_migrations."""
+    with open(migration.path, "r", encoding="utf-8") as f:
+        sql = f.read()
+    cur = conn.cursor()
+    cur.execute("SELECT clock_timestamp();")
+    started = cur.fetchone()[0]
+
+    if migration.transactional:
+        conn.autocommit = False
+        try:
+            cur.execute(sql)
+            _record(cur, migration, started)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.autocommit = True
+    else:
+        # CREATE INDEX CONCURRENTLY dsb. tidak boleh di dalam transaksi
+        for statement in split_statements(sql):
+            cur.execute(statement)
+        _record(cur, migration, started)
+
+
+def _record(cur, migration: Migration, started):
+    cur.execute("""
+        INSERT INTO schema_migrations (version, name, checksum, duration_ms)
+        VALUES (%s, %s, %s, (EXTRACT(EPOCH FROM clock_timestamp() - %s) * 1000)::int);
+    """, (migration.version, migration.name, migration.checksum, started))
+
+
+def migrate(target: Optional[int] = None, verbose: bool = True) -> bool:
+    """
+    Apply semua migration yang pending (sampai versi `target` kalau diisi).
+    Returns True kalau schema sudah up to date.
+    """
+    migrations = [m for m in discover_migrations() if target is None or m.version <= target]
+
+    conn, _ = connect()
+    if not conn:
+        print("✖ Cannot run migrations: Connection failed")
+        return False
+
+    locked = False
+    applied_now = 0
+    try:
+        conn.autocommit = True
+        cur = conn.cursor()
+        cur.execute("SELECT pg_advisory_lock(%s);", (MIGRATION_LOCK_KEY,))
+        locked = True
+        _ensure_migrations_table(cur)
+
+        # Baca ulang setelah dapat lock (client lain mungkin baru selesai)
+        applied = _applied_migrations(cur)
+        for m in migrations:
+            if m.version in applied:
+                if applied[m.version] != m.checksum:
+                    print(f"⚠️ Migration {m.version:03d}_{m.name} changed after it was applied (checksum mismatch)")
+                continue
+            if verbose:
+                mode = "" if m.transactional else " (no transaction)"
+                print(f"⚙️  Applying migration {m.version:03d}_{m.name}{mode}...")
+            _apply(conn, m)
+            applied_now += 1
+            if verbose:
+                print(f"   ✅ {m.version:03d}_{m.name} applied")
+        return True
+
+    except Exception as e:
+        print(f"❌ Migration failed: {str(e)}")
+        return False
+
+    finally:
+        if applied_now:
+            # Prepared statement di koneksi pool mungkin merujuk schema lama
+            invalidate_prepared_statements()
+        if locked:
+            try:
+                conn.cursor().execute("SELECT pg_advisory_unlock(%s);", (MIGRATION_LOCK_KEY,))
+            except Exception:
+                pass
+        conn.close()
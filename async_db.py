@@ -0,0 +1,424 @@
+# async_db.py — Query PostgreSQL tanpa blocking, langsung di event loop Qt
+"""
+Alternatif qt_workers untuk query pendek yang banyak:
+- Koneksi psycopg2 async (async_=True); socket-nya dipantau QSocketNotifier,
+  jadi tidak ada thread per query dan UI thread tidak pernah menunggu jaringan
+- Beberapa koneksi dibuka sekaligus (maks. ASYNC_MAX_CONNECTIONS), jadi
+  beberapa query bisa in-flight bersamaan; sisanya antre FIFO
+- Setiap query mengembalikan AsyncResult (future): .then(), signal
+  finished/failed, atau .wait() untuk script
+
+Batasan koneksi async psycopg2:
+- Selalu autocommit: satu execute = satu transaksi. Untuk beberapa statement
+  yang harus atomik, gabungkan dalam satu statement (CTE) atau pakai
+  helper sync + qt_workers.
+- Semua objek di modul ini milik UI thread. Jangan dipakai dari QThread.
+
+Pakai:
+    from async_db import async_database
+    async_database().query(
+        "SELECT COUNT(*) FROM news WHERE author = %s;", (author,),
+        transform=lambda cur: cur.fetchone()[0], default=0,
+    ).then(self._on_count)
+"""
+
+import collections
+from typing import Callable, Optional, Sequence
+
+import psycopg2
+import psycopg2.extensions
+from PyQt5 import QtCore, QtWidgets
+
+from app_db_fixed import (
+    DATABASE_URL, PROBE_TIMEOUT, CONNECT_ATTEMPT_TIMEOUT, connection_breaker, ssl_kwargs
+)
+
+ASYNC_MAX_CONNECTIONS = 4
+ASYNC_STATEMENT_TIMEOUT_MS = 15000   # dikirim ke server lewat options
+ASYNC_IDLE_CLOSE_SECONDS = 300       # koneksi idle selama ini ditutup
+
+_NO_DEFAULT = object()
+_database = None
+
+
+# ============================================
+# FUTURE
+# ============================================
+
+class AsyncResult(QtCore.QObject):
+    """
+    Hasil satu query async. Selesai tepat sekali: finished(result) atau
+    failed(message). Kalau dibuat dengan `default`, error tidak di-emit
+    sebagai failed tetapi diselesaikan dengan nilai default (sama seperti
+    helper sync yang mengembalikan default saat error).
+    """
+
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+
+    def __init__(self, sql: str, params: Sequence = (), transform: Optional[Callable] = None,
+                 default=_NO_DEFAULT, label: str = "query", parent=None):
+        super().__init__(parent)
+        self.sql = sql
+        self.params = tuple(params)
+        self.transform = transform
+        self.default = default
+        self.label = label
+        self._done = False
+        self._result = None
+        self._error: Optional[str] = None
+
+    def done(self) -> bool:
+        return self._done
+
+    def result(self):
+        """Hasil query; raise RuntimeError kalau belum selesai atau gagal"""
+        if not self._done:
+            raise RuntimeError(f"{self.label} belum selesai")
+        if self._error is not None:
+            raise RuntimeError(self._error)
+        return self._result
+
+    def error(self) -> Optional[str]:
+        return self._error
+
+    def then(self, on_result: Optional[Callable] = None,
+             on_error: Optional[Callable] = None) -> "AsyncResult":
+        """
+        Pasang callback. Kalau query sudah selesai, callback tetap dipanggil
+        asynchronous (giliran event loop berikutnya), tidak di dalam then().
+        """
+        if not self._done:
+            if on_result:
+                self.finished.connect(on_result)
+            if on_error:
+                self.failed.connect(on_error)
+        elif self._error is None:
+            if on_result:
+                QtCore.QTimer.singleShot(0, lambda: on_result(self._result))
+        elif on_error:
+            QtCore.QTimer.singleShot(0, lambda: on_error(self._error))
+        return self
+
+    def wait(self, timeout_ms: int = 30000) -> bool:
+        """
+        Jalankan event loop lokal sampai query selesai (untuk script/benchmark,
+        jangan dipakai di handler UI). Returns True kalau sudah selesai.
+        """
+        if self._done:
+            return True
+        loop = QtCore.QEventLoop()
+        self.finished.connect(loop.quit)
+        self.failed.connect(loop.quit)
+        QtCore.QTimer.singleShot(timeout_ms, loop.quit)
+        loop.exec_()
+        return self._done
+
+    # ---------- Dipanggil AsyncDatabase ----------
+
+    def _resolve(self, value):
+        if self._done:
+            return
+        self._done = True
+        self._result = value
+        self.finished.emit(value)
+
+    def _reject(self, message: str):
+        if self._done:
+            return
+        print(f"❌ Error in {self.label}: {message}")
+        if self.default is not _NO_DEFAULT:
+            self._resolve(self.default)
+            return
+        self._done = True
+        self._error = message
+        self.failed.emit(message)
+
+
+# ============================================
+# CONNECTION
+# ============================================
+
+class AsyncConnection(QtCore.QObject):
+    """
+    Satu koneksi psycopg2 async + QSocketNotifier read/write.
+    Menjalankan satu query dalam satu waktu (batasan libpq).
+    """
+
+    opened = QtCore.pyqtSignal(object)        # handshake selesai
+    ready = QtCore.pyqtSignal(object)         # siap menerima query berikutnya
+    broken = QtCore.pyqtSignal(object, str)   # koneksi tidak bisa dipakai lagi
+
+    def __init__(self, connect_timeout: float, parent=None):
+        super().__init__(parent)
+        self.conn = None
+        self.cursor = None
+        self.current: Optional[AsyncResult] = None
+        self.connected = False
+        self.idle_since = None
+        self._fd = -1
+        self._read_notifier = None
+        self._write_notifier = None
+
+        # libpq tidak menerapkan connect_timeout di mode non-blocking
+        self._deadline = QtCore.QTimer(self)
+        self._deadline.setSingleShot(True)
+        self._deadline.timeout.connect(self._on_connect_timeout)
+        self._deadline.start(int(connect_timeout * 1000))
+
+        try:
+            self.conn = psycopg2.connect(
+                DATABASE_URL, async_=True, **ssl_kwargs(),
+                options=f"-c statement_timeout={ASYNC_STATEMENT_TIMEOUT_MS}",
+            )
+        except Exception as e:
+            QtCore.QTimer.singleShot(0, lambda: self._fail(str(e)))
+            return
+        self._poll()
+
+    @property
+    def busy(self) -> bool:
+        return self.current is not None
+
+    def execute(self, query: AsyncResult):
+        """Kirim query (koneksi harus connected dan tidak busy)"""
+        self.current = query
+        self.idle_since = None
+        try:
+            self.cursor = self.conn.cursor()
+            self.cursor.execute(query.sql, query.params or None)
+        except Exception as e:
+            self._on_error(str(e).strip())
+            return
+        self._poll()
+
+    def close(self):
+        self._deadline.stop()
+        self._set_notifiers(None)
+        if self.conn is not None and not self.conn.closed:
+            try:
+                self.conn.close()
+            except Exception:
+                pass
+
+    # ---------- Poll loop ----------
+
+    def _poll(self, *_):
+        try:
+            state = self.conn.poll()
+        except Exception as e:
+            self._on_error(str(e).strip())
+            return
+
+        # Selama handshake libpq bisa pindah socket (host/alamat berikutnya)
+        if self.conn.fileno() != self._fd:
+            self._watch(self.conn.fileno())
+
+        if state == psycopg2.extensions.POLL_OK:
+            self._set_notifiers(None)
+            self._on_ok()
+        elif state == psycopg2.extensions.POLL_READ:
+            self._set_notifiers(QtCore.QSocketNotifier.Read)
+        elif state == psycopg2.extensions.POLL_WRITE:
+            self._set_notifiers(QtCore.QSocketNotifier.Write)
+
+    def _watch(self, fd: int):
+        for notifier in (self._read_notifier, self._write_notifier):
+            if notifier is not None:
+                notifier.setEnabled(False)
+                notifier.deleteLater()
+        self._fd = fd
+        self._read_notifier = QtCore.QSocketNotifier(fd, QtCore.QSocketNotifier.Read, self)
+        self._write_notifier = QtCore.QSocketNotifier(fd, QtCore.QSocketNotifier.Write, self)
+        self._read_notifier.activated.connect(self._poll)
+        self._write_notifier.activated.connect(self._poll)
+
+    def _set_notifiers(self, kind):
+        if self._read_notifier is not None:
+            self._read_notifier.setEnabled(kind == QtCore.QSocketNotifier.Read)
+        if self._write_notifier is not None:
+            self._write_notifier.setEnabled(kind == QtCore.QSocketNotifier.Write)
+
+    def _on_ok(self):
+        if not self.connected:
+            self.connected = True
+            self._deadline.stop()
+            self.idle_since = QtCore.QDateTime.currentSecsSinceEpoch()
+            self.opened.emit(self)
+            self.ready.emit(self)
+            return
+
+        query, self.current = self.current, None
+        cursor, self.cursor = self.cursor, None
+        self.idle_since = QtCore.QDateTime.currentSecsSinceEpoch()
+        try:
+            value = query.transform(cursor) if query.transform else None
+        except Exception as e:
+            error = str(e)
+        else:
+            error = None
+        cursor.close()
+        # Callback boleh langsung mengantrekan query baru ke koneksi ini
+        if error is None:
+            query._resolve(value)
+        else:
+            query._reject(error)
+        self.ready.emit(self)
+
+    def _on_error(self, message: str):
+        # Error SQL (constraint, syntax, statement_timeout) hanya menggagalkan
+        # query ini; koneksinya tetap dipakai. Selain itu koneksi dibuang.
+        if not self.connected or self.conn.closed:
+            self._fail(message)
+            return
+        query, self.current = self.current, None
+        self.idle_since = QtCore.QDateTime.currentSecsSinceEpoch()
+        if self.cursor is not None:
+            self.cursor.close()
+            self.cursor = None
+        if query is not None:
+            query._reject(message)
+        self.ready.emit(self)
+
+    def _on_connect_timeout(self):
+        if not self.connected:
+            self._fail("connection timeout expired")
+
+    def _fail(self, message: str):
+        self.close()
+        self.broken.emit(self, message)
+
+
+# ============================================
+# DATABASE (dispatcher)
+# ============================================
+
+class AsyncDatabase(QtCore.QObject):
+    """Antrean query + sekumpulan AsyncConnection"""
+
+    def __init__(self, max_connections: int = ASYNC_MAX_CONNECTIONS, parent=None):
+        super().__init__(parent)
+        self.max_connections = max_connections
+        self._connections = []
+        self._queue = collections.deque()
+
+        self._idle_timer = QtCore.QTimer(self)
+        self._idle_timer.timeout.connect(self._close_idle)
+        self._idle_timer.start(60 * 1000)
+
+    def query(self, sql: str, params: Sequence = (), transform: Optional[Callable] = None,
+              default=_NO_DEFAULT, label: str = "query") -> AsyncResult:
+        """
+        Antrekan satu statement. `transform(cursor)` dipanggil di UI thread
+        setelah hasil tiba (mis. lambda cur: cur.fetchall()).
+        """
+        result = AsyncResult(sql, params, transform, default, label, parent=self)
+        result.finished.connect(result.deleteLater)
+        result.failed.connect(result.deleteLater)
+        if not DATABASE_URL:
+            QtCore.QTimer.singleShot(0, lambda: result._reject("DATABASE_URL tidak ditemukan"))
+            return result
+        self._queue.append(result)
+        self._dispatch()
+        return result
+
+    def call(self, func: Callable, *args, default=_NO_DEFAULT, label: str = "call") -> AsyncResult:
+        """
+        Jalankan fungsi blocking (mis. helper lewat data gateway atau backend SQLite) di worker
+        thread, dengan hasil berupa AsyncResult yang sama seperti query().
+        """
+        from qt_workers import run_in_background
+        result = AsyncResult("", (), None, default, label, parent=self)
+        result.finished.connect(result.deleteLater)
+        result.failed.connect(result.deleteLater)
+        run_in_background(func, *args, on_result=result._resolve, on_error=result._reject, parent=self)
+        return result
+
+    def pending_count(self) -> int:
+        """Query yang belum selesai (antre + in-flight)"""
+        return len(self._queue) + sum(1 for c in self._connections if c.busy)
+
+    def close(self):
+        """Tutup semua koneksi; query yang masih antre digagalkan"""
+        self._idle_timer.stop()
+        for conn in self._connections:
+            if conn.current is not None:
+                conn.current._reject("database closed")
+            conn.close()
+        self._connections = []
+        self._fail_queue("database closed")
+
+    # ---------- Internal ----------
+
+    def _dispatch(self):
+        for conn in self._connections:
+            if not self._queue:
+                return
+            if conn.connected and not conn.busy:
+                conn.execute(self._queue.popleft())
+
+        connecting = sum(1 for c in self._connections if not c.connected)
+        if connecting and connecting == len(self._connections):
+            return  # belum ada koneksi yang berhasil: jangan serbu server, tunggu yang pertama
+        if len(self._queue) > connecting and len(self._connections) < self.max_connections:
+            self._open_connection()
+
+    def _open_connection(self):
+        breaker = connection_breaker()
+        allowed, is_probe = breaker.allow()
+        if not allowed:
+            if not self._connections:
+                self._fail_queue(f"Database offline, retry in {breaker.seconds_until_retry():.0f}s")
+            return
+        timeout = PROBE_TIMEOUT if is_probe else CONNECT_ATTEMPT_TIMEOUT
+        conn = AsyncConnection(timeout, parent=self)
+        conn.opened.connect(lambda _: connection_breaker().record_success())
+        conn.ready.connect(self._on_ready)
+        conn.broken.connect(self._on_broken)
+        self._connections.append(conn)
+
+    def _on_ready(self, conn: AsyncConnection):
+        self._dispatch()
+
+    def _on_broken(self, conn: AsyncConnection, message: str):
+        if conn in self._connections:
+            self._connections.remove(conn)
+        conn.deleteLater()
+
+        if conn.connected:
+            # Putus di tengah query (idle timeout server, jaringan, dsb.)
+            if conn.current is not None:
+                conn.current._reject(message)
+        else:
+            connection_breaker().record_failure(message)
+            if not self._connections:
+                self._fail_queue(message)
+        self._dispatch()
+
+    def _fail_queue(self, message: str):
+        while self._queue:
+            self._queue.popleft()._reject(message)
+
+    def _close_idle(self):
+        now = QtCore.QDateTime.currentSecsSinceEpoch()
+        for conn in list(self._connections):
+            if conn.idle_since is not None and now - conn.idle_since >= ASYNC_IDLE_CLOSE_SECONDS:
+                self._connections.remove(conn)
+                conn.close()
+                conn.deleteLater()
+
+
+def async_database() -> AsyncDatabase:
+    """AsyncDatabase global (dibuat di UI thread saat pertama kali dipakai)"""
+    global _database
+    if _database is None:
+        _database = AsyncDatabase(parent=QtWidgets.QApplication.instance())
+    return _database
+
+
+def close_async_database():
+    """Tutup koneksi async (dipanggil saat aplikasi keluar)"""
+    global _database
+    if _database is not None:
+        _database.close()
+        _database = None
@@ -17,8 +17,8 @@ from PyQt5.QtCore import (
 
 # Backend
 from app_db_fixed import (
-    verify_user, create_user, user_exists, setup_database,
-    start_session, health_check
+    login, register, ensure_schema, health_check,
+    AUTH_CONNECTION_FAILED, AUTH_DB_ERROR, AUTH_USERNAME_TAKEN
 )
 
 # Modern notification
@@ -33,7 +33,11 @@ class CyberpunkAuthWindow(QtWidgets.QWidget):
     ANIMATION_DURATION = 600
     EASING_CURVE = QEasingCurve.InOutCubic
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, db_ready=None):
+        """
+        db_ready: hasil cek database dari splash screen (main.py).
+        None → cek database sendiri di sini (auth window dibuka langsung).
+        """
         super().__init__(parent)
         
         # State tracking
@@ -45,7 +49,10 @@ class CyberpunkAuthWindow(QtWidgets.QWidget):
         self._setup_ui()
         self._apply_cyberpunk_style()
         self.retranslateUi()
-        self._init_database()
+        if db_ready is None:
+            self._init_database()
+        elif not db_ready:
+            self.toast(self._get_trans_text("toast_db_failed"), "error")
         
         # Glitch animation timer
         self.glitch_timer = QTimer(self)
@@ -525,12 +532,9 @@ class CyberpunkAuthWindow(QtWidgets.QWidget):
         if not u or not p:
             return self.toast(self._get_trans_text("toast_fill_fields"), "warning")
         
-        role = verify_user(u, p)
+        # Verifikasi + buka session dalam satu round trip
+        role, sid, reason = login(u, p)
         if role:
-            sid = start_session(u)
-            if sid is None:
-                return self.toast(self._get_trans_text("toast_session_failed"), "error")
-            
             try:
                 from dashboard_ui import DashboardWindow
             except ImportError as e:
@@ -540,6 +544,10 @@ class CyberpunkAuthWindow(QtWidgets.QWidget):
             self.dashboard = DashboardWindow(u, role, sid)
             self.dashboard.destroyed.connect(self.show)
             self.dashboard.show()
+        elif reason == AUTH_CONNECTION_FAILED:
+            return self.toast(self._get_trans_text("toast_db_failed"), "error")
+        elif reason == AUTH_DB_ERROR:
+            return self.toast(self._get_trans_text("toast_session_failed"), "error")
         else:
             return self.toast(self._get_trans_text("toast_wrong_user_pass"), "error")
     
@@ -566,16 +574,16 @@ class CyberpunkAuthWindow(QtWidgets.QWidget):
             return self.toast(self._get_trans_text("toast_username_min"), "warning")
         if len(p) < 4:
             return self.toast(self._get_trans_text("toast_password_min"), "warning")
-        if user_exists(u):
-            return self.toast(self._get_trans_text("toast_username_taken"), "error")
-        
-        ok = create_user(u, p, role)
-        if ok:
+        # Cek username + insert dalam satu statement (ON CONFLICT)
+        created_role, _, reason = register(u, p, role, open_session=False)
+        if created_role:
             self.toast(self._get_trans_text_fmt("toast_register_success", u), "success")
             username_input.clear()
             email_input.clear()
             password_input.clear()
             QtCore.QTimer.singleShot(1500, self.switch_to_login)
+        elif reason == AUTH_USERNAME_TAKEN:
+            self.toast(self._get_trans_text("toast_username_taken"), "error")
         else:
             self.toast(self._get_trans_text("toast_register_failed"), "error")
     
@@ -601,7 +609,7 @@ class CyberpunkAuthWindow(QtWidgets.QWidget):
             if not health_check():
                 self.toast(self._get_trans_text("toast_db_failed"), "error")
                 return
-            setup_database()
+            ensure_schema()
         except Exception as e:
             self.toast(f"{self._get_trans_text('toast_db_error')} {str(e)}", "error")
     
@@ -0,0 +1,472 @@
+# bench_data_layer.py — Benchmark helper data layer + deteksi regresi
+"""
+Benchmark yang bisa diulang untuk SEMUA helper publik app_db_fixed /
+app_db_interactions (daftar = gateway_protocol.OPERATIONS) di beberapa skala
+data. Per skala:
+
+1. reset + seed data sintetis (seed_data.py) — Postgres HANYA yang lokal
+2. tiap helper dipanggil beberapa kali (warmup dulu), argumen berputar di
+   artikel/user berbeda supaya tidak selalu kena baris yang sama
+3. median / p95 / min / mean (ms) disimpan ke file history JSON
+
+Skala (article_views ≈ 1k / 100k / 10M baris):
+    1k, 100k, 10m   → lihat SCALES
+
+Write helper (like, bookmark, session, ...) dibersihkan lagi di luar waktu
+ukur (unlike, end_session, ...), jadi hasil tiap iterasi sebanding.
+
+Pakai:
+    # Postgres lokal (--database-url menimpa config.ini), skala kecil & sedang
+    python bench_data_layer.py --scales 1k 100k --label "before index"
+
+    # Tanpa Postgres: backend SQLite in-process
+    python bench_data_layer.py --backend sqlite --scales 1k 100k
+
+    # Bandingkan dua run terakhir (backend sama), flag regresi > 20%
+    python bench_data_layer.py --compare
+    python bench_data_layer.py --compare --base "before index" --head -1 --threshold 0.1
+
+    # CI: jalankan, bandingkan dengan run sebelumnya, exit 1 kalau regresi
+    python bench_data_layer.py --scales 1k --fail-on-regression
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import uuid
+from collections import namedtuple
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+HISTORY_FILE = "bench_history.json"
+DEFAULT_ITERATIONS = 30
+WARMUP_ITERATIONS = 3
+CASE_TIME_BUDGET = 10.0      # detik maksimum per helper per skala
+DEFAULT_THRESHOLD = 0.20     # +20% median = regresi
+MIN_DELTA_MS = 0.2           # selisih lebih kecil dari ini dianggap noise
+
+# Argumen seed_data per skala
+SCALES = {
+    "1k": dict(users=100, authors=10, articles=200, likes_per_user=10,
+               bookmarks_per_user=3, views=1_000),
+    "100k": dict(users=2_000, authors=50, articles=5_000, likes_per_user=20,
+                 bookmarks_per_user=5, views=100_000),
+    "10m": dict(users=50_000, authors=500, articles=100_000, likes_per_user=30,
+                bookmarks_per_user=10, views=10_000_000),
+}
+
+
+# ============================================
+# CASES
+# ============================================
+
+# args(backend, ctx, i) → tuple argumen (tidak diukur)
+# after(backend, ctx, args, result) → cleanup (tidak diukur)
+Case = namedtuple("Case", "args after")
+
+
+def _case(args, after=None) -> Case:
+    return Case(args, after)
+
+
+def _article(ctx, i) -> int:
+    return ctx.articles[i % len(ctx.articles)]
+
+
+def _unique(ctx, i) -> str:
+    return f"bench_{ctx.token}_{ctx.scale}_{i}"
+
+
+def _end_login(b, ctx, args, result):
+    if result and result[1] is not None:
+        b.end_session(result[1])
+
+
+def _end_started(b, ctx, args, result):
+    if result is not None:
+        b.end_session(result)
+
+
+def _new_session(b, ctx, i):
+    return (b.start_session(ctx.user),)
+
+
+def _liked(b, ctx, i):
+    args = (_article(ctx, i), ctx.bench_user)
+    b.like_article(*args)
+    return args
+
+
+def _bookmarked(b, ctx, i):
+    args = (_article(ctx, i), ctx.bench_user)
+    b.bookmark_article(*args)
+    return args
+
+
+CASES = {
+    # ---------- app_db_fixed ----------
+    "ensure_schema": _case(lambda b, ctx, i: ()),
+    "health_check": _case(lambda b, ctx, i: ()),
+    "user_exists": _case(lambda b, ctx, i: (ctx.users[i % len(ctx.users)],)),
+    "create_user": _case(lambda b, ctx, i: (_unique(ctx, i), "password")),
+    "verify_user": _case(lambda b, ctx, i: (ctx.user, "password")),
+    "login": _case(lambda b, ctx, i: (ctx.user, "password"), _end_login),
+    "register": _case(lambda b, ctx, i: (_unique(ctx, i) + "_r", "password"), _end_login),
+    "start_session": _case(lambda b, ctx, i: (ctx.user,), _end_started),
+    "heartbeat": _case(lambda b, ctx, i: (ctx.session_id,)),
+    "end_session": _case(_new_session),
+    "latest_presence_per_user": _case(lambda b, ctx, i: ()),
+    "create_news": _case(lambda b, ctx, i: (ctx.author, f"Benchmark article {_unique(ctx, i)}",
+                                            "Benchmark content. " * 20, True)),
+    "list_my_news": _case(lambda b, ctx, i: (ctx.author, 50)),
+    "get_author_summary": _case(lambda b, ctx, i: (ctx.author,)),
+    "list_published_news": _case(lambda b, ctx, i: (50,)),
+
+    # ---------- app_db_interactions: write ----------
+    "like_article": _case(lambda b, ctx, i: (_article(ctx, i), ctx.bench_user),
+                          lambda b, ctx, args, result: b.unlike_article(*args)),
+    "unlike_article": _case(_liked),
+    "bookmark_article": _case(lambda b, ctx, i: (_article(ctx, i), ctx.bench_user),
+                              lambda b, ctx, args, result: b.unbookmark_article(*args)),
+    "unbookmark_article": _case(_bookmarked),
+    "track_article_view": _case(lambda b, ctx, i: (_article(ctx, i), ctx.user)),
+
+    # ---------- app_db_interactions: read ----------
+    "is_article_liked": _case(lambda b, ctx, i: (_article(ctx, i), ctx.user)),
+    "is_article_bookmarked": _case(lambda b, ctx, i: (_article(ctx, i), ctx.user)),
+    "get_article_likes_count": _case(lambda b, ctx, i: (_article(ctx, i),)),
+    "get_article_bookmarks_count": _case(lambda b, ctx, i: (_article(ctx, i),)),
+    "get_article_views": _case(lambda b, ctx, i: (_article(ctx, i),)),
+    "get_article_stats": _case(lambda b, ctx, i: (_article(ctx, i),)),
+    "get_engagement_rate": _case(lambda b, ctx, i: (_article(ctx, i),)),
+    "get_article_full_info": _case(lambda b, ctx, i: (_article(ctx, i), ctx.user)),
+    "get_user_liked_articles": _case(lambda b, ctx, i: (ctx.users[i % len(ctx.users)], 50)),
+    "get_user_bookmarked_articles": _case(lambda b, ctx, i: (ctx.users[i % len(ctx.users)], 50)),
+    "get_article_likers": _case(lambda b, ctx, i: (_article(ctx, i), 50)),
+    "get_user_interaction_summary": _case(lambda b, ctx, i: (ctx.users[i % len(ctx.users)],)),
+    "get_user_interaction_ids": _case(lambda b, ctx, i: (ctx.users[i % len(ctx.users)],)),
+    "get_trending_articles": _case(lambda b, ctx, i: (50, 7)),
+    "get_popular_articles": _case(lambda b, ctx, i: (50,)),
+    "get_most_liked_articles": _case(lambda b, ctx, i: (50,)),
+    "get_penerbit_stats": _case(lambda b, ctx, i: (ctx.author,)),
+
+    # ---------- replica sync ----------
+    "get_news_changes": _case(lambda b, ctx, i: (None, 0, 500)),
+    "get_news_counters": _case(lambda b, ctx, i: (0, 5000)),
+    "get_user_interaction_changes": _case(lambda b, ctx, i: (ctx.users[i % len(ctx.users)], None)),
+}
+
+
+def missing_cases() -> List[str]:
+    """Helper di OPERATIONS yang belum punya case (harusnya kosong)"""
+    from gateway_protocol import OPERATIONS
+    return sorted(set(OPERATIONS) - set(CASES))
+
+
+# ============================================
+# RUNNER
+# ============================================
+
+def _stats(samples: List[float]) -> dict:
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * len(ordered) + 0.5)) - 1)]
+    return {
+        "n": len(ordered),
+        "median_ms": statistics.median(ordered) * 1000,
+        "p95_ms": p95 * 1000,
+        "min_ms": ordered[0] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+    }
+
+
+def _context(backend, scale: str, params: dict) -> SimpleNamespace:
+    from seed_data import demo_user, demo_author
+    ctx = SimpleNamespace(
+        scale=scale,
+        token=uuid.uuid4().hex[:8],
+        user=demo_user(1),
+        users=[demo_user(i) for i in range(1, min(params["users"], 200) + 1)],
+        author=demo_author(1),
+        bench_user=f"bench_{uuid.uuid4().hex[:8]}",
+    )
+    # Artikel terbaru + terpopuler: campuran baris panas dan biasa
+    rows = backend.list_published_news(200) + backend.get_popular_articles(50)
+    ctx.articles = sorted({r[0] for r in rows}) or [1]
+    backend.create_user(ctx.bench_user, "password")
+    ctx.session_id = backend.start_session(ctx.user)
+    return ctx
+
+
+def bench_case(backend, name: str, case: Case, ctx, iterations: int,
+               budget: float = CASE_TIME_BUDGET) -> Optional[dict]:
+    func = getattr(backend, name)
+    samples = []
+    deadline = time.monotonic() + budget
+    for i in range(WARMUP_ITERATIONS + iterations):
+        args = case.args(backend, ctx, i)
+        started = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - started
+        if case.after:
+            case.after(backend, ctx, args, result)
+        if i >= WARMUP_ITERATIONS:
+            samples.append(elapsed)
+            if time.monotonic() > deadline:
+                break
+    return _stats(samples) if samples else None
+
+
+def make_backend(name: str):
+    """Backend segar per skala (SQLite :memory: baru; Postgres = helper asli)"""
+    if name == "sqlite":
+        from sqlite_backend import SqliteBackend
+        return SqliteBackend(":memory:")
+    from storage_backend import get_backend
+    return get_backend("postgres")
+
+
+def prepare_scale(backend_name: str, backend, scale: str, seed: int,
+                  reseed: bool, allow_remote: bool) -> Dict[str, int]:
+    from seed_data import seed_postgres, reset_postgres
+    params = dict(SCALES[scale], seed=seed)
+    if backend_name == "sqlite":
+        backend.ensure_schema()
+        return backend.seed_demo_data(**params)
+    if not backend.ensure_schema():
+        raise RuntimeError("Postgres schema not ready (database offline or "
+                           "pending migrations; run python run_migration.py)")
+    if not reseed:
+        return {}
+    if not reset_postgres(allow_remote):
+        raise RuntimeError("Reset failed")
+    counts = seed_postgres(allow_remote=allow_remote, **params)
+    if not counts:
+        raise RuntimeError("Seeding failed")
+    return counts
+
+
+def run_scale(backend_name: str, scale: str, iterations: int, seed: int = 42,
+              reseed: bool = True, allow_remote: bool = False, only=None,
+              verbose: bool = False) -> dict:
+    backend = make_backend(backend_name)
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    started = time.perf_counter()
+    with output:
+        counts = prepare_scale(backend_name, backend, scale, seed, reseed, allow_remote)
+    print(f"🌱 [{scale}] data ready in {time.perf_counter() - started:.1f}s: {counts or 'existing data'}")
+
+    results = {}
+    with output:
+        ctx = _context(backend, scale, SCALES[scale])
+    for name, case in CASES.items():
+        if only and name not in only:
+            continue
+        with output:
+            stats = bench_case(backend, name, case, ctx, iterations)
+        if stats:
+            results[name] = stats
+            print(f"   {name:<30} {stats['median_ms']:>9.3f} ms  (p95 {stats['p95_ms']:.3f}, n={stats['n']})")
+    with output:
+        if ctx.session_id is not None:
+            backend.end_session(ctx.session_id)
+        if backend_name == "sqlite":
+            backend.close_pool()
+    return {"counts": counts, "results": results}
+
+
+# ============================================
+# HISTORY
+# ============================================
+
+def load_history(path: str) -> List[dict]:
+    if not os.path.exists(path):
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("runs", [])
+    except (OSError, ValueError) as e:
+        print(f"⚠️ Could not read {path}: {e}")
+        return []
+
+
+def save_history(path: str, runs: List[dict]):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"runs": runs}, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, timeout=5, cwd=os.path.dirname(os.path.abspath(__file__))
+                              ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def find_run(runs: List[dict], ref: str, backend: Optional[str] = None) -> Optional[dict]:
+    """ref: index (-1 = terakhir), id run, atau label; difilter per backend"""
+    candidates = [r for r in runs if backend is None or r["backend"] == backend]
+    try:
+        return candidates[int(ref)]
+    except (ValueError, IndexError):
+        pass
+    for run in reversed(candidates):
+        if ref in (run.get("id"), run.get("label")):
+            return run
+    return None
+
+
+# ============================================
+# COMPARE
+# ============================================
+
+def compare_runs(base: dict, head: dict, threshold: float = DEFAULT_THRESHOLD,
+                 min_delta: float = MIN_DELTA_MS, metric: str = "median_ms") -> List[dict]:
+    """
+    Bandingkan `metric` per (skala, nama) yang ada di kedua run.
+    min_delta dalam satuan metric (ms untuk *_ms, kB untuk *_kb).
+    """
+    rows = []
+    for scale, head_scale in head["scales"].items():
+        base_scale = base["scales"].get(scale)
+        if not base_scale:
+            continue
+        for name, head_stats in head_scale["results"].items():
+            base_stats = base_scale["results"].get(name)
+            if not base_stats or metric not in base_stats or metric not in head_stats:
+                continue
+            before, after = base_stats[metric], head_stats[metric]
+            change = (after - before) / before if before else 0.0
+            if change > threshold and after - before > min_delta:
+                status = "regression"
+            elif change < -threshold and before - after > min_delta:
+                status = "improved"
+            else:
+                status = "ok"
+            rows.append({"scale": scale, "name": name, "metric": metric, "base": before,
+                         "head": after, "change": change, "status": status})
+    return rows
+
+
+def print_comparison(base: dict, head: dict, rows: List[dict], show_all: bool = False) -> int:
+    print(f"\n📈 {base.get('label') or base['id']} ({base.get('git') or '?'}) → "
+          f"{head.get('label') or head['id']} ({head.get('git') or '?'})")
+    icons = {"regression": "❌", "improved": "✅", "ok": "  "}
+    for row in rows:
+        if show_all or row["status"] != "ok":
+            name = row["name"] if row["metric"] == "median_ms" else f"{row['name']} {row['metric']}"
+            unit = "kB" if row["metric"].endswith("_kb") else "ms"
+            print(f"{icons[row['status']]} [{row['scale']:>4}] {name:<40} "
+                  f"{row['base']:>9.3f} → {row['head']:>9.3f} {unit}  ({row['change'] * 100:+.1f}%)")
+    regressions = sum(1 for r in rows if r["status"] == "regression")
+    improved = sum(1 for r in rows if r["status"] == "improved")
+    print(f"📊 {len(rows)} compared, {regressions} regressions, {improved} improved")
+    return regressions
+
+
+# ============================================
+# MAIN
+# ============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark app_db_* helpers with regression tracking")
+    parser.add_argument("--backend", choices=("postgres", "sqlite"), default="postgres")
+    parser.add_argument("--scales", nargs="+", choices=list(SCALES), default=["1k", "100k"])
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--only", nargs="+", metavar="HELPER", help="benchmark helper tertentu saja")
+    parser.add_argument("--label", help="nama run di history (mis. 'before index')")
+    parser.add_argument("--history", default=None, help=f"file history (default {HISTORY_FILE})")
+    parser.add_argument("--database-url", help="Postgres tujuan (menimpa config.ini)")
+    parser.add_argument("--no-reseed", action="store_true", help="pakai data Postgres yang sudah ada")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--allow-remote", action="store_true", help="izinkan seed ke Postgres non-lokal")
+    parser.add_argument("--compare", action="store_true", help="hanya bandingkan run di history")
+    parser.add_argument("--base", default="-2", help="run pembanding: index, id, atau label")
+    parser.add_argument("--head", default="-1", help="run yang dinilai: index, id, atau label")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="kenaikan median (fraksi) yang dianggap regresi")
+    parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS)
+    parser.add_argument("--fail-on-regression", action="store_true",
+                        help="setelah run, bandingkan dengan run sebelumnya; exit 1 kalau regresi")
+    parser.add_argument("--all", action="store_true", help="tampilkan semua baris perbandingan")
+    parser.add_argument("--verbose", action="store_true", help="tampilkan output helper app_db_*")
+    args = parser.parse_args()
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    history_path = args.history or os.path.join(here, HISTORY_FILE)
+    runs = load_history(history_path)
+
+    if args.compare:
+        base = find_run(runs, args.base, args.backend)
+        head = find_run(runs, args.head, args.backend)
+        if not base or not head:
+            print(f"❌ Need two {args.backend} runs in {history_path} (base={args.base}, head={args.head})")
+            return 1
+        regressions = print_comparison(base, head, compare_runs(base, head, args.threshold, args.min_delta_ms),
+                                       args.all)
+        return 1 if regressions else 0
+
+    # Helper Postgres asli, bukan stub gateway / SQLite dari config.ini
+    os.environ["CRYPTO_INSIGHT_BACKEND"] = "postgres"
+    os.environ["CRYPTO_INSIGHT_TRANSPORT"] = "direct"
+    if args.database_url:
+        os.environ["CRYPTO_INSIGHT_DATABASE_URL"] = args.database_url
+
+    if args.backend == "postgres":
+        from seed_data import check_local_database, RemoteDatabaseError
+        try:
+            check_local_database(args.allow_remote)
+        except RemoteDatabaseError as e:
+            print(f"❌ {e}")
+            return 1
+
+    missing = missing_cases()
+    if missing:
+        print(f"⚠️ No benchmark case for: {', '.join(missing)}")
+
+    run = {
+        "id": datetime.datetime.now().strftime("%Y%m%d-%H%M%S"),
+        "label": args.label,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "backend": args.backend,
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "iterations": args.iterations,
+        "scales": {},
+    }
+    print(f"🏁 Benchmark {args.backend}: scales={', '.join(args.scales)}, iterations={args.iterations}")
+    try:
+        for scale in args.scales:
+            run["scales"][scale] = run_scale(args.backend, scale, args.iterations, args.seed,
+                                             reseed=not args.no_reseed, allow_remote=args.allow_remote,
+                                             only=set(args.only or ()), verbose=args.verbose)
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        if not run["scales"]:
+            return 1
+
+    previous = find_run(runs, "-1", args.backend)
+    runs.append(run)
+    save_history(history_path, runs)
+    print(f"💾 Saved run {run['id']} to {history_path}")
+
+    if previous:
+        regressions = print_comparison(previous, run, compare_runs(previous, run, args.threshold,
+                                                                   args.min_delta_ms), args.all)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,566 @@
+# bench_ui.py — Benchmark rendering UI headless (offscreen) dengan data stub
+"""
+Mengukur berapa lama setiap window dibangun, tampil, dan terisi data, plus
+memori yang dipakainya — tanpa layar dan tanpa Postgres:
+
+- QT_QPA_PLATFORM=offscreen
+- Helper app_db_* dilayani backend SQLite in-process (storage_backend.py)
+  yang di-seed data sintetis (user0001.., penerbit001)
+- Window admin yang menjalankan SQL Postgres langsung lewat connect()
+  (EnhancedAdminDashboard, DatabaseManagerWindow, app_db_admin) dilayani
+  StubAdminData: baris users/news sintetis sebanyak --rows
+
+Metrik per window (median dari beberapa iterasi, setelah 1 warmup):
+    construct_ms     __init__ selesai
+    first_paint_ms   paint event pertama setelah show() (dihitung dari awal construct)
+    ready_ms         data awal sudah tampil (worker background selesai)
+    populate_ms      isi N kartu artikel / baris tabel lewat method load window itu
+    rows             jumlah kartu/baris yang benar-benar terisi (beberapa window membatasi)
+    widgets          jumlah QWidget di window
+    mem_kb           kenaikan heap malloc yang terpakai karena window (setelah
+                     ready) — mencakup alokasi C++ Qt; tanpa glibc: kenaikan RSS
+    kb_per_widget    mem_kb / widgets
+    populate_mem_kb  kenaikan heap karena populate N
+
+History disimpan di bench_ui_history.json; perbandingan run memakai logika
+yang sama dengan bench_data_layer.py.
+
+Pakai:
+    python bench_ui.py                                  # semua window, 50 & 200 baris
+    python bench_ui.py --windows FastUserDashboard --rows 10 100 500 --label "lazy cards"
+    python bench_ui.py --compare                        # dua run terakhir
+    python bench_ui.py --fail-on-regression             # CI
+"""
+
+import argparse
+import ctypes
+import datetime
+import gc
+import os
+import platform
+import shutil
+import statistics
+import tempfile
+import time
+from collections import namedtuple
+from typing import Dict, List
+
+HISTORY_FILE = "bench_ui_history.json"
+DEFAULT_ROWS = (50, 200)
+DEFAULT_ITERATIONS = 5
+READY_TIMEOUT = 15.0          # detik menunggu paint / data awal
+DEFAULT_THRESHOLD = 0.25      # UI lebih noisy daripada query
+MIN_DELTA_MS = 2.0
+MIN_DELTA_KB = 512.0
+
+TIME_METRICS = ("construct_ms", "first_paint_ms", "ready_ms", "populate_ms")
+MEMORY_METRICS = ("mem_kb", "populate_mem_kb")
+
+ADMIN_USER = "admin"
+
+
+# ============================================
+# STUB DATA (window admin dengan SQL langsung)
+# ============================================
+
+class StubCursor:
+    def __init__(self, data: "StubAdminData"):
+        self._data = data
+        self._rows = []
+        self.description = None
+        self.rowcount = 0
+
+    def execute(self, sql: str, params=None):
+        columns, self._rows = self._data.rows_for(sql, params)
+        self.description = [(c, None, None, None, None, None, None) for c in columns] or None
+        self.rowcount = len(self._rows)
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def close(self):
+        pass
+
+
+class StubConnection:
+    autocommit = False
+
+    def __init__(self, data: "StubAdminData"):
+        self._data = data
+
+    def cursor(self):
+        return StubCursor(self._data)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class StubAdminData:
+    """
+    Pengganti connect() untuk window admin: query yang dikenali (daftar
+    users, daftar news, ringkasan database) dijawab dengan baris sintetis,
+    query lain mengembalikan hasil kosong.
+    """
+
+    def __init__(self, users: int, news: int):
+        now = datetime.datetime.now()
+        self.users = [(i, f"user{i:04d}", "penerbit" if i % 10 == 0 else "user")
+                      for i in range(users, 0, -1)]
+        self.news = [(i, f"Crypto market update #{i}", f"penerbit{1 + i % 10:03d}",
+                      "published" if i % 10 else "draft", i * 7,
+                      (now - datetime.timedelta(minutes=i)).strftime("%Y-%m-%d %H:%M"))
+                     for i in range(news, 0, -1)]
+
+    def connect(self, *args, **kwargs):
+        return StubConnection(self), None
+
+    def rows_for(self, sql: str, params):
+        text = " ".join(sql.split())
+        if "FROM users" in text and "ORDER BY id DESC" in text:
+            rows = self.users
+            if "WHERE id >" in text:
+                after_id, limit = params
+                rows = [r for r in rows if r[0] > after_id][:limit]
+            return ("id", "username", "role"), rows
+        if "FROM news" in text and "to_char" in text:
+            return ("id", "title", "author", "status", "views", "created"), self.news[:100]
+        if "json_build_object" in text:
+            published = sum(1 for r in self.news if r[3] == "published")
+            summary = {
+                "counts": {"users": [len(self.users), "counter"], "news": [len(self.news), "counter"]},
+                "users_by_role": [["penerbit", len(self.users) // 10],
+                                  ["user", len(self.users) - len(self.users) // 10]],
+                "news_by_status": [["draft", len(self.news) - published], ["published", published]],
+                "total_views": sum(r[4] for r in self.news),
+                "online_sessions": 0,
+            }
+            return ("json_build_object",), [(summary,)]
+        return (), []
+
+
+# ============================================
+# WINDOWS
+# ============================================
+
+# factory(ctx) → window; ready(window) → bool; populate(window, ctx, n) → jumlah baris/kartu
+WindowSpec = namedtuple("WindowSpec", "factory ready populate")
+
+
+def _user_dashboard(ctx):
+    from user_dashboard import FastUserDashboard
+    return FastUserDashboard(ctx.user)
+
+
+def _populate_cards(window, ctx, n: int) -> int:
+    from user_dashboard import ArticleCardCompact
+    window.trending_list.load_articles(ctx.articles[:n], limit=n)
+    return len(window.trending_list.container.findChildren(ArticleCardCompact))
+
+
+def _penerbit_dashboard(ctx):
+    from penerbit_dashboard import PenerbitDashboard
+    return PenerbitDashboard(ctx.author)
+
+
+def _populate_penerbit(window, ctx, n: int) -> int:
+    window._load_my_articles()
+    window._load_feed()
+    return window.table_articles.rowCount() + window.table_feed.rowCount()
+
+
+def _admin_dashboard(ctx):
+    from admin_dashboard import EnhancedAdminDashboard
+    return EnhancedAdminDashboard(ADMIN_USER)
+
+
+def _populate_admin(window, ctx, n: int) -> int:
+    window.load_users(full=True)
+    return window.users_model.rowCount()
+
+
+def _database_manager(ctx):
+    from admin_database_manager import DatabaseManagerWindow
+    return DatabaseManagerWindow(ADMIN_USER)
+
+
+def _populate_database_manager(window, ctx, n: int) -> int:
+    window._load_users()
+    window._load_news()
+    return window.users_table.rowCount() + window.news_table.rowCount()
+
+
+def _cyberpunk_auth(ctx):
+    from auth_ui_cyberpunk import CyberpunkAuthWindow
+    return CyberpunkAuthWindow(db_ready=True)
+
+
+def _enhanced_auth(ctx):
+    from auth_ui_enhanced import EnhancedAuthWindow
+    return EnhancedAuthWindow()
+
+
+def _tiktok_auth(ctx):
+    from auth_ui_tiktok_style import TikTokAuthWindow
+    return TikTokAuthWindow()
+
+
+def _always_ready(window) -> bool:
+    return True
+
+
+WINDOWS = {
+    "FastUserDashboard": WindowSpec(
+        _user_dashboard,
+        lambda w: w.trending_list.is_loaded and w.states.loaded and w.sync_worker is None,
+        _populate_cards),
+    "PenerbitDashboard": WindowSpec(
+        _penerbit_dashboard,
+        lambda w: w.table_articles.rowCount() > 0 and w.stats_worker is None,
+        _populate_penerbit),
+    "EnhancedAdminDashboard": WindowSpec(
+        _admin_dashboard,
+        lambda w: w.users_model.rowCount() > 0,
+        _populate_admin),
+    "DatabaseManagerWindow": WindowSpec(
+        _database_manager,
+        lambda w: w.users_table.rowCount() > 0 and w.stats_worker is None,
+        _populate_database_manager),
+    "CyberpunkAuthWindow": WindowSpec(_cyberpunk_auth, _always_ready, None),
+    "EnhancedAuthWindow": WindowSpec(_enhanced_auth, _always_ready, None),
+    "TikTokAuthWindow": WindowSpec(_tiktok_auth, _always_ready, None),
+}
+
+
+# ============================================
+# MEASUREMENT
+# ============================================
+
+class _MallInfo2(ctypes.Structure):
+    _fields_ = [(name, ctypes.c_size_t) for name in
+                ("arena", "ordblks", "smblks", "hblks", "hblkhd", "usmblks",
+                 "fsmblks", "uordblks", "fordblks", "keepcost")]
+
+
+def _load_mallinfo2():
+    try:
+        func = ctypes.CDLL(None).mallinfo2
+    except (OSError, AttributeError):
+        return None
+    func.restype = _MallInfo2
+    return func
+
+
+_mallinfo2 = _load_mallinfo2()
+
+
+def _memory_kb() -> float:
+    """
+    Heap malloc yang sedang terpakai (kB, glibc mallinfo2). Berbeda dengan RSS,
+    angka ini turun lagi saat memori dibebaskan, jadi delta per window tidak
+    tertutup oleh memori bekas iterasi sebelumnya yang dipakai ulang.
+    """
+    if _mallinfo2 is not None:
+        info = _mallinfo2()
+        return (info.uordblks + info.hblkhd) / 1024
+    return _rss_kb()
+
+
+def _rss_kb() -> float:
+    """RSS proses saat ini (kB); fallback ke peak RSS kalau /proc tidak ada"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024
+    except (OSError, ValueError, IndexError):
+        import resource
+        return float(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _settle():
+    """Proses event tertunda + deleteLater, lalu GC (sebelum baca RSS)"""
+    from PyQt5 import QtCore, QtWidgets
+    app = QtWidgets.QApplication.instance()
+    app.processEvents()
+    app.sendPostedEvents(None, QtCore.QEvent.DeferredDelete)
+    app.processEvents()
+    gc.collect()
+
+
+def _wait_until(condition, timeout: float) -> bool:
+    """Jalankan event loop sampai condition() True atau timeout"""
+    from PyQt5 import QtCore
+    if condition():
+        return True
+    loop = QtCore.QEventLoop()
+    poll = QtCore.QTimer()
+    poll.timeout.connect(lambda: condition() and loop.quit())
+    poll.start(1)
+    QtCore.QTimer.singleShot(int(timeout * 1000), loop.quit)
+    loop.exec_()
+    poll.stop()
+    return condition()
+
+
+class _PaintWatcher:
+    """Catat waktu paint event pertama untuk window (atau child-nya)"""
+
+    def __init__(self):
+        from PyQt5 import QtCore
+
+        class Filter(QtCore.QObject):
+            def eventFilter(inner, obj, event):
+                if (self.first is None and self.window is not None
+                        and event.type() == QtCore.QEvent.Paint and obj.isWidgetType()
+                        and (obj is self.window or self.window.isAncestorOf(obj))):
+                    self.first = time.perf_counter()
+                return False
+
+        self.window = None
+        self.first = None
+        self._filter = Filter()
+
+    def arm(self, window):
+        from PyQt5 import QtWidgets
+        self.window, self.first = window, None
+        QtWidgets.QApplication.instance().installEventFilter(self._filter)
+
+    def disarm(self):
+        from PyQt5 import QtWidgets
+        QtWidgets.QApplication.instance().removeEventFilter(self._filter)
+        self.window = None
+
+
+def measure_window(spec: WindowSpec, ctx, rows: int, timeout: float = READY_TIMEOUT) -> dict:
+    from PyQt5 import QtWidgets
+    _settle()
+    mem_before = _memory_kb()
+    watcher = _PaintWatcher()
+
+    started = time.perf_counter()
+    window = spec.factory(ctx)
+    constructed = time.perf_counter()
+    watcher.arm(window)
+    window.show()
+    painted = _wait_until(lambda: watcher.first is not None, timeout)
+    first_paint = watcher.first
+    watcher.disarm()
+    ready = _wait_until(lambda: spec.ready(window), timeout)
+    ready_at = time.perf_counter()
+
+    _settle()
+    mem_ready = _memory_kb()
+    widgets = 1 + len(window.findChildren(QtWidgets.QWidget))
+    result = {
+        "construct_ms": (constructed - started) * 1000,
+        "first_paint_ms": (first_paint - started) * 1000 if painted else None,
+        "ready_ms": (ready_at - started) * 1000 if ready else None,
+        "widgets": widgets,
+        "mem_kb": mem_ready - mem_before,
+        "kb_per_widget": (mem_ready - mem_before) / widgets,
+    }
+
+    if spec.populate is not None:
+        populate_started = time.perf_counter()
+        result["rows"] = spec.populate(window, ctx, rows)
+        # Layout + paint hasil populate ikut dihitung
+        QtWidgets.QApplication.instance().processEvents()
+        result["populate_ms"] = (time.perf_counter() - populate_started) * 1000
+        _settle()
+        result["populate_mem_kb"] = _memory_kb() - mem_ready
+
+    window.close()
+    window.deleteLater()
+    _settle()
+    return result
+
+
+def _median_result(samples: List[dict]) -> dict:
+    merged = {}
+    for key in samples[0]:
+        values = [s[key] for s in samples if s.get(key) is not None]
+        merged[key] = statistics.median(values) if values else None
+    merged["timeouts"] = sum(1 for s in samples if s["ready_ms"] is None or s["first_paint_ms"] is None)
+    return merged
+
+
+# ============================================
+# SETUP
+# ============================================
+
+def configure_environment():
+    """Harus dipanggil SEBELUM PyQt5 / app_db_* di-import"""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    os.environ["CRYPTO_INSIGHT_BACKEND"] = "sqlite"
+    os.environ["CRYPTO_INSIGHT_SQLITE_PATH"] = ":memory:"
+    os.environ["CRYPTO_INSIGHT_TRANSPORT"] = "direct"
+
+
+def prepare_data(rows: int, workdir: str):
+    """Seed backend SQLite dan arahkan replica feed ke workdir"""
+    from types import SimpleNamespace
+    from storage_backend import get_backend
+    from seed_data import demo_user, demo_author
+    import user_dashboard
+    from feed_replica import FeedReplica
+
+    backend = get_backend("sqlite")
+    backend.ensure_schema()
+    counts = backend.seed_demo_data(users=max(rows, 10), authors=1, articles=max(rows * 2, 200),
+                                    likes_per_user=10, bookmarks_per_user=5, views=rows * 10)
+
+    # Replica feed baru per window (cold start), bukan feed_replica.db milik aplikasi
+    replicas = iter(range(1, 1 << 30))
+    user_dashboard.FeedReplica = lambda username: FeedReplica(
+        username, os.path.join(workdir, f"replica_{next(replicas)}.db"))
+
+    ctx = SimpleNamespace(user=demo_user(1), author=demo_author(1),
+                          articles=backend.get_popular_articles(limit=rows))
+    return ctx, counts
+
+
+def run_benchmarks(rows_list: List[int], windows: List[str], iterations: int,
+                   timeout: float, verbose: bool = False) -> Dict[str, dict]:
+    import contextlib
+    import io
+    from PyQt5 import QtCore, QtWidgets
+
+    if not verbose:
+        # Peringatan Qt (mis. "Unknown property ..." stylesheet) tiap window dibuat
+        QtCore.qInstallMessageHandler(lambda mode, context, message: None)
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    workdir = tempfile.mkdtemp(prefix="bench_ui_")
+    cwd = os.getcwd()
+    # admin_monitoring.db dll. dibuat relatif ke cwd
+    os.chdir(workdir)
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    scales = {}
+    try:
+        with output:
+            ctx, counts = prepare_data(max(rows_list), workdir)
+        print(f"🌱 Stub data ready: {counts}")
+        for rows in rows_list:
+            install_admin_stub(rows)
+            results = {}
+            for name in windows:
+                spec = WINDOWS[name]
+                samples = []
+                with output:
+                    measure_window(spec, ctx, rows, timeout)          # warmup
+                    for _ in range(iterations):
+                        samples.append(measure_window(spec, ctx, rows, timeout))
+                results[name] = _median_result(samples)
+                print_result(rows, name, results[name])
+            scales[f"{rows} rows"] = {"counts": counts, "results": results}
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    app.processEvents()
+    return scales
+
+
+def install_admin_stub(rows: int):
+    """connect() modul admin → StubAdminData dengan `rows` users/news"""
+    import admin_dashboard
+    import admin_database_manager
+    import app_db_admin
+    stub = StubAdminData(users=rows, news=rows)
+    for module in (admin_dashboard, admin_database_manager, app_db_admin):
+        module.connect = stub.connect
+
+
+def _fmt(value, spec=".1f") -> str:
+    return "—" if value is None else format(value, spec)
+
+
+def print_result(rows: int, name: str, r: dict):
+    populate = f", populate {_fmt(r.get('populate_ms'))} ms ({_fmt(r.get('rows'), '.0f')} rows)" \
+        if r.get("populate_ms") is not None else ""
+    timeouts = f"  ⚠️ {r['timeouts']} timeouts" if r["timeouts"] else ""
+    print(f"   [{rows:>5}] {name:<24} construct {_fmt(r['construct_ms'])} ms, "
+          f"first paint {_fmt(r['first_paint_ms'])} ms, ready {_fmt(r['ready_ms'])} ms{populate}, "
+          f"{_fmt(r['mem_kb'], '.0f')} kB / {r['widgets']:.0f} widgets{timeouts}")
+
+
+# ============================================
+# MAIN
+# ============================================
+
+def compare(base: dict, head: dict, threshold: float, show_all: bool) -> int:
+    from bench_data_layer import compare_runs, print_comparison
+    rows = []
+    for metric in TIME_METRICS:
+        rows += compare_runs(base, head, threshold, MIN_DELTA_MS, metric)
+    for metric in MEMORY_METRICS:
+        rows += compare_runs(base, head, threshold, MIN_DELTA_KB, metric)
+    return print_comparison(base, head, [r for r in rows if None not in (r["base"], r["head"])], show_all)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless UI benchmarks (offscreen Qt, stub data layer)")
+    parser.add_argument("--windows", nargs="+", choices=list(WINDOWS), default=list(WINDOWS))
+    parser.add_argument("--rows", nargs="+", type=int, default=list(DEFAULT_ROWS),
+                        help="jumlah kartu/baris yang di-populate (satu skala per nilai)")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--timeout", type=float, default=READY_TIMEOUT)
+    parser.add_argument("--label", help="nama run di history")
+    parser.add_argument("--history", default=None, help=f"file history (default {HISTORY_FILE})")
+    parser.add_argument("--compare", action="store_true", help="hanya bandingkan run di history")
+    parser.add_argument("--base", default="-2")
+    parser.add_argument("--head", default="-1")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--all", action="store_true", help="tampilkan semua baris perbandingan")
+    parser.add_argument("--verbose", action="store_true", help="tampilkan output aplikasi")
+    args = parser.parse_args()
+
+    configure_environment()
+    from bench_data_layer import load_history, save_history, find_run, _git_revision
+
+    here = os.path.dirname(os.path.abspath(__file__))
+    history_path = args.history or os.path.join(here, HISTORY_FILE)
+    runs = load_history(history_path)
+
+    if args.compare:
+        base, head = find_run(runs, args.base), find_run(runs, args.head)
+        if not base or not head:
+            print(f"❌ Need two runs in {history_path} (base={args.base}, head={args.head})")
+            return 1
+        return 1 if compare(base, head, args.threshold, args.all) else 0
+
+    print(f"🏁 UI benchmark ({os.environ['QT_QPA_PLATFORM']}): {len(args.windows)} windows, "
+          f"rows={', '.join(map(str, args.rows))}, iterations={args.iterations}")
+    run = {
+        "id": datetime.datetime.now().strftime("%Y%m%d-%H%M%S"),
+        "label": args.label,
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git": _git_revision(),
+        "backend": "sqlite-stub",
+        "python": platform.python_version(),
+        "machine": platform.node(),
+        "iterations": args.iterations,
+        "scales": run_benchmarks(sorted(set(args.rows)), args.windows, args.iterations,
+                                 args.timeout, args.verbose),
+    }
+
+    previous = find_run(runs, "-1")
+    runs.append(run)
+    save_history(history_path, runs)
+    print(f"💾 Saved run {run['id']} to {history_path}")
+
+    if previous:
+        regressions = compare(previous, run, args.threshold, args.all)
+        if regressions and args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -13,6 +13,8 @@ except:
 
 from typing import Optional
 
+import startup_profiler
+
 APP_NAME = "Crypto Insight"
 
 
@@ -28,7 +30,17 @@ def DashboardWindow(username: str, role: str, session_id: Optional[int] = None):
     Returns:
         Dashboard window instance yang sesuai
     """
-    
+    with startup_profiler.phase("dashboard construction"):
+        window = _create_dashboard(username, role, session_id)
+    startup_profiler.watch_first_paint(window, "dashboard first paint")
+    # Paint pertama setelah data awal tampil = akhir cold start → laporan profiler
+    startup_profiler.watch_first_paint(window, "first data paint",
+                                       ready=getattr(window, "initial_data_shown", None),
+                                       finish_report=True)
+    return window
+
+
+def _create_dashboard(username: str, role: str, session_id: Optional[int] = None):
     role = role.lower()
     
     if role == "admin":
@@ -0,0 +1,72 @@
+# db_status.py — Status koneksi database untuk UI (online / degraded)
+"""
+Jembatan antara circuit breaker di app_db_fixed dan widget Qt:
+- DbStatusNotifier: QObject dengan signal status_changed(online, message).
+  Listener breaker bisa dipanggil dari thread mana pun; signal Qt
+  otomatis di-queue ke UI thread.
+- OfflineBanner: label merah yang muncul sendiri saat database offline.
+
+Pakai di dashboard:
+    layout.addWidget(OfflineBanner())
+atau:
+    db_status_notifier().status_changed.connect(self._on_db_status)
+"""
+
+from PyQt5 import QtCore, QtWidgets
+from app_db_fixed import connection_breaker, BREAKER_OPEN, BREAKER_HALF_OPEN
+
+_notifier = None
+
+
+class DbStatusNotifier(QtCore.QObject):
+    """Emit status_changed setiap state circuit breaker berubah"""
+
+    status_changed = QtCore.pyqtSignal(bool, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        breaker = connection_breaker()
+        self.online = breaker.state != BREAKER_OPEN
+        breaker.add_listener(self._on_breaker_state)
+
+    def _on_breaker_state(self, state: str, last_error: str):
+        if state == BREAKER_HALF_OPEN:
+            return  # probe sedang jalan, tunggu hasilnya
+        self.online = state != BREAKER_OPEN
+        self.status_changed.emit(self.online, last_error)
+
+
+def db_status_notifier() -> DbStatusNotifier:
+    """Notifier global (dibuat di UI thread saat pertama kali dipakai)"""
+    global _notifier
+    if _notifier is None:
+        _notifier = DbStatusNotifier(QtWidgets.QApplication.instance())
+    return _notifier
+
+
+class OfflineBanner(QtWidgets.QLabel):
+    """Banner 'database offline' yang tampil/sembunyi mengikuti breaker"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWordWrap(True)
+        self.setStyleSheet("""
+            QLabel {
+                background: #7f1d1d;
+                color: #fecaca;
+                font-weight: 600;
+                padding: 8px 12px;
+                border-radius: 6px;
+            }
+        """)
+        notifier = db_status_notifier()
+        notifier.status_changed.connect(self._on_status_changed)
+        self._on_status_changed(notifier.online, connection_breaker().last_error)
+
+    def _on_status_changed(self, online: bool, message: str):
+        if online:
+            self.hide()
+            return
+        self.setText("⚠️ Database offline — data mungkin tidak terbaru. Menyambung ulang otomatis...")
+        self.setToolTip(message)
+        self.show()
@@ -0,0 +1,449 @@
+# feed_replica.py — Replica SQLite lokal untuk feed FastUserDashboard
+"""
+Salinan lokal metadata artikel published (tanpa content) dan like/bookmark
+user, supaya tab feed dibaca dari disk lokal dan tetap jalan tanpa jaringan:
+
+- sync() menarik delta saja: baris news dengan (updated_at, id) setelah
+  watermark + tombstone artikel yang dihapus (migrations/007), dan
+  like/bookmark user hanya kalau user_interaction_counts.updated_at berubah
+- Counter views/like/bookmark tidak menggeser updated_at, jadi disegarkan
+  terpisah setiap COUNTER_REFRESH_SECONDS (id + 3 angka per artikel)
+- Read feed (trending/popular/most liked/liked/saved) selalu lokal
+- Like/bookmark saat offline ditulis ke replica dan diantrekan di
+  pending_writes, lalu di-replay di awal sync berikutnya yang online
+
+Pakai:
+    replica = FeedReplica(username)
+    replica.sync()                      # worker thread (run_in_background)
+    replica.trending(limit=50, days=7)  # UI thread, lokal
+    replica.like_article(article_id)    # langsung ke server, atau antre kalau offline
+"""
+
+import datetime
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import app_db_interactions as interactions
+from app_db_fixed import _app_dir, is_offline
+from monitoring_writer import configure_connection
+
+REPLICA_FILE = "feed_replica.db"
+REPLICA_SCHEMA_VERSION = 1
+SYNC_PAGE_SIZE = 500
+# Transaksi yang commit telat bisa punya updated_at sedikit di belakang
+# watermark; delta dibaca ulang mulai watermark - overlap (upsert idempotent)
+SYNC_OVERLAP_SECONDS = 30
+# Counter cukup segar untuk urutan feed; jauh lebih jarang dari delta 60 detik
+COUNTER_REFRESH_SECONDS = 600
+COUNTER_PAGE_SIZE = 5000
+
+# Watermark awal (server belum punya artikel sama sekali)
+_EPOCH = "1970-01-01T00:00:00"
+
+# Operasi write yang saling meniadakan di antrean offline
+_OPPOSITE = {"like": "unlike", "unlike": "like",
+             "bookmark": "unbookmark", "unbookmark": "bookmark"}
+
+# Format baris feed sama dengan get_trending_articles():
+# (id, title, author, views, likes, bookmarks, created_at 'YYYY-MM-DD HH:MM UTC')
+_FEED_COLUMNS = """
+    n.id, n.title, n.author, n.views, n.like_count, n.bookmark_count,
+    substr(n.created_at, 1, 10) || ' ' || substr(n.created_at, 12, 5) || ' UTC'
+"""
+
+
+def _now_iso() -> str:
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    return now.isoformat(timespec="microseconds")
+
+
+class FeedReplica:
+    """Replica feed per user (file SQLite dibagi, baris interaksi per username)"""
+
+    def __init__(self, username: str, db_path: Optional[str] = None):
+        self.username = username
+        self.db_path = db_path or os.path.join(_app_dir(), REPLICA_FILE)
+        self._local = threading.local()
+        self._has_data = False
+        self._has_interactions = False
+        self._ensure_schema()
+
+    # ---------- Koneksi & schema ----------
+
+    def _conn(self) -> sqlite3.Connection:
+        """Satu koneksi per thread (UI thread dan worker sync)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5.0)
+            configure_connection(conn)
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """Tutup koneksi milik thread pemanggil"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _ensure_schema(self):
+        conn = self._conn()
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= REPLICA_SCHEMA_VERSION:
+            return
+        with conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS news (
+                    id INTEGER PRIMARY KEY,
+                    title TEXT NOT NULL,
+                    author TEXT NOT NULL,
+                    views INTEGER NOT NULL DEFAULT 0,
+                    like_count INTEGER NOT NULL DEFAULT 0,
+                    bookmark_count INTEGER NOT NULL DEFAULT 0,
+                    created_at TEXT NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_news_views ON news (views DESC, like_count DESC);
+                CREATE INDEX IF NOT EXISTS idx_news_likes ON news (like_count DESC, views DESC);
+                CREATE INDEX IF NOT EXISTS idx_news_created ON news (created_at);
+
+                -- kind: 'L' = like, 'B' = bookmark
+                CREATE TABLE IF NOT EXISTS user_interactions (
+                    username TEXT NOT NULL,
+                    kind TEXT NOT NULL CHECK (kind IN ('L', 'B')),
+                    article_id INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    PRIMARY KEY (username, kind, article_id)
+                );
+
+                CREATE TABLE IF NOT EXISTS pending_writes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT NOT NULL,
+                    op TEXT NOT NULL,
+                    article_id INTEGER NOT NULL,
+                    created_at TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+            conn.execute(f"PRAGMA user_version = {REPLICA_SCHEMA_VERSION}")
+
+    def _get_state(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _set_state(conn: sqlite3.Connection, key: str, value: Optional[str]):
+        conn.execute("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)", (key, value))
+
+    def has_data(self) -> bool:
+        """True setelah sync pertama berhasil (feed bisa dibaca lokal)"""
+        if not self._has_data:
+            self._has_data = self._get_state("news_watermark") is not None
+        return self._has_data
+
+    def has_interactions(self) -> bool:
+        """
+        True setelah like/bookmark user INI pernah di-sync. File replica
+        dibagi semua user di mesin ini, jadi news_watermark saja tidak cukup:
+        user kedua belum punya baris user_interactions sama sekali.
+        """
+        if not self._has_interactions:
+            self._has_interactions = (
+                self.has_data()
+                and self._get_state(f"interactions_version:{self.username}") is not None
+            )
+        return self._has_interactions
+
+    # ---------- Read (lokal) ----------
+
+    def trending(self, limit: int = 10, days: int = 7) -> List[Tuple]:
+        return self._conn().execute(f"""
+            SELECT {_FEED_COLUMNS} FROM news n
+            WHERE n.created_at > strftime('%Y-%m-%dT%H:%M:%S', 'now', ?)
+            ORDER BY n.views DESC, n.like_count DESC
+            LIMIT ?
+        """, (f"-{int(days)} days", limit)).fetchall()
+
+    def popular(self, limit: int = 10) -> List[Tuple]:
+        return self._conn().execute(f"""
+            SELECT {_FEED_COLUMNS} FROM news n
+            ORDER BY n.views DESC, n.like_count DESC
+            LIMIT ?
+        """, (limit,)).fetchall()
+
+    def most_liked(self, limit: int = 10) -> List[Tuple]:
+        return self._conn().execute(f"""
+            SELECT {_FEED_COLUMNS} FROM news n
+            ORDER BY n.like_count DESC, n.views DESC
+            LIMIT ?
+        """, (limit,)).fetchall()
+
+    def _user_articles(self, kind: str, limit: int) -> List[Tuple]:
+        return self._conn().execute(f"""
+            SELECT {_FEED_COLUMNS}
+            FROM user_interactions ui
+            JOIN news n ON n.id = ui.article_id
+            WHERE ui.username = ? AND ui.kind = ?
+            ORDER BY ui.created_at DESC
+            LIMIT ?
+        """, (self.username, kind, limit)).fetchall()
+
+    def liked(self, limit: int = 50) -> List[Tuple]:
+        return self._user_articles('L', limit)
+
+    def bookmarked(self, limit: int = 50) -> List[Tuple]:
+        return self._user_articles('B', limit)
+
+    def interaction_ids(self) -> Dict[str, Set[int]]:
+        """Format sama dengan get_user_interaction_ids()"""
+        ids = {'liked': set(), 'bookmarked': set()}
+        for kind, article_id in self._conn().execute(
+                "SELECT kind, article_id FROM user_interactions WHERE username = ?", (self.username,)):
+            ids['liked' if kind == 'L' else 'bookmarked'].add(article_id)
+        return ids
+
+    def summary(self) -> Dict[str, int]:
+        """Format sama dengan get_user_interaction_summary()"""
+        ids = self.interaction_ids()
+        return {'liked': len(ids['liked']), 'bookmarked': len(ids['bookmarked'])}
+
+    def pending_count(self) -> int:
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM pending_writes WHERE username = ?", (self.username,)).fetchone()[0]
+
+    # ---------- Write (server dulu, antre kalau offline) ----------
+
+    def like_article(self, article_id: int, username: Optional[str] = None) -> bool:
+        return self._write("like", article_id)
+
+    def unlike_article(self, article_id: int, username: Optional[str] = None) -> bool:
+        return self._write("unlike", article_id)
+
+    def bookmark_article(self, article_id: int, username: Optional[str] = None) -> bool:
+        return self._write("bookmark", article_id)
+
+    def unbookmark_article(self, article_id: int, username: Optional[str] = None) -> bool:
+        return self._write("unbookmark", article_id)
+
+    def _write(self, op: str, article_id: int) -> bool:
+        if not is_offline():
+            if getattr(interactions, f"{op}_article")(article_id, self.username):
+                self._apply_local(op, article_id)
+                return True
+            if not is_offline():
+                # Server menolak (mis. sudah di-like), bukan masalah koneksi
+                return False
+
+        self._enqueue(op, article_id)
+        self._apply_local(op, article_id)
+        print(f"📥 Offline: {op} article {article_id} queued for sync")
+        return True
+
+    def _enqueue(self, op: str, article_id: int):
+        conn = self._conn()
+        with conn:
+            # like lalu unlike saat offline = tidak ada yang perlu dikirim
+            cancelled = conn.execute("""
+                DELETE FROM pending_writes
+                WHERE id = (SELECT MAX(id) FROM pending_writes
+                            WHERE username = ? AND article_id = ? AND op = ?)
+            """, (self.username, article_id, _OPPOSITE[op])).rowcount
+            if not cancelled:
+                conn.execute("""
+                    INSERT INTO pending_writes (username, op, article_id, created_at)
+                    VALUES (?, ?, ?, ?)
+                """, (self.username, op, article_id, _now_iso()))
+
+    def _apply_local(self, op: str, article_id: int):
+        """Terapkan write ke replica (counter dikoreksi refresh counter berikutnya)"""
+        kind = 'L' if op in ("like", "unlike") else 'B'
+        column = "like_count" if kind == 'L' else "bookmark_count"
+        conn = self._conn()
+        with conn:
+            if op in ("like", "bookmark"):
+                changed = conn.execute("""
+                    INSERT OR IGNORE INTO user_interactions (username, kind, article_id, created_at)
+                    VALUES (?, ?, ?, ?)
+                """, (self.username, kind, article_id, _now_iso())).rowcount
+                delta = 1
+            else:
+                changed = conn.execute("""
+                    DELETE FROM user_interactions
+                    WHERE username = ? AND kind = ? AND article_id = ?
+                """, (self.username, kind, article_id)).rowcount
+                delta = -1
+            if changed:
+                conn.execute(f"UPDATE news SET {column} = MAX({column} + ?, 0) WHERE id = ?",
+                             (delta, article_id))
+
+    # ---------- Sync (worker thread) ----------
+
+    def sync(self) -> Dict:
+        """
+        Replay antrean offline, tarik delta news, counter (kalau sudah
+        waktunya), lalu like/bookmark user.
+        Returns: {'ok', 'replayed', 'pending', 'news', 'deleted', 'counters', 'interactions'}
+        """
+        result = {'ok': False, 'replayed': 0, 'pending': 0,
+                  'news': 0, 'deleted': 0, 'counters': 0, 'interactions': False}
+        try:
+            result['replayed'], result['pending'] = self._replay_pending()
+
+            news = self._pull_news()
+            if news is None:
+                return result
+            result['news'], result['deleted'] = news
+
+            counters = self._pull_counters()
+            if counters is None:
+                return result
+            result['counters'] = counters
+
+            # Selama masih ada write yang belum terkirim, state lokal lebih baru
+            if result['pending'] == 0:
+                changed = self._pull_interactions()
+                if changed is None:
+                    return result
+                result['interactions'] = changed
+
+            result['ok'] = True
+            return result
+        except Exception as e:
+            print(f"❌ Feed replica sync failed: {e}")
+            return result
+        finally:
+            # Worker thread selesai setelah sync; jangan tinggalkan koneksinya
+            if threading.current_thread() is not threading.main_thread():
+                self.close()
+
+    def _replay_pending(self) -> Tuple[int, int]:
+        conn = self._conn()
+        pending = conn.execute("""
+            SELECT id, op, article_id FROM pending_writes
+            WHERE username = ? ORDER BY id
+        """, (self.username,)).fetchall()
+
+        replayed = 0
+        for write_id, op, article_id in pending:
+            if is_offline():
+                break
+            getattr(interactions, f"{op}_article")(article_id, self.username)
+            if is_offline():
+                break
+            # Berhasil, atau ditolak server (sudah di-like / artikel dihapus):
+            # keduanya tidak perlu dicoba lagi
+            with conn:
+                conn.execute("DELETE FROM pending_writes WHERE id = ?", (write_id,))
+            replayed += 1
+
+        if replayed:
+            print(f"📤 Replayed {replayed} offline write(s)")
+        return replayed, len(pending) - replayed
+
+    def _pull_news(self) -> Optional[Tuple[int, int]]:
+        """Returns (baris berubah, baris dihapus) atau None kalau gagal"""
+        watermark = self._get_state("news_watermark")
+        since = None
+        if watermark:
+            since = (datetime.datetime.fromisoformat(watermark)
+                     - datetime.timedelta(seconds=SYNC_OVERLAP_SECONDS)).isoformat()
+
+        conn = self._conn()
+        after_id = 0
+        upserted = deleted = 0
+        newest = watermark
+        while True:
+            changes = interactions.get_news_changes(since, after_id, SYNC_PAGE_SIZE)
+            if changes is None:
+                return None
+            rows = changes['rows']
+            with conn:
+                for (article_id, title, author, status, views, likes, bookmarks,
+                     created_at, updated_at) in rows:
+                    if status == 'published':
+                        # Baris dari jendela overlap yang tidak berubah tidak dihitung
+                        upserted += conn.execute("""
+                            INSERT INTO news
+                                (id, title, author, views, like_count, bookmark_count, created_at, updated_at)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                            ON CONFLICT (id) DO UPDATE SET
+                                title = excluded.title, author = excluded.author,
+                                views = excluded.views, like_count = excluded.like_count,
+                                bookmark_count = excluded.bookmark_count,
+                                created_at = excluded.created_at, updated_at = excluded.updated_at
+                            WHERE news.updated_at <> excluded.updated_at
+                        """, (article_id, title, author, views, likes, bookmarks, created_at, updated_at)).rowcount
+                    else:
+                        deleted += conn.execute("DELETE FROM news WHERE id = ?", (article_id,)).rowcount
+                    if newest is None or updated_at > newest:
+                        newest = updated_at
+                for article_id in changes['deleted']:
+                    deleted += conn.execute("DELETE FROM news WHERE id = ?", (article_id,)).rowcount
+                # Watermark ikut commit dengan barisnya: sync yang terputus
+                # lanjut dari halaman terakhir yang sudah tersimpan
+                self._set_state(conn, "news_watermark", newest or _EPOCH)
+            if len(rows) < SYNC_PAGE_SIZE:
+                break
+            since, after_id = rows[-1][8], rows[-1][0]
+
+        self._has_data = True
+        return upserted, deleted
+
+    def _pull_counters(self) -> Optional[int]:
+        """
+        Segarkan counter semua artikel di replica kalau refresh terakhir
+        sudah lebih dari COUNTER_REFRESH_SECONDS.
+        Returns jumlah artikel yang counternya berubah, None kalau gagal
+        """
+        refreshed = self._get_state("counters_refreshed_at")
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        if refreshed and (now - datetime.datetime.fromisoformat(refreshed)).total_seconds() < COUNTER_REFRESH_SECONDS:
+            return 0
+
+        conn = self._conn()
+        after_id = 0
+        changed = 0
+        while True:
+            rows = interactions.get_news_counters(after_id, COUNTER_PAGE_SIZE)
+            if rows is None:
+                return None
+            with conn:
+                for article_id, views, likes, bookmarks in rows:
+                    changed += conn.execute("""
+                        UPDATE news SET views = ?, like_count = ?, bookmark_count = ?
+                        WHERE id = ? AND (views <> ? OR like_count <> ? OR bookmark_count <> ?)
+                    """, (views, likes, bookmarks, article_id, views, likes, bookmarks)).rowcount
+            if len(rows) < COUNTER_PAGE_SIZE:
+                break
+            after_id = rows[-1][0]
+
+        with conn:
+            self._set_state(conn, "counters_refreshed_at", now.isoformat(timespec="microseconds"))
+        return changed
+
+    def _pull_interactions(self) -> Optional[bool]:
+        """Returns True kalau like/bookmark user berubah, None kalau gagal"""
+        key = f"interactions_version:{self.username}"
+        version = self._get_state(key)
+        changes = interactions.get_user_interaction_changes(self.username, version)
+        if changes is None:
+            return None
+        if not changes['changed']:
+            return False
+
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM user_interactions WHERE username = ?", (self.username,))
+            conn.executemany("""
+                INSERT OR IGNORE INTO user_interactions (username, kind, article_id, created_at)
+                VALUES (?, ?, ?, ?)
+            """, [(self.username, 'L', a, t) for a, t in changes['liked']]
+               + [(self.username, 'B', a, t) for a, t in changes['bookmarked']])
+            # '' = user belum punya baris counter (belum pernah like/bookmark)
+            self._set_state(conn, key, changes['version'] or '')
+        return True
@@ -0,0 +1,190 @@
+# gateway_client.py — Transport "gateway" untuk helper app_db_*
+"""
+Kalau config.ini berisi:
+
+    [client]
+    TRANSPORT = gateway
+    GATEWAY_URL = http://127.0.0.1:8765
+
+maka app_db_fixed dan app_db_interactions mengganti helper publiknya
+(login, list_published_news, like_article, ...) dengan stub yang memanggil
+data_gateway.py lewat HTTP/JSON. UI tidak perlu diubah: `from app_db_fixed
+import login` otomatis mendapat versi remote.
+
+- Satu koneksi HTTP keep-alive per thread (QThread worker punya koneksinya sendiri)
+- Circuit breaker yang sama dengan koneksi langsung: gateway mati atau
+  database di belakang gateway offline → OfflineBanner muncul, stub langsung
+  mengembalikan default tanpa menunggu timeout
+- Hanya operasi di gateway_protocol.OPERATIONS yang lewat gateway. Tool admin
+  (Database Manager, migration) tetap butuh koneksi langsung.
+"""
+
+import functools
+import http.client
+import threading
+import time
+import urllib.parse
+from typing import Optional
+
+import gateway_protocol as protocol
+from app_db_fixed import CLIENT_SETTINGS, BREAKER_OPEN, connection_breaker
+
+GATEWAY_TIMEOUT = 15.0        # detik per request
+GATEWAY_PROBE_TIMEOUT = 3.0
+
+
+class GatewayUnavailable(Exception):
+    """Gateway tidak bisa dihubungi / respons tidak valid"""
+
+
+class GatewayClient:
+    """Client HTTP kecil untuk data_gateway.py (thread-safe)"""
+
+    def __init__(self, base_url: str, token: str = ""):
+        parsed = urllib.parse.urlsplit(base_url)
+        if parsed.scheme not in ("http", "https") or not parsed.hostname:
+            raise ValueError(f"Invalid GATEWAY_URL: {base_url!r}")
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.token = token
+        self._local = threading.local()
+
+    def _connection(self, timeout: float) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+            conn = cls(self.host, self.port, timeout=timeout)
+            self._local.conn = conn
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+        return conn
+
+    def _drop_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def request(self, method: str, path: str, payload=None, timeout: float = GATEWAY_TIMEOUT) -> dict:
+        body = protocol.encode(payload) if payload is not None else None
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers[protocol.TOKEN_HEADER] = self.token
+
+        # Koneksi keep-alive bisa sudah ditutup server; coba ulang sekali
+        # dengan koneksi baru (request belum sampai ke handler).
+        for attempt in range(2):
+            conn = self._connection(timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                self._drop_connection()
+                if attempt == 1:
+                    raise GatewayUnavailable(str(e))
+            except (OSError, http.client.HTTPException) as e:
+                self._drop_connection()
+                raise GatewayUnavailable(str(e) or type(e).__name__)
+
+        try:
+            result = protocol.decode(data)
+        except ValueError:
+            raise GatewayUnavailable(f"Invalid response from gateway (HTTP {response.status})")
+        if response.status >= 400 and "error" not in result:
+            raise GatewayUnavailable(f"HTTP {response.status}")
+        return result
+
+    def call(self, name: str, *args, timeout: float = GATEWAY_TIMEOUT, **kwargs) -> dict:
+        """POST /v1/<name>. Returns response dict: {ok, result | error, db_online}"""
+        return self.request("POST", protocol.API_PREFIX + name,
+                            {"args": list(args), "kwargs": kwargs}, timeout=timeout)
+
+    def ping(self, timeout: float = GATEWAY_PROBE_TIMEOUT) -> dict:
+        return self.request("GET", "/health", timeout=timeout)
+
+
+_client: Optional[GatewayClient] = None
+_client_lock = threading.Lock()
+
+
+def gateway_client() -> GatewayClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GatewayClient(CLIENT_SETTINGS["gateway_url"], CLIENT_SETTINGS["gateway_token"])
+    return _client
+
+
+def call_remote(name: str, *args, **kwargs):
+    """
+    Panggil helper `name` di gateway. Sama seperti helper aslinya, error
+    tidak di-raise: hasilnya default helper (lihat gateway_protocol).
+    """
+    op = protocol.OPERATIONS[name]
+    breaker = connection_breaker()
+    allowed, is_probe = breaker.allow()
+    if not allowed:
+        return op.default()
+
+    timeout = GATEWAY_PROBE_TIMEOUT if is_probe else GATEWAY_TIMEOUT
+    try:
+        response = gateway_client().call(name, *args, timeout=timeout, **kwargs)
+    except GatewayUnavailable as e:
+        print(f"❌ Data gateway unavailable: {e}")
+        breaker.record_failure(f"gateway: {e}")
+        if breaker.state == BREAKER_OPEN:
+            print(f"⚠️ Gateway offline, retry in {breaker.seconds_until_retry():.0f}s")
+        return op.default()
+
+    # Gateway hidup tapi database di belakangnya offline → tetap degraded
+    if response.get("db_online", True):
+        breaker.record_success()
+    else:
+        breaker.record_failure("gateway: database offline")
+
+    if not response.get("ok"):
+        print(f"❌ Gateway error in {name}: {response.get('error')}")
+        return op.default()
+    return protocol.restore_tuples(name, response.get("result"))
+
+
+def remote_function(name: str, original):
+    """Stub dengan signature/docstring helper asli"""
+    @functools.wraps(original)
+    def stub(*args, **kwargs):
+        return call_remote(name, *args, **kwargs)
+    stub.remote = True
+    return stub
+
+
+def install_remote_functions(namespace: dict, module_name: str):
+    """Ganti helper di modul `module_name` dengan stub gateway"""
+    for name, op in protocol.OPERATIONS.items():
+        if op.module == module_name and name in namespace:
+            namespace[name] = remote_function(name, namespace[name])
+
+
+def warm_gateway() -> int:
+    """Pengganti warm_pool() di mode gateway: buka koneksi ke gateway. Returns 1/0."""
+    started = time.monotonic()
+    try:
+        health = gateway_client().ping()
+    except GatewayUnavailable as e:
+        print(f"⚠️ Data gateway not reachable: {e}")
+        connection_breaker().record_failure(f"gateway: {e}")
+        return 0
+    connection_breaker().record_success()
+    print(f"✅ Data gateway ready ({(time.monotonic() - started) * 1000:.0f} ms)")
+    return 1 if health.get("db_online", False) else 0
+
+
+if __name__ == "__main__":
+    # Cek cepat: python gateway_client.py
+    client = gateway_client()
+    print("health:", client.ping())
+    print("list_published_news:", call_remote("list_published_news", 3))
@@ -0,0 +1,170 @@
+# gateway_protocol.py — Daftar operasi data gateway + encoding JSON
+"""
+Dipakai bersama oleh data_gateway.py (server) dan gateway_client.py (client),
+jadi keduanya selalu sepakat operasi apa saja yang boleh dipanggil:
+
+- OPERATIONS: nama helper app_db_fixed / app_db_interactions → Operation
+    module      modul asal helper
+    default     factory nilai default kalau gateway tidak bisa dihubungi
+                (sama dengan default helper saat database error)
+    cache_ttl   detik; > 0 berarti hasilnya boleh di-cache di gateway
+    tags        grup cache yang dibaca (read) / di-invalidate (write)
+    batched     write fire-and-forget yang dikumpulkan gateway lalu ditulis
+                per batch (heartbeat, view tracking)
+- encode()/decode(): JSON dengan dukungan set, bytes, datetime, Decimal
+
+Modul ini sengaja tidak meng-import app_db_* supaya tidak ada import melingkar.
+"""
+
+import base64
+import datetime
+import decimal
+import json
+from collections import namedtuple
+
+API_PREFIX = "/v1/"
+TOKEN_HEADER = "X-Gateway-Token"
+
+Operation = namedtuple("Operation", "module default cache_ttl tags batched")
+
+_FIXED = "app_db_fixed"
+_INTERACTIONS = "app_db_interactions"
+
+# Grup cache
+NEWS = "news"                  # daftar/ranking artikel, ringkasan author
+INTERACTIONS = "interactions"  # status & counter like/bookmark
+
+
+def _auth_connection_failed():
+    from app_db_fixed import AUTH_CONNECTION_FAILED
+    return (None, None, AUTH_CONNECTION_FAILED)
+
+
+def _article_stats():
+    return {'views': 0, 'likes': 0, 'bookmarks': 0}
+
+
+def _author_summary():
+    return {'total': 0, 'by_status': {}, 'published': 0, 'draft': 0,
+            'views': 0, 'likes': 0, 'bookmarks': 0}
+
+
+def _penerbit_stats():
+    return {'total_articles': 0, 'total_views': 0, 'total_likes': 0,
+            'total_bookmarks': 0, 'avg_views': 0.0, 'avg_likes': 0.0}
+
+
+def _op(module, default, cache_ttl=0, tags=(), batched=False):
+    return Operation(module, default, cache_ttl, tuple(tags), batched)
+
+
+OPERATIONS = {
+    # ---------- app_db_fixed ----------
+    "ensure_schema": _op(_FIXED, lambda: False),
+    "health_check": _op(_FIXED, lambda: False),
+    "user_exists": _op(_FIXED, lambda: False),
+    "create_user": _op(_FIXED, lambda: False),
+    "verify_user": _op(_FIXED, lambda: None),
+    "login": _op(_FIXED, _auth_connection_failed),
+    "register": _op(_FIXED, _auth_connection_failed),
+    "start_session": _op(_FIXED, lambda: None),
+    "heartbeat": _op(_FIXED, lambda: False, batched=True),
+    "end_session": _op(_FIXED, lambda: False),
+    "latest_presence_per_user": _op(_FIXED, list, cache_ttl=5),
+    "create_news": _op(_FIXED, lambda: False, tags=[NEWS]),
+    "list_my_news": _op(_FIXED, list, cache_ttl=10, tags=[NEWS]),
+    "get_author_summary": _op(_FIXED, _author_summary, cache_ttl=10, tags=[NEWS]),
+    "list_published_news": _op(_FIXED, list, cache_ttl=10, tags=[NEWS]),
+
+    # ---------- app_db_interactions: write ----------
+    "like_article": _op(_INTERACTIONS, lambda: False, tags=[INTERACTIONS, NEWS]),
+    "unlike_article": _op(_INTERACTIONS, lambda: False, tags=[INTERACTIONS, NEWS]),
+    "bookmark_article": _op(_INTERACTIONS, lambda: False, tags=[INTERACTIONS, NEWS]),
+    "unbookmark_article": _op(_INTERACTIONS, lambda: False, tags=[INTERACTIONS, NEWS]),
+    # View tidak meng-invalidate cache (terlalu sering); TTL yang membatasi basinya
+    "track_article_view": _op(_INTERACTIONS, lambda: False, batched=True),
+
+    # ---------- app_db_interactions: read ----------
+    "is_article_liked": _op(_INTERACTIONS, lambda: False, cache_ttl=30, tags=[INTERACTIONS]),
+    "is_article_bookmarked": _op(_INTERACTIONS, lambda: False, cache_ttl=30, tags=[INTERACTIONS]),
+    "get_article_likes_count": _op(_INTERACTIONS, lambda: 0, cache_ttl=5, tags=[INTERACTIONS]),
+    "get_article_bookmarks_count": _op(_INTERACTIONS, lambda: 0, cache_ttl=5, tags=[INTERACTIONS]),
+    "get_article_views": _op(_INTERACTIONS, lambda: 0, cache_ttl=5, tags=[INTERACTIONS]),
+    "get_article_stats": _op(_INTERACTIONS, _article_stats, cache_ttl=5, tags=[INTERACTIONS]),
+    "get_engagement_rate": _op(_INTERACTIONS, lambda: 0.0, cache_ttl=5, tags=[INTERACTIONS]),
+    "get_article_full_info": _op(_INTERACTIONS, lambda: None, cache_ttl=5, tags=[INTERACTIONS]),
+    "get_user_liked_articles": _op(_INTERACTIONS, list, cache_ttl=10, tags=[INTERACTIONS]),
+    "get_user_bookmarked_articles": _op(_INTERACTIONS, list, cache_ttl=10, tags=[INTERACTIONS]),
+    "get_article_likers": _op(_INTERACTIONS, list, cache_ttl=10, tags=[INTERACTIONS]),
+    "get_user_interaction_summary": _op(_INTERACTIONS, lambda: {'liked': 0, 'bookmarked': 0},
+                                        cache_ttl=10, tags=[INTERACTIONS]),
+    "get_user_interaction_ids": _op(_INTERACTIONS, lambda: None, cache_ttl=10, tags=[INTERACTIONS]),
+    "get_trending_articles": _op(_INTERACTIONS, list, cache_ttl=15, tags=[NEWS]),
+    "get_popular_articles": _op(_INTERACTIONS, list, cache_ttl=15, tags=[NEWS]),
+    "get_most_liked_articles": _op(_INTERACTIONS, list, cache_ttl=15, tags=[NEWS]),
+    "get_penerbit_stats": _op(_INTERACTIONS, _penerbit_stats, cache_ttl=10, tags=[NEWS]),
+
+    # ---------- app_db_interactions: replica sync (tidak di-cache, sudah delta) ----------
+    "get_news_changes": _op(_INTERACTIONS, lambda: None),
+    "get_news_counters": _op(_INTERACTIONS, lambda: None),
+    "get_user_interaction_changes": _op(_INTERACTIONS, lambda: None),
+}
+
+
+def is_read(op: Operation) -> bool:
+    return op.cache_ttl > 0
+
+
+# ============================================
+# JSON ENCODING
+# ============================================
+
+def _default(value):
+    if isinstance(value, (set, frozenset)):
+        return {"__set__": sorted(value, key=repr)}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {"__bytes__": base64.b64encode(bytes(value)).decode("ascii")}
+    if isinstance(value, datetime.datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def _object_hook(obj):
+    if len(obj) == 1:
+        if "__set__" in obj:
+            return set(obj["__set__"])
+        if "__bytes__" in obj:
+            return base64.b64decode(obj["__bytes__"])
+        if "__datetime__" in obj:
+            return datetime.datetime.fromisoformat(obj["__datetime__"])
+        if "__date__" in obj:
+            return datetime.date.fromisoformat(obj["__date__"])
+    return obj
+
+
+def encode(payload) -> bytes:
+    return json.dumps(payload, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def decode(data: bytes):
+    return json.loads(data.decode("utf-8"), object_hook=_object_hook)
+
+
+# Helper yang mengembalikan tuple (bukan list baris)
+TUPLE_RESULTS = {"login", "register"}
+
+
+def restore_tuples(name: str, value):
+    """
+    JSON tidak punya tuple. Kembalikan bentuk asli hasil helper di client:
+    baris query (list of tuple) dan hasil login/register (tuple).
+    """
+    if not isinstance(value, list):
+        return value
+    if name in TUPLE_RESULTS:
+        return tuple(value)
+    return [tuple(v) if isinstance(v, list) else v for v in value]
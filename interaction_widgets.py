@@ -12,9 +12,9 @@ Version: 1.0 - Phase 1 Complete
 from PyQt5 import QtWidgets, QtCore, QtGui
 from typing import Optional
 from app_db_interactions import (
-    like_article, unlike_article, is_article_liked,
-    bookmark_article, unbookmark_article, is_article_bookmarked,
-    track_article_view, get_article_stats
+    like_article_async, unlike_article_async,
+    bookmark_article_async, unbookmark_article_async,
+    track_article_view_async, get_article_full_info_async, get_article_stats_async
 )
 
 
@@ -32,6 +32,11 @@ class ArticleInteractionBar(QtWidgets.QWidget):
         super().__init__(parent)
         self.article_id = article_id
         self.username = username
+        self.is_liked = False
+        self.is_bookmarked = False
+        self.stats = {'views': 0, 'likes': 0, 'bookmarks': 0}
+        # Naik setiap kali stats diminta; respons yang lebih lama diabaikan
+        self._stats_seq = 0
         
         self._setup_ui()
         self._load_states()
@@ -103,41 +108,57 @@ class ArticleInteractionBar(QtWidgets.QWidget):
         """)
     
     def _load_states(self):
-        """Load current states from database"""
-        # Check if liked
-        self.is_liked = is_article_liked(self.article_id, self.username)
+        """Load status + statistik dalam satu query (non-blocking)"""
         self._update_like_button()
-        
-        # Check if bookmarked
-        self.is_bookmarked = is_article_bookmarked(self.article_id, self.username)
         self._update_bookmark_button()
-        
-        # Get stats
-        self._refresh_stats()
-        
-        # Track view
-        track_article_view(self.article_id, self.username)
+        self.label_views.setText(f"👁️ {self.stats['views']:,} views")
+        self._stats_seq += 1
+        seq = self._stats_seq
+        get_article_full_info_async(self.article_id, self.username).then(
+            lambda info: self._apply_info(info, seq))
+        
+        # Track view (non-blocking)
+        track_article_view_async(self.article_id, self.username)
+    
+    def _apply_info(self, info: Optional[dict], seq: int):
+        """Terapkan hasil get_article_full_info ke tombol dan label"""
+        # Sudah ada toggle / refresh yang lebih baru: flag lokal yang berlaku
+        if not info or seq != self._stats_seq:
+            return
+        self.is_liked = info.get('is_liked', False)
+        self.is_bookmarked = info.get('is_bookmarked', False)
+        self._apply_stats(info, seq)
+    
+    def _apply_stats(self, stats: dict, seq: int):
+        """Terapkan counter saja; status like/bookmark lokal tidak disentuh"""
+        if seq != self._stats_seq:
+            return
+        self.stats = {'views': stats['views'], 'likes': stats['likes'], 'bookmarks': stats['bookmarks']}
+        self._update_like_button()
+        self._update_bookmark_button()
+        self.label_views.setText(f"👁️ {self.stats['views']:,} views")
     
     def _toggle_like(self):
-        """Toggle like status"""
-        if self.is_liked:
-            success = unlike_article(self.article_id, self.username)
-            if success:
-                self.is_liked = False
-                self.liked_changed.emit(False)
+        """Toggle like status (non-blocking, hasil lewat event loop)"""
+        self._like_target = not self.is_liked
+        self.btn_like.setEnabled(False)
+        if self._like_target:
+            pending = like_article_async(self.article_id, self.username)
         else:
-            success = like_article(self.article_id, self.username)
-            if success:
-                self.is_liked = True
-                self.liked_changed.emit(True)
-        
+            pending = unlike_article_async(self.article_id, self.username)
+        pending.then(self._on_like_done)
+    
+    def _on_like_done(self, success: bool):
+        self.btn_like.setEnabled(True)
         if success:
+            self.is_liked = self._like_target
+            self.liked_changed.emit(self.is_liked)
             self._update_like_button()
             self._refresh_stats()
     
     def _update_like_button(self):
         """Update like button appearance"""
-        stats = get_article_stats(self.article_id)
+        stats = self.stats
         
         if self.is_liked:
             self.btn_like.setText(f"❤️ {stats['likes']}")
@@ -177,25 +198,26 @@ class ArticleInteractionBar(QtWidgets.QWidget):
             """)
     
     def _toggle_bookmark(self):
-        """Toggle bookmark status"""
-        if self.is_bookmarked:
-            success = unbookmark_article(self.article_id, self.username)
-            if success:
-                self.is_bookmarked = False
-                self.bookmarked_changed.emit(False)
+        """Toggle bookmark status (non-blocking, hasil lewat event loop)"""
+        self._bookmark_target = not self.is_bookmarked
+        self.btn_bookmark.setEnabled(False)
+        if self._bookmark_target:
+            pending = bookmark_article_async(self.article_id, self.username)
         else:
-            success = bookmark_article(self.article_id, self.username)
-            if success:
-                self.is_bookmarked = True
-                self.bookmarked_changed.emit(True)
-        
+            pending = unbookmark_article_async(self.article_id, self.username)
+        pending.then(self._on_bookmark_done)
+    
+    def _on_bookmark_done(self, success: bool):
+        self.btn_bookmark.setEnabled(True)
         if success:
+            self.is_bookmarked = self._bookmark_target
+            self.bookmarked_changed.emit(self.is_bookmarked)
             self._update_bookmark_button()
             self._refresh_stats()
     
     def _update_bookmark_button(self):
         """Update bookmark button appearance"""
-        stats = get_article_stats(self.article_id)
+        stats = self.stats
         
         if self.is_bookmarked:
             self.btn_bookmark.setText(f"🔖 Saved ({stats['bookmarks']})")
@@ -235,9 +257,10 @@ class ArticleInteractionBar(QtWidgets.QWidget):
             """)
     
     def _refresh_stats(self):
-        """Refresh statistics display"""
-        stats = get_article_stats(self.article_id)
-        self.label_views.setText(f"👁️ {stats['views']:,} views")
+        """Refresh counter setelah toggle (tanpa content dan status)"""
+        self._stats_seq += 1
+        seq = self._stats_seq
+        get_article_stats_async(self.article_id).then(lambda stats: self._apply_stats(stats, seq))
     
     def refresh(self):
         """Public method to refresh all states"""
@@ -1,7 +1,54 @@
 # main_cyberpunk.py — Launcher untuk Crypto Insight dengan Cyberpunk UI
 import sys
+# Profiler startup harus paling awal supaya import PyQt5 ikut terukur
+# (CRYPTO_INSIGHT_PROFILE_STARTUP=1 atau --profile-startup)
+import startup_profiler
+startup_profiler.enable_from_environment()
+startup_profiler.begin("imports")
+
+import importlib
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtCore import QTimer
+from qt_workers import run_in_background
+
+startup_profiler.end("imports")
+
+# Module dashboard yang di-import di background selama splash,
+# supaya login pertama tidak menunggu import PyQt widget yang berat
+DASHBOARD_MODULES = ("dashboard_ui", "user_dashboard", "penerbit_dashboard", "admin_dashboard")
+
+
+@startup_profiler.timed("dashboard imports")
+def _import_dashboards() -> list:
+    """Import module dashboard. Returns: daftar module yang gagal di-import."""
+    failed = []
+    for name in DASHBOARD_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"⚠️ Failed to import {name}: {e}")
+            failed.append(name)
+    return failed
+
+
+@startup_profiler.timed("db warm-up")
+def _warm_database_pool() -> int:
+    from app_db_fixed import warm_pool
+    return warm_pool()
+
+
+@startup_profiler.timed("schema check")
+def _check_schema() -> bool:
+    from app_db_fixed import ensure_schema
+    return ensure_schema()
+
+
+# (key, label di splash, fungsi) — semuanya jalan paralel
+STARTUP_TASKS = (
+    ("pool", "DATABASE LINK", _warm_database_pool),
+    ("schema", "SCHEMA CHECK", _check_schema),
+    ("modules", "DASHBOARD MODULES", _import_dashboards),
+)
 
 class CyberpunkSplashScreen(QtWidgets.QWidget):
     """Cyberpunk-themed splash screen dengan animasi loading"""
@@ -171,11 +218,8 @@ class CyberpunkSplashScreen(QtWidgets.QWidget):
         self.loading_timer.timeout.connect(self._update_loading)
         self.loading_timer.start(400)
         
-        # Progress animation
-        self.progress_value = 0
-        self.progress_timer = QTimer(self)
-        self.progress_timer.timeout.connect(self._update_progress)
-        self.progress_timer.start(30)
+        # Progress mengikuti startup task yang sudah selesai (lihat StartupLoader)
+        self.task_lines = {}
     
     def _update_loading(self):
         """Update loading animation"""
@@ -183,28 +227,79 @@ class CyberpunkSplashScreen(QtWidgets.QWidget):
         dots_text = "." * self.dots
         self.loading_label.setText(f"LOADING{dots_text}")
     
-    def _update_progress(self):
-        """Update progress bar"""
-        self.progress_value += 1
-        self.progress_bar.setValue(self.progress_value)
-        
-        if self.progress_value >= 100:
-            self.progress_timer.stop()
+    def set_tasks(self, tasks):
+        """Tampilkan daftar startup task (key, label) di system info"""
+        self.task_lines = {key: f"◢ {label}..." for key, label in tasks}
+        self._render_tasks()
+    
+    def mark_task(self, key, ok):
+        """Tandai satu task selesai (ok/gagal)"""
+        label = self.task_lines[key][2:].rstrip(".")
+        self.task_lines[key] = f"◣ {label} {'OK' if ok else 'FAILED'}"
+        self._render_tasks()
+    
+    def set_progress(self, value):
+        """Update progress bar (0-100)"""
+        self.progress_bar.setValue(value)
+    
+    def _render_tasks(self):
+        self.system_info.setText("\n".join(self.task_lines.values()))
+
+
+class StartupLoader(QtCore.QObject):
+    """
+    Jalankan STARTUP_TASKS paralel di background thread dan emit
+    all_done(results) begitu semuanya selesai — tanpa timer tetap.
+    """
+    
+    task_done = QtCore.pyqtSignal(str, bool)
+    all_done = QtCore.pyqtSignal(dict)
+    
+    def __init__(self, tasks=STARTUP_TASKS, parent=None):
+        super().__init__(parent)
+        self.tasks = tasks
+        self.results = {}
+        self.workers = []
+    
+    def start(self):
+        for key, _, func in self.tasks:
+            self.workers.append(run_in_background(
+                func,
+                on_result=lambda result, key=key: self._finish(key, result),
+                on_error=lambda message, key=key: self._finish(key, None, message),
+                parent=self
+            ))
+    
+    def _finish(self, key, result, error=None):
+        if error:
+            print(f"⚠️ Startup task {key} failed: {error}")
+        self.results[key] = result
+        if key == "modules":
+            ok = result == []
+        else:
+            ok = bool(result)
+        self.task_done.emit(key, ok)
+        if len(self.results) == len(self.tasks):
+            self.all_done.emit(self.results)
 
 def main():
     """Launch Cyberpunk Auth UI"""
     
-    app = QtWidgets.QApplication(sys.argv)
-    
-    # Set cyberpunk font
-    app.setFont(QtGui.QFont("Consolas", 10, QtGui.QFont.Bold))
+    with startup_profiler.phase("qt init"):
+        app = QtWidgets.QApplication(sys.argv)
+        
+        # Set cyberpunk font
+        app.setFont(QtGui.QFont("Consolas", 10, QtGui.QFont.Bold))
     
     try:
         # Import Cyberpunk Auth Window
-        from auth_ui_cyberpunk import CyberpunkAuthWindow
+        with startup_profiler.phase("auth module import"):
+            from auth_ui_cyberpunk import CyberpunkAuthWindow
         
         # Create splash screen
-        splash = CyberpunkSplashScreen()
+        startup_profiler.begin("splash")
+        with startup_profiler.phase("splash construction"):
+            splash = CyberpunkSplashScreen()
         
         # Center on screen
         screen_geo = QtWidgets.QApplication.desktop().screenGeometry()
@@ -213,25 +308,46 @@ def main():
         
         # Show splash
         splash.show()
+        splash.set_tasks([(key, label) for key, label, _ in STARTUP_TASKS])
         
-        # Create main window
-        main_window = CyberpunkAuthWindow()
+        windows = {}
+        loader = StartupLoader()
         
-        # Function to switch windows
-        def show_main_window():
-            splash.loading_timer.stop()
-            splash.progress_timer.stop()
-            splash.close()
+        def on_task_done(key, ok):
+            splash.mark_task(key, ok)
+            splash.set_progress(int(100 * len(loader.results) / len(STARTUP_TASKS)))
+        
+        # Function to switch windows (dipanggil begitu semua task selesai)
+        def show_main_window(results):
+            # Database sudah dicek di splash, auth window tidak perlu cek ulang.
+            # Migration pending hanya ditandai di splash (SCHEMA CHECK), bukan
+            # dianggap koneksi gagal.
+            with startup_profiler.phase("auth window construction"):
+                main_window = CyberpunkAuthWindow(db_ready=bool(results.get("pool")))
+            windows["auth"] = main_window
+            startup_profiler.watch_first_paint(main_window, "auth window first paint")
             
             # Center main window
             screen_geo = QtWidgets.QApplication.desktop().screenGeometry()
             center_pos = screen_geo.center() - main_window.rect().center()
             main_window.move(center_pos)
             
+            # Show dulu baru tutup splash (jangan sampai tidak ada window terbuka)
             main_window.show()
+            splash.loading_timer.stop()
+            splash.close()
+            startup_profiler.end("splash")
 
-        # Switch after 3 seconds
-        QTimer.singleShot(3000, show_main_window)
+        loader.task_done.connect(on_task_done)
+        loader.all_done.connect(show_main_window)
+        loader.start()
+        
+        from app_db_fixed import close_pool
+        from async_db import close_async_database
+        app.aboutToQuit.connect(close_async_database)
+        app.aboutToQuit.connect(close_pool)
+        # Belum sempat login → laporan startup dicetak saat keluar
+        app.aboutToQuit.connect(startup_profiler.finish)
         
         sys.exit(app.exec_())
         
@@ -0,0 +1,37 @@
+-- ============================================
+-- CRYPTO INSIGHT - CORE SCHEMA
+-- users, user_sessions (presence), news
+-- ============================================
+-- Sebelumnya dijalankan setup_database() setiap kali login window dibuka.
+-- Semua statement idempotent, jadi aman untuk database yang sudah ada.
+
+-- Tabel users
+CREATE TABLE IF NOT EXISTS users (
+    id SERIAL PRIMARY KEY,
+    username VARCHAR(100) UNIQUE NOT NULL,
+    password VARCHAR(256) NOT NULL,
+    role VARCHAR(50) DEFAULT 'user'
+);
+
+-- Tabel presence
+CREATE TABLE IF NOT EXISTS user_sessions (
+  id SERIAL PRIMARY KEY,
+  username VARCHAR(100) NOT NULL,
+  started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  last_seen  TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+  status     VARCHAR(16) NOT NULL DEFAULT 'online'
+);
+CREATE INDEX IF NOT EXISTS idx_user_sessions_username ON user_sessions(username);
+CREATE INDEX IF NOT EXISTS idx_user_sessions_last_seen ON user_sessions(last_seen);
+
+-- Tabel berita (khusus role 'penerbit')
+CREATE TABLE IF NOT EXISTS news (
+  id SERIAL PRIMARY KEY,
+  title VARCHAR(200) NOT NULL,
+  content TEXT NOT NULL,
+  author VARCHAR(100) NOT NULL,
+  status VARCHAR(20) NOT NULL DEFAULT 'draft',
+  created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_news_created_at ON news(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_news_author ON news(author);
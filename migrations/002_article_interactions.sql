@@ -3,14 +3,11 @@
 -- Like, Bookmark, View Count Features
 -- ============================================
 -- 
--- Run this script in your Railway PostgreSQL console
--- Or using psql: psql $DATABASE_URL -f migration_phase1.sql
+-- Dijalankan oleh app_db_migrations (python run_migration.py),
+-- dalam satu transaksi dan dicatat di schema_migrations.
 --
 -- ============================================
 
--- Start transaction
-BEGIN;
-
 -- ============================================
 -- 1. ARTICLE LIKES
 -- ============================================
@@ -218,45 +215,11 @@ FROM news n
 WHERE n.status = 'published'
 ORDER BY n.like_count DESC, n.views DESC;
 
--- ============================================
--- 9. VERIFY INSTALLATION
--- ============================================
-
--- Check if all tables exist
-DO $$
-DECLARE
-    tables_exist BOOLEAN;
-BEGIN
-    SELECT 
-        EXISTS(SELECT 1 FROM information_schema.tables WHERE table_name = 'article_likes') AND
-        EXISTS(SELECT 1 FROM information_schema.tables WHERE table_name = 'article_views') AND
-        EXISTS(SELECT 1 FROM information_schema.tables WHERE table_name = 'article_bookmarks')
-    INTO tables_exist;
-    
-    IF tables_exist THEN
-        RAISE NOTICE '✅ All Phase 1 tables created successfully!';
-    ELSE
-        RAISE EXCEPTION '❌ Some tables failed to create!';
-    END IF;
-END $$;
-
--- Display summary
-SELECT 
-    '✅ PHASE 1 MIGRATION COMPLETED!' as status,
-    (SELECT COUNT(*) FROM article_likes) as total_likes,
-    (SELECT COUNT(*) FROM article_bookmarks) as total_bookmarks,
-    (SELECT COUNT(*) FROM article_views) as total_views,
-    (SELECT COUNT(*) FROM news WHERE like_count > 0) as articles_with_likes,
-    (SELECT COUNT(*) FROM news WHERE bookmark_count > 0) as articles_with_bookmarks,
-    (SELECT COUNT(*) FROM news WHERE views > 0) as articles_with_views;
-
--- Commit transaction
-COMMIT;
-
 -- ============================================
 -- ROLLBACK SCRIPT (In case you need to undo)
 -- ============================================
--- Uncomment and run this if you need to rollback:
+-- Uncomment and run this if you need to rollback
+-- (lalu DELETE FROM schema_migrations WHERE version = 2):
 /*
 BEGIN;
 DROP VIEW IF EXISTS v_popular_articles CASCADE;
@@ -276,13 +239,3 @@ ALTER TABLE news DROP COLUMN IF EXISTS bookmark_count;
 ALTER TABLE news DROP COLUMN IF EXISTS views;
 COMMIT;
 */
-
--- ============================================
--- DONE! 🎉
--- ============================================
--- Next steps:
--- 1. ✅ Migration completed
--- 2. 📦 Install Python backend files
--- 3. 🎨 Update UI components
--- 4. 🚀 Run application
--- ============================================
@@ -0,0 +1,137 @@
+-- ============================================
+-- CRYPTO INSIGHT - PER-USER INTERACTION COUNTERS
+-- liked_count / bookmarked_count per user
+-- ============================================
+--
+-- get_user_interaction_summary() sebelumnya menjalankan dua COUNT(*) atas
+-- seluruh histori like/bookmark user (dipanggil setiap ganti tab dashboard).
+-- Migration ini menyimpan jumlahnya di user_interaction_counts dan
+-- menjaganya dari trigger like/bookmark yang sudah ada, jadi summary cukup
+-- satu baris lewat primary key.
+--
+-- Drift (mis. edit manual dengan trigger dimatikan) diperbaiki oleh
+-- reconcile_user_interaction_counts(), dipanggil dari Database Manager →
+-- Backup & Health → Reconcile Counters.
+--
+-- Dijalankan oleh app_db_migrations (python run_migration.py).
+--
+-- ============================================
+
+-- ============================================
+-- 1. COUNTER TABLE
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS user_interaction_counts (
+    username VARCHAR(100) PRIMARY KEY REFERENCES users(username) ON DELETE CASCADE,
+    liked_count INTEGER NOT NULL DEFAULT 0,
+    bookmarked_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE user_interaction_counts IS 'Per-user like/bookmark counts maintained by article_likes/article_bookmarks triggers';
+
+-- ============================================
+-- 2. EXTEND EXISTING TRIGGER FUNCTIONS
+-- ============================================
+-- Trigger trg_article_likes_update / trg_article_bookmarks_update (002)
+-- tetap sama; fungsinya sekarang juga mengupdate counter user.
+
+CREATE OR REPLACE FUNCTION update_article_like_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE news SET like_count = like_count + 1 WHERE id = NEW.article_id;
+        INSERT INTO user_interaction_counts (username, liked_count)
+        VALUES (NEW.username, 1)
+        ON CONFLICT (username) DO UPDATE
+        SET liked_count = user_interaction_counts.liked_count + 1, updated_at = NOW();
+        RETURN NEW;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE news SET like_count = GREATEST(like_count - 1, 0) WHERE id = OLD.article_id;
+        UPDATE user_interaction_counts
+        SET liked_count = GREATEST(liked_count - 1, 0), updated_at = NOW()
+        WHERE username = OLD.username;
+        RETURN OLD;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION update_article_bookmark_count()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE news SET bookmark_count = bookmark_count + 1 WHERE id = NEW.article_id;
+        INSERT INTO user_interaction_counts (username, bookmarked_count)
+        VALUES (NEW.username, 1)
+        ON CONFLICT (username) DO UPDATE
+        SET bookmarked_count = user_interaction_counts.bookmarked_count + 1, updated_at = NOW();
+        RETURN NEW;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE news SET bookmark_count = GREATEST(bookmark_count - 1, 0) WHERE id = OLD.article_id;
+        UPDATE user_interaction_counts
+        SET bookmarked_count = GREATEST(bookmarked_count - 1, 0), updated_at = NOW()
+        WHERE username = OLD.username;
+        RETURN OLD;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 3. RECONCILE
+-- ============================================
+-- Hitung ulang dari article_likes / article_bookmarks dan perbaiki baris
+-- yang berbeda. Returns: jumlah user yang counternya dikoreksi.
+
+CREATE OR REPLACE FUNCTION reconcile_user_interaction_counts()
+RETURNS INTEGER AS $$
+DECLARE
+    fixed INTEGER;
+BEGIN
+    WITH actual AS (
+        SELECT u.username,
+               COALESCE(l.n, 0) AS liked_count,
+               COALESCE(b.n, 0) AS bookmarked_count
+        FROM users u
+        LEFT JOIN (SELECT username, COUNT(*)::int AS n FROM article_likes GROUP BY username) l
+               ON l.username = u.username
+        LEFT JOIN (SELECT username, COUNT(*)::int AS n FROM article_bookmarks GROUP BY username) b
+               ON b.username = u.username
+    ),
+    upserted AS (
+        INSERT INTO user_interaction_counts AS c (username, liked_count, bookmarked_count, updated_at)
+        SELECT a.username, a.liked_count, a.bookmarked_count, NOW()
+        FROM actual a
+        LEFT JOIN user_interaction_counts cur ON cur.username = a.username
+        WHERE cur.username IS NULL
+           OR cur.liked_count <> a.liked_count
+           OR cur.bookmarked_count <> a.bookmarked_count
+        ON CONFLICT (username) DO UPDATE
+        SET liked_count = EXCLUDED.liked_count,
+            bookmarked_count = EXCLUDED.bookmarked_count,
+            updated_at = NOW()
+        RETURNING 1
+    )
+    SELECT COUNT(*) INTO fixed FROM upserted;
+    RETURN fixed;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================
+-- 4. INITIAL COUNTS
+-- ============================================
+
+SELECT reconcile_user_interaction_counts();
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- (jalankan ulang bagian 6 dari 002_article_interactions.sql untuk
+--  mengembalikan fungsi trigger, lalu DELETE FROM schema_migrations WHERE version = 5)
+-- ============================================
+/*
+BEGIN;
+DROP FUNCTION IF EXISTS reconcile_user_interaction_counts();
+DROP TABLE IF EXISTS user_interaction_counts;
+COMMIT;
+*/
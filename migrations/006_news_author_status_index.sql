@@ -0,0 +1,37 @@
+-- migrate:no-transaction
+-- ============================================
+-- CRYPTO INSIGHT - AUTHOR SUMMARY INDEX
+-- Index (author, status) untuk get_author_summary()
+-- ============================================
+--
+-- Stat card PenerbitDashboard sebelumnya menarik sampai 1000 baris artikel
+-- setiap 30 detik hanya untuk menghitung status di Python. Sekarang cukup
+-- satu aggregate query per author lewat index ini (index scan atas artikel
+-- author itu saja; counter dibaca dari heap).
+--
+-- Counter views/like_count/bookmark_count sengaja TIDAK di-INCLUDE: counter
+-- di-update setiap view/like/bookmark, dan kolom yang ada di index membuat
+-- update itu tidak bisa HOT (setiap index news ikut ditulis). Heap yang
+-- terus berubah juga membersihkan bit visibility map, jadi index-only scan
+-- hampir tidak pernah terjadi.
+--
+-- idx_news_author (001) digantikan index ini: kolom pertamanya sama,
+-- jadi filter WHERE author = ... (list_my_news) tetap memakai index.
+--
+-- Dibuat CONCURRENTLY supaya tabel news tidak terkunci saat migrate.
+--
+-- ============================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_news_author_status
+    ON news (author, status);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_news_author;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- (lalu DELETE FROM schema_migrations WHERE version = 6)
+-- ============================================
+/*
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_news_author ON news(author);
+DROP INDEX CONCURRENTLY IF EXISTS idx_news_author_status;
+*/
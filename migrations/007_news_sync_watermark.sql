@@ -0,0 +1,90 @@
+-- ============================================
+-- CRYPTO INSIGHT - NEWS SYNC WATERMARK
+-- news.updated_at + news_tombstones untuk replica feed lokal
+-- ============================================
+--
+-- feed_replica.py menyimpan salinan metadata artikel published di SQLite
+-- lokal dan hanya menarik delta: baris dengan (updated_at, id) setelah
+-- watermark terakhir, plus id artikel yang dihapus.
+--
+-- - updated_at di-set trigger hanya saat isi artikel berubah (title,
+--   content, author, status, gambar). Counter views/like_count/bookmark_count dari
+--   trigger interaksi TIDAK menggeser updated_at: setiap view akan jadi
+--   update non-HOT (updated_at ada di index) dan artikel yang sering dibaca
+--   ikut lagi di delta setiap sync. Replica menyegarkan counter terpisah
+--   lewat get_news_counters() dengan jadwal yang lebih jarang.
+-- - news_tombstones dicatat trigger AFTER DELETE (hard delete tidak
+--   terlihat di delta updated_at)
+--
+-- Dijalankan oleh app_db_migrations (python run_migration.py).
+--
+-- ============================================
+
+-- ============================================
+-- 1. UPDATED_AT
+-- ============================================
+
+ALTER TABLE news ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
+CREATE INDEX IF NOT EXISTS idx_news_updated_at ON news (updated_at, id);
+
+CREATE OR REPLACE FUNCTION touch_news_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_news_touch_updated_at ON news;
+-- Tambahkan kolom isi baru (bukan counter) ke daftar ini dan ke WHEN
+CREATE TRIGGER trg_news_touch_updated_at
+    BEFORE UPDATE OF title, content, author, status, image_data, image_filename ON news
+    FOR EACH ROW
+    WHEN ((OLD.title, OLD.content, OLD.author, OLD.status, OLD.image_data, OLD.image_filename)
+          IS DISTINCT FROM
+          (NEW.title, NEW.content, NEW.author, NEW.status, NEW.image_data, NEW.image_filename))
+    EXECUTE FUNCTION touch_news_updated_at();
+
+-- ============================================
+-- 2. TOMBSTONES
+-- ============================================
+
+CREATE TABLE IF NOT EXISTS news_tombstones (
+    id INTEGER PRIMARY KEY,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_news_tombstones_deleted_at ON news_tombstones (deleted_at);
+
+COMMENT ON TABLE news_tombstones IS 'Deleted news ids, read by client feed replicas during delta sync';
+
+CREATE OR REPLACE FUNCTION record_news_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO news_tombstones (id, deleted_at) VALUES (OLD.id, NOW())
+    ON CONFLICT (id) DO UPDATE SET deleted_at = NOW();
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_news_tombstone ON news;
+CREATE TRIGGER trg_news_tombstone
+    AFTER DELETE ON news
+    FOR EACH ROW
+    EXECUTE FUNCTION record_news_tombstone();
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- (lalu DELETE FROM schema_migrations WHERE version = 7)
+-- ============================================
+/*
+BEGIN;
+DROP TRIGGER IF EXISTS trg_news_tombstone ON news;
+DROP FUNCTION IF EXISTS record_news_tombstone();
+DROP TABLE IF EXISTS news_tombstones;
+DROP TRIGGER IF EXISTS trg_news_touch_updated_at ON news;
+DROP FUNCTION IF EXISTS touch_news_updated_at();
+DROP INDEX IF EXISTS idx_news_updated_at;
+ALTER TABLE news DROP COLUMN IF EXISTS updated_at;
+COMMIT;
+*/
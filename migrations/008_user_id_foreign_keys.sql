@@ -0,0 +1,132 @@
+-- ============================================
+-- CRYPTO INSIGHT - INTEGER USER KEYS (EXPAND)
+-- user_id INTEGER → users(id) di tabel interaksi dan session
+-- ============================================
+--
+-- article_likes, article_bookmarks, article_views dan user_sessions
+-- menyimpan username VARCHAR(100) sebagai foreign key. Setiap baris dan
+-- index jadi gemuk, dan setiap join/lookup membandingkan string.
+--
+-- Transisi dua tahap:
+-- 1. EXPAND (migration ini + 009 + 011): kolom user_id ditambahkan dan di-backfill.
+--    Selama transisi kedua kolom diisi (dual-write):
+--    - helper baru menulis user_id DAN username, membaca lewat user_id
+--    - client lama yang hanya menulis username tetap jalan: trigger
+--      BEFORE INSERT/UPDATE mengisi user_id dari username (dan sebaliknya)
+-- 2. CONTRACT (migration terpisah, setelah semua client memakai helper
+--    baru): hapus trigger sync, UNIQUE (article_id, username), dan kolom
+--    username (sekaligus FK dan index username dari 002). Counter user_interaction_counts masih ber-key username dan
+--    harus dipindah dulu.
+--
+-- Migration ini hanya DDL singkat; TIDAK ada backfill di sini. UPDATE
+-- seluruh tabel di transaksi yang sama dengan ALTER TABLE memegang ACCESS
+-- EXCLUSIVE selama rewrite dan memblok login/heartbeat (user_sessions),
+-- like/bookmark dan track_article_view. Backfill keempat tabel ada di 011
+-- (no-transaction, per batch id).
+--
+-- Karena itu semua constraint baru dibuat NOT VALID (tanpa scan tabel):
+-- - FK user_id → users(id)
+-- - CHECK (user_id IS NOT NULL) di like/bookmark; baris baru langsung
+--   dicek, baris lama setelah backfill. 011 me-VALIDATE semuanya (tanpa
+--   memblok write), lalu SET NOT NULL memakai CHECK yang sudah valid
+--   sehingga tidak perlu scan ulang di bawah ACCESS EXCLUSIVE.
+--
+-- Dijalankan oleh app_db_migrations (python run_migration.py).
+--
+-- ============================================
+
+-- ============================================
+-- 1. KOLOM USER_ID
+-- ============================================
+
+ALTER TABLE article_likes ADD COLUMN IF NOT EXISTS user_id INTEGER;
+ALTER TABLE article_likes
+    ADD CONSTRAINT article_likes_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE NOT VALID,
+    ADD CONSTRAINT article_likes_user_id_not_null
+    CHECK (user_id IS NOT NULL) NOT VALID;
+
+ALTER TABLE article_bookmarks ADD COLUMN IF NOT EXISTS user_id INTEGER;
+ALTER TABLE article_bookmarks
+    ADD CONSTRAINT article_bookmarks_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE NOT VALID,
+    ADD CONSTRAINT article_bookmarks_user_id_not_null
+    CHECK (user_id IS NOT NULL) NOT VALID;
+
+ALTER TABLE article_views ADD COLUMN IF NOT EXISTS user_id INTEGER;
+ALTER TABLE article_views
+    ADD CONSTRAINT article_views_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL NOT VALID;
+
+ALTER TABLE user_sessions ADD COLUMN IF NOT EXISTS user_id INTEGER;
+ALTER TABLE user_sessions
+    ADD CONSTRAINT user_sessions_user_id_fkey
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE NOT VALID;
+
+-- ============================================
+-- 2. DUAL-WRITE TRIGGER
+-- ============================================
+-- Client lama: INSERT (article_id, username) → user_id diisi di sini.
+-- Helper baru mengisi keduanya, jadi trigger tidak perlu lookup.
+-- BEFORE trigger jalan sebelum cek NOT NULL, jadi INSERT yang hanya
+-- mengisi user_id juga lolos.
+
+CREATE OR REPLACE FUNCTION sync_user_id_username()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' AND NEW.username IS DISTINCT FROM OLD.username
+       AND NEW.user_id IS NOT DISTINCT FROM OLD.user_id THEN
+        NEW.user_id := NULL;
+    END IF;
+
+    IF NEW.user_id IS NULL AND NEW.username IS NOT NULL THEN
+        SELECT id INTO NEW.user_id FROM users WHERE username = NEW.username;
+    ELSIF NEW.username IS NULL AND NEW.user_id IS NOT NULL THEN
+        SELECT username INTO NEW.username FROM users WHERE id = NEW.user_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['article_likes', 'article_bookmarks', 'article_views', 'user_sessions']
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_sync_user_id ON %I', t, t);
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_sync_user_id
+             BEFORE INSERT OR UPDATE OF username, user_id ON %I
+             FOR EACH ROW EXECUTE FUNCTION sync_user_id_username()', t, t);
+    END LOOP;
+END $$;
+
+-- ============================================
+-- 3. KETERANGAN KOLOM
+-- ============================================
+-- Backfill, VALIDATE dan SET NOT NULL: lihat 011_backfill_user_id.sql.
+
+COMMENT ON COLUMN article_likes.user_id IS 'users.id; username kept in sync until the contract migration';
+COMMENT ON COLUMN article_bookmarks.user_id IS 'users.id; username kept in sync until the contract migration';
+COMMENT ON COLUMN article_views.user_id IS 'users.id (NULL = anonymous view)';
+COMMENT ON COLUMN user_sessions.user_id IS 'users.id; username kept in sync until the contract migration';
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- (rollback 009 dulu, lalu DELETE FROM schema_migrations WHERE version = 8)
+-- ============================================
+/*
+BEGIN;
+DO $$
+DECLARE t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['article_likes', 'article_bookmarks', 'article_views', 'user_sessions']
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_sync_user_id ON %I', t, t);
+        EXECUTE format('ALTER TABLE %I DROP COLUMN IF EXISTS user_id', t);
+    END LOOP;
+END $$;
+DROP FUNCTION IF EXISTS sync_user_id_username();
+COMMIT;
+*/
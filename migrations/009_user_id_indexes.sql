@@ -0,0 +1,59 @@
+-- migrate:no-transaction
+-- ============================================
+-- CRYPTO INSIGHT - INTEGER USER KEY INDEXES
+-- Covering index per user_id, menggantikan index username
+-- ============================================
+--
+-- Lanjutan 008. Lookup per user di helper sekarang lewat user_id:
+--
+-- - (user_id, article_id) INCLUDE (waktu) di like/bookmark:
+--   is_article_liked / is_article_bookmarked, get_user_interaction_ids dan
+--   get_user_interaction_changes jadi index-only scan. UNIQUE, jadi juga
+--   target ON CONFLICT (article_id, user_id) di like_article/bookmark_article.
+-- - article_views: partial index, view anonim (user_id NULL) tidak ikut.
+-- - user_sessions (user_id, last_seen DESC) INCLUDE (status) untuk
+--   latest_presence_per_user().
+--
+-- idx_user_sessions_username di-drop (4 byte vs sampai 100 byte per entry).
+-- Index username di article_likes, article_bookmarks dan article_views
+-- TETAP ada: FK username → users(username) ON DELETE CASCADE / SET NULL
+-- dari 002 masih aktif, dan tanpa index setiap DELETE user (mis. "Delete
+-- User" di Database Manager) men-seq-scan tabel interaksi, termasuk
+-- article_views yang paling besar, sambil memegang lock baris user.
+-- Migration contract men-drop kolom username, sekaligus FK dan index-nya.
+-- UNIQUE (article_id, username) juga tetap ada sampai migration contract,
+-- karena client lama masih memakai ON CONFLICT (article_id, username).
+--
+-- Dibuat CONCURRENTLY supaya tabel tidak terkunci saat migrate.
+--
+-- ============================================
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_article_likes_user_article
+    ON article_likes (user_id, article_id)
+    INCLUDE (liked_at);
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS idx_bookmarks_user_article
+    ON article_bookmarks (user_id, article_id)
+    INCLUDE (bookmarked_at);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_article_views_user_id
+    ON article_views (user_id)
+    WHERE user_id IS NOT NULL;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_sessions_user_last_seen
+    ON user_sessions (user_id, last_seen DESC)
+    INCLUDE (status);
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_user_sessions_username;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- (lalu DELETE FROM schema_migrations WHERE version = 9)
+-- ============================================
+/*
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_sessions_username ON user_sessions(username);
+DROP INDEX CONCURRENTLY IF EXISTS idx_article_likes_user_article;
+DROP INDEX CONCURRENTLY IF EXISTS idx_bookmarks_user_article;
+DROP INDEX CONCURRENTLY IF EXISTS idx_article_views_user_id;
+DROP INDEX CONCURRENTLY IF EXISTS idx_user_sessions_user_last_seen;
+*/
@@ -0,0 +1,81 @@
+-- migrate:no-transaction
+-- ============================================
+-- CRYPTO INSIGHT - QUERY-SHAPED INDEXES
+-- Composite / partial index per bentuk query helper
+-- ============================================
+--
+-- Index phase 1 (002) satu kolom per index; sebagian dobel dengan
+-- UNIQUE (article_id, username), sementara urutan yang dipakai helper
+-- tidak punya index sama sekali. Setelah migration ini:
+--
+--   helper                         query                                   index
+--   get_user_liked_articles        user_id = ? ORDER BY liked_at DESC      idx_article_likes_user_time
+--   get_user_bookmarked_articles   user_id = ? ORDER BY bookmarked_at DESC idx_bookmarks_user_time
+--   get_article_likers             article_id = ? ORDER BY liked_at DESC   idx_article_likes_article_time
+--   list_published_news,           status = 'published'                    idx_news_published_created
+--   get_trending_articles,           ORDER BY / range created_at
+--   get_popular_articles,
+--   get_most_liked_articles
+--
+-- Lookup per (user_id, article_id) sudah dilayani index 009.
+-- Index feed partial (hanya published), jadi draft tidak ikut disimpan.
+--
+-- Sengaja TIDAK ada index di views / like_count: counter di-update di
+-- setiap view/like, dan kolom yang ada di index membuat update itu tidak
+-- bisa HOT (semua index news ikut ditulis). get_popular_articles dan
+-- get_most_liked_articles cukup top-N sort atas artikel published (lewat
+-- idx_news_published_created); feed user dibaca dari replica lokal
+-- (feed_replica.py), jadi query ini hanya fallback.
+--
+-- Di-drop (cek dengan verify_query_plans.py, tidak ada helper yang butuh):
+--   idx_article_likes_article   → UNIQUE (article_id, username) + index baru
+--   idx_bookmarks_article       → UNIQUE (article_id, username)
+--   idx_article_likes_time      → tidak ada query urut liked_at global
+--   idx_bookmarks_time          → tidak ada query urut bookmarked_at global
+--   idx_article_views_time      → tidak ada query urut viewed_at global
+--
+-- idx_article_views_article tetap: dipakai ON DELETE CASCADE dari news.
+-- idx_news_created_at tetap: daftar semua artikel di Database Manager.
+--
+-- Verifikasi setelah migrate:
+--     python verify_query_plans.py
+--
+-- ============================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_article_likes_user_time
+    ON article_likes (user_id, liked_at DESC)
+    INCLUDE (article_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_bookmarks_user_time
+    ON article_bookmarks (user_id, bookmarked_at DESC)
+    INCLUDE (article_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_article_likes_article_time
+    ON article_likes (article_id, liked_at DESC)
+    INCLUDE (user_id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_news_published_created
+    ON news (created_at DESC)
+    WHERE status = 'published';
+
+DROP INDEX CONCURRENTLY IF EXISTS idx_article_likes_article;
+DROP INDEX CONCURRENTLY IF EXISTS idx_bookmarks_article;
+DROP INDEX CONCURRENTLY IF EXISTS idx_article_likes_time;
+DROP INDEX CONCURRENTLY IF EXISTS idx_bookmarks_time;
+DROP INDEX CONCURRENTLY IF EXISTS idx_article_views_time;
+
+-- ============================================
+-- ROLLBACK SCRIPT
+-- (lalu DELETE FROM schema_migrations WHERE version = 10)
+-- ============================================
+/*
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_article_likes_article ON article_likes(article_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_bookmarks_article ON article_bookmarks(article_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_article_likes_time ON article_likes(liked_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_bookmarks_time ON article_bookmarks(bookmarked_at DESC);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_article_views_time ON article_views(viewed_at DESC);
+DROP INDEX CONCURRENTLY IF EXISTS idx_article_likes_user_time;
+DROP INDEX CONCURRENTLY IF EXISTS idx_bookmarks_user_time;
+DROP INDEX CONCURRENTLY IF EXISTS idx_article_likes_article_time;
+DROP INDEX CONCURRENTLY IF EXISTS idx_news_published_created;
+*/
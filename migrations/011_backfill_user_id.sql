@@ -0,0 +1,98 @@
+-- migrate:no-transaction
+-- ============================================
+-- CRYPTO INSIGHT - USER_ID BACKFILL
+-- Lanjutan 008: isi user_id per batch id, lalu validasi constraint
+-- ============================================
+--
+-- Backfill dipisah dari DDL di 008 supaya tidak ada UPDATE seluruh tabel
+-- di dalam transaksi yang memegang ACCESS EXCLUSIVE. Setiap batch
+-- BATCH_SIZE id di-commit sendiri, jadi login/heartbeat (user_sessions),
+-- like/bookmark dan track_article_view hanya menunggu lock baris satu batch.
+--
+-- Baris baru sudah diisi trigger sync dari 008, jadi cukup sampai MAX(id)
+-- saat tabel mulai di-backfill. Trigger counter (002/005) hanya AFTER
+-- INSERT/DELETE, jadi tidak ikut jalan.
+--
+-- Setelah backfill:
+-- - FK NOT VALID dari 008 di-VALIDATE (SHARE UPDATE EXCLUSIVE, write tetap jalan)
+-- - like/bookmark: CHECK (user_id IS NOT NULL) di-VALIDATE, lalu SET NOT NULL
+--   memakai CHECK itu (PostgreSQL 12+, tanpa scan) dan CHECK-nya di-drop.
+--   username di like/bookmark sudah NOT NULL + FK ke users, jadi semua baris
+--   punya user_id. View anonim tetap NULL; session user yang sudah dihapus
+--   (username tanpa FK) juga NULL dan tidak muncul lagi di presence.
+--
+-- Setiap langkah di-commit sendiri (COMMIT di dalam DO butuh mode
+-- no-transaction) dan aman dijalankan ulang kalau gagal di tengah.
+--
+-- Dijalankan oleh app_db_migrations (python run_migration.py).
+--
+-- ============================================
+
+-- ============================================
+-- 1. BACKFILL PER BATCH
+-- ============================================
+
+DO $$
+DECLARE
+    batch_size CONSTANT INTEGER := 10000;
+    t TEXT;
+    max_id INTEGER;
+    lo INTEGER;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['user_sessions', 'article_likes', 'article_bookmarks', 'article_views']
+    LOOP
+        EXECUTE format('SELECT COALESCE(MAX(id), 0) FROM %I', t) INTO max_id;
+        lo := 0;
+        WHILE lo < max_id LOOP
+            EXECUTE format(
+                'UPDATE %I t SET user_id = u.id
+                 FROM users u
+                 WHERE t.id > $1 AND t.id <= $2
+                   AND t.user_id IS NULL
+                   AND u.username = t.username', t)
+            USING lo, lo + batch_size;
+            lo := lo + batch_size;
+            COMMIT;
+        END LOOP;
+    END LOOP;
+END $$;
+
+-- ============================================
+-- 2. VALIDATE FK
+-- ============================================
+
+ALTER TABLE user_sessions VALIDATE CONSTRAINT user_sessions_user_id_fkey;
+ALTER TABLE article_likes VALIDATE CONSTRAINT article_likes_user_id_fkey;
+ALTER TABLE article_bookmarks VALIDATE CONSTRAINT article_bookmarks_user_id_fkey;
+ALTER TABLE article_views VALIDATE CONSTRAINT article_views_user_id_fkey;
+
+-- ============================================
+-- 3. NOT NULL LEWAT CHECK YANG SUDAH VALID
+-- ============================================
+
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY['article_likes', 'article_bookmarks']
+    LOOP
+        -- Sudah di-drop berarti langkah ini sudah selesai sebelumnya
+        IF NOT EXISTS (SELECT 1 FROM pg_constraint
+                       WHERE conrelid = format('public.%I', t)::regclass
+                         AND conname = t || '_user_id_not_null') THEN
+            CONTINUE;
+        END IF;
+        EXECUTE format('ALTER TABLE %I VALIDATE CONSTRAINT %I', t, t || '_user_id_not_null');
+        COMMIT;
+        EXECUTE format('ALTER TABLE %I ALTER COLUMN user_id SET NOT NULL', t);
+        EXECUTE format('ALTER TABLE %I DROP CONSTRAINT %I', t, t || '_user_id_not_null');
+        COMMIT;
+    END LOOP;
+END $$;
+
+-- ============================================
+-- ROLLBACK
+-- ALTER TABLE article_likes / article_bookmarks ALTER COLUMN user_id DROP NOT NULL
+-- (user_id tetap konsisten dengan username lewat trigger sync),
+-- lalu DELETE FROM schema_migrations WHERE version = 11
+-- ============================================
@@ -0,0 +1,134 @@
+# monitoring_writer.py — Background writer untuk admin_monitoring.db
+"""
+Semua INSERT monitoring (user_activities, admin_actions, ...) dikirim ke
+queue dan ditulis oleh satu thread khusus:
+- Satu koneksi SQLite persistent (WAL + synchronous=NORMAL)
+- Insert di-batch: satu transaksi per flush
+- UI thread tidak pernah menunggu disk
+
+Pakai:
+    writer = MonitoringWriter("admin_monitoring.db")
+    writer.start()
+    writer.submit("INSERT INTO admin_actions (...) VALUES (?, ?)", (a, b))
+    writer.flush()   # tunggu sampai semua tertulis (misal sebelum export)
+    writer.close()   # flush + stop thread (closeEvent)
+"""
+
+import queue
+import sqlite3
+import threading
+from typing import Optional, Sequence
+
+# Marker internal di queue
+_STOP = object()
+
+
+def configure_connection(conn: sqlite3.Connection):
+    """Pragma standar untuk admin_monitoring.db (dipakai writer dan setup)"""
+    conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")
+
+
+class MonitoringWriter(threading.Thread):
+    """Thread yang menulis insert monitoring secara batch"""
+
+    def __init__(self, db_path: str, flush_interval: float = 0.5, max_batch: int = 500):
+        super().__init__(name="MonitoringWriter", daemon=True)
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queue: "queue.Queue" = queue.Queue()
+        self._closed = False
+
+    # ---------- Public API (dipanggil dari UI thread) ----------
+
+    def submit(self, sql: str, params: Sequence = ()):
+        """Antrekan satu statement. Tidak pernah blocking."""
+        if self._closed:
+            print("⚠️ MonitoringWriter sudah ditutup, insert diabaikan")
+            return
+        self._queue.put((sql, tuple(params)))
+
+    def flush(self, timeout: Optional[float] = 2.0) -> bool:
+        """Tunggu sampai semua insert yang sudah diantrekan ter-commit."""
+        if not self.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """Flush sisa queue lalu hentikan thread."""
+        if self._closed:
+            return
+        self._closed = True
+        if self.is_alive():
+            self._queue.put(_STOP)
+            self.join(timeout)
+
+    # ---------- Writer thread ----------
+
+    def run(self):
+        conn = sqlite3.connect(self.db_path)
+        configure_connection(conn)
+        try:
+            running = True
+            while running:
+                try:
+                    first = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    continue
+
+                batch = [first]
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                running = self._write_batch(conn, batch)
+        finally:
+            conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: list) -> bool:
+        """Tulis batch dalam satu transaksi. Returns False jika ada _STOP."""
+        statements = []
+        waiters = []
+        keep_running = True
+        for item in batch:
+            if item is _STOP:
+                keep_running = False
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            else:
+                statements.append(item)
+
+        if statements:
+            try:
+                with conn:
+                    for sql, params in statements:
+                        conn.execute(sql, params)
+            except Exception as e:
+                # Satu statement rusak jangan sampai membuang seluruh batch
+                print(f"⚠️ Monitoring batch failed ({e}), retrying one by one")
+                for sql, params in statements:
+                    try:
+                        with conn:
+                            conn.execute(sql, params)
+                    except Exception as e:
+                        print(f"❌ Error writing monitoring row: {e}")
+
+        for waiter in waiters:
+            waiter.set()
+
+        if not keep_running:
+            # Tulis apa pun yang masuk setelah _STOP (close() race)
+            leftover = []
+            while True:
+                try:
+                    leftover.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if leftover:
+                self._write_batch(conn, [i for i in leftover if i is not _STOP])
+        return keep_running
@@ -15,8 +15,10 @@ from PyQt5 import QtCore, QtGui, QtWidgets
 from typing import Optional
 from app_db_fixed import (
     heartbeat, end_session, 
-    create_news, list_my_news, list_published_news
+    create_news, list_my_news, list_published_news, get_author_summary
 )
+from db_status import OfflineBanner
+from qt_workers import run_in_background
 
 # 🎨 CYBERPUNK COLOR PALETTE
 CYBER_CYAN = "#00ffff"
@@ -175,6 +177,9 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
         self.setWindowTitle(f"⚡ CRYPTO INSIGHT — CYBERPUNK EDITION ⚡")
         self.resize(1500, 950)
         
+        self.stats_worker = None
+        self.stats_reload_pending = False
+        
         self._setup_ui()
         self._apply_cyberpunk_theme()
         self._load_statistics()
@@ -204,6 +209,9 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
         header = self._create_cyber_header()
         main_layout.addWidget(header)
         
+        # Banner degraded state (muncul saat database offline)
+        main_layout.addWidget(OfflineBanner())
+        
         # 📊 GLOWING STATS
         stats = self._create_cyber_stats()
         main_layout.addLayout(stats)
@@ -446,18 +454,34 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
             self.input_title.setFocus()
     
     def _load_statistics(self):
-        """Load stats"""
-        try:
-            articles = list_my_news(self.username, limit=1000)
-            total = len(articles)
-            published = len([a for a in articles if a[2] == 'published'])
-            draft = total - published
-            
-            self.card_total.update_value(total)
-            self.card_published.update_value(published)
-            self.card_draft.update_value(draft)
-        except Exception as e:
-            print(f"Error loading stats: {e}")
+        """Load stats (satu aggregate query, background thread)"""
+        if self.stats_worker is not None:
+            # Masih jalan; muat ulang setelah selesai (mis. baru publish)
+            self.stats_reload_pending = True
+            return
+        self.stats_worker = run_in_background(
+            get_author_summary, self.username,
+            on_result=self._show_statistics,
+            on_error=lambda msg: print(f"Error loading stats: {msg}"),
+            parent=self
+        )
+        self.stats_worker.finished.connect(self._on_stats_finished)
+    
+    def _on_stats_finished(self):
+        self.stats_worker = None
+        if self.stats_reload_pending:
+            self.stats_reload_pending = False
+            self._load_statistics()
+    
+    def initial_data_shown(self) -> bool:
+        """Kartu statistik sudah terisi (tabel artikel dimuat sinkron di __init__)"""
+        return self.stats_worker is None
+    
+    def _show_statistics(self, summary: dict):
+        self.card_total.update_value(summary['total'])
+        self.card_published.update_value(summary['published'])
+        self.card_draft.update_value(summary['draft'])
+        self.card_views.update_value(f"{summary['views']:,}")
     
     def _load_my_articles(self):
         """Load articles table"""
@@ -676,6 +700,8 @@ class PenerbitDashboard(QtWidgets.QMainWindow):
     def closeEvent(self, event):
         """Handle close"""
         self._logout()
+        if self.stats_worker is not None:
+            self.stats_worker.wait(2000)
         event.accept()
 
 
@@ -0,0 +1,53 @@
+# qt_workers.py — Background workers untuk query database dari UI Qt
+"""
+Helper kecil supaya query database tidak jalan di UI thread:
+- DbTaskWorker: QThread yang menjalankan satu fungsi lalu emit hasilnya
+- run_in_background(): shortcut untuk start worker + sambungkan callback
+
+Hasil selalu dikirim lewat signal, jadi callback dieksekusi di UI thread
+dan aman untuk update widget.
+"""
+
+from PyQt5 import QtCore
+from typing import Callable, Optional
+
+
+class DbTaskWorker(QtCore.QThread):
+    """Jalankan satu fungsi (biasanya helper app_db_*) di thread terpisah"""
+
+    result_ready = QtCore.pyqtSignal(object)
+    error = QtCore.pyqtSignal(str)
+
+    def __init__(self, func: Callable, *args, parent=None, **kwargs):
+        super().__init__(parent)
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.error.emit(str(e))
+            return
+        self.result_ready.emit(result)
+
+
+def run_in_background(func: Callable, *args,
+                      on_result: Optional[Callable] = None,
+                      on_error: Optional[Callable] = None,
+                      parent: Optional[QtCore.QObject] = None,
+                      **kwargs) -> DbTaskWorker:
+    """
+    Start DbTaskWorker untuk func(*args, **kwargs).
+    Worker di-parent ke `parent` (biasanya window) supaya tidak di-GC
+    sebelum selesai, dan dihapus otomatis setelah thread berhenti.
+    """
+    worker = DbTaskWorker(func, *args, parent=parent, **kwargs)
+    if on_result:
+        worker.result_ready.connect(on_result)
+    if on_error:
+        worker.error.connect(on_error)
+    worker.finished.connect(worker.deleteLater)
+    worker.start()
+    return worker
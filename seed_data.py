@@ -0,0 +1,233 @@
+# seed_data.py — Data sintetis deterministik untuk load test dan benchmark
+"""
+Isi database dengan user, penerbit, artikel, like/bookmark, dan view palsu.
+Nama dan password tetap, jadi load_test.py bisa login sebagai mereka:
+
+    user0001..userNNNN      role user      password "password"
+    penerbit001..penerbitNNN role penerbit password "password"
+
+Backend:
+- sqlite   → SqliteBackend.seed_demo_data() (in-process)
+- postgres → generate_series di server; HANYA ke Postgres lokal
+             (localhost / 127.0.0.1 / ::1) kecuali allow_remote=True
+
+Pakai:
+    python seed_data.py --backend postgres --users 500 --articles 5000 --views 1000000
+    python seed_data.py --backend postgres --reset     # kosongkan tabel dulu
+"""
+
+import argparse
+import hashlib
+import os
+import time
+import urllib.parse
+from typing import Dict
+
+DEMO_PASSWORD = "password"
+LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1")
+
+# Tabel data aplikasi (urutan aman untuk TRUNCATE ... CASCADE)
+SEED_TABLES = ("article_views", "article_likes", "article_bookmarks", "user_interaction_counts",
+               "news_tombstones", "news", "user_sessions", "users")
+
+
+def demo_user(i: int) -> str:
+    return f"user{i:04d}"
+
+
+def demo_author(i: int) -> str:
+    return f"penerbit{i:03d}"
+
+
+def _demo_name_sql(prefix: str, width: int, number: str) -> str:
+    """
+    SQL untuk demo_user()/demo_author(): zero-pad minimal `width` digit
+    tanpa memotong angka yang lebih panjang (lpad saja memotong 12345 → 1234).
+    `number` harus kolom/nilai yang sudah dihitung (bukan random()).
+    """
+    return f"'{prefix}' || lpad({number}::text, GREATEST({width}, length({number}::text)), '0')"
+
+
+class RemoteDatabaseError(RuntimeError):
+    """Seeding / reset ditolak karena DATABASE_URL bukan Postgres lokal"""
+
+
+def check_local_database(allow_remote: bool = False):
+    from app_db_fixed import DATABASE_URL
+    host = urllib.parse.urlsplit(DATABASE_URL or "").hostname
+    if not allow_remote and host not in LOCAL_HOSTS:
+        raise RemoteDatabaseError(
+            f"Refusing to write synthetic data to '{host}'. "
+            "Pass --database-url for a local Postgres or --allow-remote.")
+
+
+def reset_postgres(allow_remote: bool = False) -> bool:
+    """TRUNCATE semua tabel data aplikasi (schema & migration tetap)"""
+    check_local_database(allow_remote)
+    from app_db_fixed import connect
+    conn, _ = connect()
+    if not conn:
+        return False
+    try:
+        cur = conn.cursor()
+        cur.execute(f"TRUNCATE {', '.join(SEED_TABLES)} RESTART IDENTITY CASCADE;")
+        conn.commit()
+        return True
+    except Exception as e:
+        print(f"❌ Reset failed: {e}")
+        return False
+    finally:
+        conn.close()
+
+
+def seed_postgres(users: int = 100, authors: int = 10, articles: int = 500,
+                  likes_per_user: int = 20, bookmarks_per_user: int = 5,
+                  views: int = 5000, seed: int = 42, allow_remote: bool = False) -> Dict[str, int]:
+    """
+    Seed Postgres dengan generate_series (data dibuat di server, bukan dikirim
+    baris per baris). View di-insert dengan trigger counter dimatikan lalu
+    news.views dihitung sekali, supaya 10 juta baris tetap masuk akal waktunya.
+    Returns jumlah baris per tabel.
+    """
+    check_local_database(allow_remote)
+    from app_db_fixed import connect
+    conn, _ = connect(deadline=30.0)
+    if not conn:
+        return {}
+    password = hashlib.sha256(DEMO_PASSWORD.encode()).hexdigest()
+    try:
+        cur = conn.cursor()
+        # Deterministik per koneksi: random() mengikuti setseed
+        cur.execute("SELECT setseed(%s);", ((seed % 1000) / 1000.0,))
+        cur.execute(f"""
+            INSERT INTO users (username, password, role)
+            SELECT {_demo_name_sql('user', 4, 'i')}, %s, 'user' FROM generate_series(1, %s) i
+            ON CONFLICT (username) DO NOTHING;
+        """, (password, users))
+        cur.execute(f"""
+            INSERT INTO users (username, password, role)
+            SELECT {_demo_name_sql('penerbit', 3, 'i')}, %s, 'penerbit' FROM generate_series(1, %s) i
+            ON CONFLICT (username) DO NOTHING;
+        """, (password, authors))
+        cur.execute(f"""
+            INSERT INTO news (title, content, author, status, created_at)
+            SELECT 'Crypto market update #' || a.i,
+                   repeat('Demo article ' || a.i || '. ', 20),
+                   {_demo_name_sql('penerbit', 3, 'a.author_no')},
+                   CASE WHEN random() < 0.9 THEN 'published' ELSE 'draft' END,
+                   NOW() - random() * INTERVAL '30 days'
+            FROM (
+                SELECT i, (1 + floor(random() * %s))::int AS author_no
+                FROM generate_series(1, %s) i
+            ) a;
+        """, (authors, articles))
+        cur.execute("SELECT MIN(id), MAX(id) FROM news;")
+        min_id, max_id = cur.fetchone()
+        span = (max_id or 0) - (min_id or 0) + 1
+
+        for table, per_user in (("article_likes", likes_per_user), ("article_bookmarks", bookmarks_per_user)):
+            cur.execute(f"""
+                INSERT INTO {table} (article_id, user_id, username)
+                SELECT n.id, p.user_id, p.username
+                FROM (
+                    SELECT u.id AS user_id, u.username, (%s + floor(random() * %s))::int AS article_id
+                    FROM users u, generate_series(1, %s)
+                    WHERE u.role = 'user'
+                ) p
+                JOIN news n ON n.id = p.article_id
+                ON CONFLICT (article_id, user_id) DO NOTHING;
+            """, (min_id or 0, span, per_user))
+
+        cur.execute("ALTER TABLE article_views DISABLE TRIGGER trg_article_views_update;")
+        # user_id + username diisi langsung (trigger sync 008 tidak perlu lookup)
+        cur.execute(f"""
+            INSERT INTO article_views (article_id, user_id, username, viewed_at)
+            SELECT v.article_id, u.id, u.username, v.viewed_at
+            FROM (
+                SELECT %s + floor(random() * %s)::int AS article_id,
+                       (1 + floor(random() * %s))::int AS user_no,
+                       NOW() - random() * INTERVAL '30 days' AS viewed_at
+                FROM generate_series(1, %s)
+            ) v
+            LEFT JOIN users u ON u.username = {_demo_name_sql('user', 4, 'v.user_no')};
+        """, (min_id or 0, span, users, views))
+        cur.execute("ALTER TABLE article_views ENABLE TRIGGER trg_article_views_update;")
+        cur.execute("""
+            UPDATE news n SET views = v.total
+            FROM (SELECT article_id, COUNT(*) AS total FROM article_views GROUP BY article_id) v
+            WHERE v.article_id = n.id;
+        """)
+        conn.commit()
+
+        counts = {}
+        for table in ("users", "news", "article_likes", "article_bookmarks", "article_views"):
+            cur.execute(f"SELECT COUNT(*) FROM {table};")
+            counts[table] = cur.fetchone()[0]
+        # Statistik planner sesuai data baru
+        conn.autocommit = True
+        cur.execute("ANALYZE;")
+        return counts
+    except Exception as e:
+        conn.rollback()
+        print(f"❌ Seeding failed: {e}")
+        return {}
+    finally:
+        conn.close()
+
+
+def seed(backend: str = None, **kwargs) -> Dict[str, int]:
+    """Seed backend terpilih ([storage] BACKEND kalau tidak diisi)"""
+    from storage_backend import get_backend, configured_backend_name
+    backend = backend or configured_backend_name()
+    if backend == "sqlite":
+        kwargs.pop("allow_remote", None)
+        return get_backend("sqlite").seed_demo_data(**kwargs)
+    return seed_postgres(**kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed Crypto Insight with synthetic data")
+    parser.add_argument("--backend", choices=("postgres", "sqlite"), default="postgres")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--authors", type=int, default=10)
+    parser.add_argument("--articles", type=int, default=500)
+    parser.add_argument("--likes-per-user", type=int, default=20)
+    parser.add_argument("--bookmarks-per-user", type=int, default=5)
+    parser.add_argument("--views", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--database-url", help="Postgres tujuan (menimpa config.ini)")
+    parser.add_argument("--reset", action="store_true", help="TRUNCATE tabel data dulu (Postgres)")
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="Izinkan menulis ke Postgres non-lokal (hati-hati!)")
+    args = parser.parse_args()
+
+    os.environ["CRYPTO_INSIGHT_BACKEND"] = args.backend
+    os.environ["CRYPTO_INSIGHT_TRANSPORT"] = "direct"
+    if args.database_url:
+        os.environ["CRYPTO_INSIGHT_DATABASE_URL"] = args.database_url
+
+    try:
+        if args.backend == "postgres":
+            check_local_database(args.allow_remote)
+            from app_db_fixed import setup_database
+            if not setup_database():
+                print("❌ Schema not ready")
+                return 1
+            if args.reset and not reset_postgres(args.allow_remote):
+                return 1
+
+        started = time.perf_counter()
+        counts = seed(args.backend, users=args.users, authors=args.authors, articles=args.articles,
+                      likes_per_user=args.likes_per_user, bookmarks_per_user=args.bookmarks_per_user,
+                      views=args.views, seed=args.seed, allow_remote=args.allow_remote)
+    except RemoteDatabaseError as e:
+        print(f"❌ {e}")
+        return 1
+    if not counts:
+        return 1
+    print(f"✅ Seeded in {time.perf_counter() - started:.1f}s: {counts}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,617 @@
+# sqlite_backend.py — StorageBackend in-process dengan sqlite3
+"""
+Implementasi StorageBackend (storage_backend.py) tanpa server database:
+schema, trigger counter, dan format hasil mengikuti migrations/*.sql dan
+helper app_db_*, jadi UI, load test, dan benchmark bisa jalan di mesin
+Linux tanpa Postgres.
+
+- SQLITE_PATH = :memory: (default) → database hilang saat proses selesai
+- Satu koneksi dibagi semua thread, di-serialize dengan lock (sqlite3 tidak
+  punya pool; worker Qt dan thread gateway tetap aman)
+- Timestamp disimpan sebagai teks ISO UTC ('YYYY-MM-DDTHH:MM:SS.fff')
+- Error sqlite3 → default helper yang sama (gateway_protocol.OPERATIONS)
+
+Isi data contoh untuk benchmark:
+    backend = SqliteBackend(":memory:")
+    backend.seed_demo_data(users=200, articles=1000)
+"""
+
+import functools
+import hashlib
+import random
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import gateway_protocol as protocol
+from storage_backend import StorageBackend
+
+_NOW = "strftime('%Y-%m-%dT%H:%M:%f', 'now')"
+
+
+def _display(column: str) -> str:
+    """Format to_char(... 'YYYY-MM-DD HH24:MI UTC') versi SQLite"""
+    return f"substr({column}, 1, 10) || ' ' || substr({column}, 12, 5) || ' UTC'"
+
+
+_SCHEMA = f"""
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT UNIQUE NOT NULL,
+        password TEXT NOT NULL,
+        role TEXT DEFAULT 'user'
+    );
+
+    CREATE TABLE IF NOT EXISTS user_sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL,
+        started_at TEXT NOT NULL DEFAULT ({_NOW}),
+        last_seen TEXT NOT NULL DEFAULT ({_NOW}),
+        status TEXT NOT NULL DEFAULT 'online'
+    );
+    CREATE INDEX IF NOT EXISTS idx_user_sessions_username ON user_sessions (username, last_seen);
+
+    CREATE TABLE IF NOT EXISTS news (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        title TEXT NOT NULL,
+        content TEXT NOT NULL,
+        author TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'draft',
+        created_at TEXT NOT NULL DEFAULT ({_NOW}),
+        updated_at TEXT NOT NULL DEFAULT ({_NOW}),
+        views INTEGER NOT NULL DEFAULT 0,
+        like_count INTEGER NOT NULL DEFAULT 0,
+        bookmark_count INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_news_author_status ON news (author, status);
+    CREATE INDEX IF NOT EXISTS idx_news_status_created ON news (status, created_at DESC);
+    CREATE INDEX IF NOT EXISTS idx_news_updated_at ON news (updated_at, id);
+
+    CREATE TABLE IF NOT EXISTS news_tombstones (
+        id INTEGER PRIMARY KEY,
+        deleted_at TEXT NOT NULL DEFAULT ({_NOW})
+    );
+
+    CREATE TABLE IF NOT EXISTS article_likes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        article_id INTEGER NOT NULL REFERENCES news(id) ON DELETE CASCADE,
+        username TEXT NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+        liked_at TEXT DEFAULT ({_NOW}),
+        UNIQUE (article_id, username)
+    );
+    CREATE INDEX IF NOT EXISTS idx_article_likes_user ON article_likes (username, liked_at);
+
+    CREATE TABLE IF NOT EXISTS article_bookmarks (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        article_id INTEGER NOT NULL REFERENCES news(id) ON DELETE CASCADE,
+        username TEXT NOT NULL REFERENCES users(username) ON DELETE CASCADE,
+        bookmarked_at TEXT DEFAULT ({_NOW}),
+        UNIQUE (article_id, username)
+    );
+    CREATE INDEX IF NOT EXISTS idx_bookmarks_user ON article_bookmarks (username, bookmarked_at);
+
+    CREATE TABLE IF NOT EXISTS article_views (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        article_id INTEGER NOT NULL REFERENCES news(id) ON DELETE CASCADE,
+        username TEXT REFERENCES users(username) ON DELETE SET NULL,
+        viewed_at TEXT DEFAULT ({_NOW}),
+        ip_address TEXT DEFAULT '0.0.0.0'
+    );
+
+    CREATE TABLE IF NOT EXISTS user_interaction_counts (
+        username TEXT PRIMARY KEY REFERENCES users(username) ON DELETE CASCADE,
+        liked_count INTEGER NOT NULL DEFAULT 0,
+        bookmarked_count INTEGER NOT NULL DEFAULT 0,
+        updated_at TEXT NOT NULL DEFAULT ({_NOW})
+    );
+
+    -- Counter (migrations/002, 005, 007)
+    CREATE TRIGGER IF NOT EXISTS trg_article_likes_insert AFTER INSERT ON article_likes BEGIN
+        UPDATE news SET like_count = like_count + 1 WHERE id = NEW.article_id;
+        INSERT INTO user_interaction_counts (username, liked_count, updated_at)
+        VALUES (NEW.username, 1, {_NOW})
+        ON CONFLICT (username) DO UPDATE
+        SET liked_count = liked_count + 1, updated_at = excluded.updated_at;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_article_likes_delete AFTER DELETE ON article_likes BEGIN
+        UPDATE news SET like_count = MAX(like_count - 1, 0) WHERE id = OLD.article_id;
+        UPDATE user_interaction_counts
+        SET liked_count = MAX(liked_count - 1, 0), updated_at = {_NOW}
+        WHERE username = OLD.username;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_article_bookmarks_insert AFTER INSERT ON article_bookmarks BEGIN
+        UPDATE news SET bookmark_count = bookmark_count + 1 WHERE id = NEW.article_id;
+        INSERT INTO user_interaction_counts (username, bookmarked_count, updated_at)
+        VALUES (NEW.username, 1, {_NOW})
+        ON CONFLICT (username) DO UPDATE
+        SET bookmarked_count = bookmarked_count + 1, updated_at = excluded.updated_at;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_article_bookmarks_delete AFTER DELETE ON article_bookmarks BEGIN
+        UPDATE news SET bookmark_count = MAX(bookmark_count - 1, 0) WHERE id = OLD.article_id;
+        UPDATE user_interaction_counts
+        SET bookmarked_count = MAX(bookmarked_count - 1, 0), updated_at = {_NOW}
+        WHERE username = OLD.username;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_article_views_insert AFTER INSERT ON article_views BEGIN
+        UPDATE news SET views = views + 1 WHERE id = NEW.article_id;
+    END;
+    -- Counter (views/like_count/bookmark_count) tidak menggeser updated_at
+    DROP TRIGGER IF EXISTS trg_news_touch_updated_at;
+    CREATE TRIGGER trg_news_touch_updated_at
+    AFTER UPDATE OF title, content, author, status ON news
+    WHEN NEW.updated_at = OLD.updated_at BEGIN
+        UPDATE news SET updated_at = {_NOW} WHERE id = NEW.id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_news_tombstone AFTER DELETE ON news BEGIN
+        INSERT OR REPLACE INTO news_tombstones (id, deleted_at) VALUES (OLD.id, {_NOW});
+    END;
+"""
+
+
+def _hash(password: str) -> str:
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def _guarded(method):
+    """Serialize lewat lock backend; sqlite3.Error → default helper"""
+    name = method.__name__
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                print(f"❌ SQLite error in {name}: {e}")
+                return protocol.OPERATIONS[name].default()
+    return wrapper
+
+
+class SqliteBackend(StorageBackend):
+    """StorageBackend di atas satu koneksi sqlite3"""
+
+    name = "sqlite"
+
+    def __init__(self, path: str = ":memory:"):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA foreign_keys = ON;")
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode = WAL;")
+            self._conn.execute("PRAGMA synchronous = NORMAL;")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def _query(self, sql: str, params=()) -> List[tuple]:
+        return self._conn.execute(sql, params).fetchall()
+
+    def _one(self, sql: str, params=()) -> Optional[tuple]:
+        return self._conn.execute(sql, params).fetchone()
+
+    def _write(self, sql: str, params=()) -> sqlite3.Cursor:
+        with self._conn:
+            return self._conn.execute(sql, params)
+
+    # ---------- Lifecycle ----------
+
+    def ensure_schema(self) -> bool:
+        return True
+
+    @_guarded
+    def health_check(self) -> bool:
+        return self._one("SELECT 1") is not None
+
+    def warm_pool(self, connections: int = 2) -> int:
+        return 1
+
+    def close_pool(self):
+        # :memory: harus tetap hidup selama proses; file cukup di-checkpoint
+        if self.path != ":memory:":
+            with self._lock:
+                self._conn.execute("PRAGMA wal_checkpoint(PASSIVE);")
+
+    # ---------- Users ----------
+
+    @_guarded
+    def user_exists(self, username: str) -> bool:
+        if not username:
+            return False
+        return self._one("SELECT 1 FROM users WHERE username = ?", (username,)) is not None
+
+    @_guarded
+    def create_user(self, username: str, password: str, role: str = "user") -> bool:
+        if not username or not password:
+            print("❌ Username and password are required")
+            return False
+        self._write("INSERT OR IGNORE INTO users (username, password, role) VALUES (?, ?, ?)",
+                    (username, _hash(password), role))
+        return True
+
+    @_guarded
+    def verify_user(self, username: str, password: str) -> Optional[str]:
+        if not username or not password:
+            return None
+        row = self._one("SELECT role FROM users WHERE username = ? AND password = ?",
+                        (username, _hash(password)))
+        return row[0] if row else None
+
+    @_guarded
+    def login(self, username: str, password: str) -> Tuple[Optional[str], Optional[int], str]:
+        from app_db_fixed import AUTH_INVALID_INPUT, AUTH_UNKNOWN_USER, AUTH_WRONG_PASSWORD
+        if not username or not password:
+            return None, None, AUTH_INVALID_INPUT
+        row = self._one("SELECT COALESCE(role, 'user'), password FROM users WHERE username = ?", (username,))
+        if row is None:
+            return None, None, AUTH_UNKNOWN_USER
+        if row[1] != _hash(password):
+            return None, None, AUTH_WRONG_PASSWORD
+        sid = self._write("INSERT INTO user_sessions (username, status) VALUES (?, 'online')",
+                          (username,)).lastrowid
+        return row[0], sid, ""
+
+    @_guarded
+    def register(self, username: str, password: str, role: str = "user",
+                 open_session: bool = True) -> Tuple[Optional[str], Optional[int], str]:
+        from app_db_fixed import AUTH_INVALID_INPUT, AUTH_USERNAME_TAKEN
+        if not username or not password:
+            return None, None, AUTH_INVALID_INPUT
+        with self._conn:
+            created = self._conn.execute(
+                "INSERT OR IGNORE INTO users (username, password, role) VALUES (?, ?, ?)",
+                (username, _hash(password), role)).rowcount
+            if not created:
+                return None, None, AUTH_USERNAME_TAKEN
+            sid = None
+            if open_session:
+                sid = self._conn.execute(
+                    "INSERT INTO user_sessions (username, status) VALUES (?, 'online')",
+                    (username,)).lastrowid
+        return role, sid, ""
+
+    # ---------- Sessions ----------
+
+    @_guarded
+    def start_session(self, username: str) -> Optional[int]:
+        if not username:
+            return None
+        return self._write("INSERT INTO user_sessions (username, status) VALUES (?, 'online')",
+                           (username,)).lastrowid
+
+    @_guarded
+    def heartbeat(self, session_id: int) -> bool:
+        if not session_id:
+            return False
+        self._write(f"UPDATE user_sessions SET last_seen = {_NOW} WHERE id = ?", (session_id,))
+        return True
+
+    @_guarded
+    def end_session(self, session_id: int) -> bool:
+        if not session_id:
+            return False
+        self._write(f"UPDATE user_sessions SET status = 'offline', last_seen = {_NOW} WHERE id = ?",
+                    (session_id,))
+        return True
+
+    @_guarded
+    def latest_presence_per_user(self) -> List[tuple]:
+        from app_db_fixed import ONLINE_WINDOW_SECONDS
+        rows = self._query(f"""
+            WITH latest AS (
+                SELECT username, MAX(last_seen) AS ls FROM user_sessions GROUP BY username
+            )
+            SELECT l.username,
+                   COALESCE(u.role, 'user'),
+                   EXISTS (
+                       SELECT 1 FROM user_sessions s
+                       WHERE s.username = l.username AND s.last_seen = l.ls
+                         AND s.status = 'online'
+                         AND s.last_seen > strftime('%Y-%m-%dT%H:%M:%f', 'now', ?)
+                   ),
+                   substr(l.ls, 1, 10) || ' ' || substr(l.ls, 12, 8) || ' UTC'
+            FROM latest l
+            LEFT JOIN users u ON u.username = l.username
+            ORDER BY l.username
+        """, (f"-{ONLINE_WINDOW_SECONDS} seconds",))
+        return [(r[0], r[1], bool(r[2]), r[3]) for r in rows]
+
+    # ---------- News ----------
+
+    @_guarded
+    def create_news(self, author: str, title: str, content: str, publish: bool = True) -> bool:
+        if not author or not title or not content:
+            return False
+        self._write("INSERT INTO news (title, content, author, status) VALUES (?, ?, ?, ?)",
+                    (title, content, author, 'published' if publish else 'draft'))
+        return True
+
+    @_guarded
+    def list_my_news(self, author: str, limit: int = 50) -> List[tuple]:
+        if not author:
+            return []
+        return self._query(f"""
+            SELECT id, title, status, {_display('created_at')}
+            FROM news WHERE author = ?
+            ORDER BY created_at DESC LIMIT ?
+        """, (author, limit))
+
+    @_guarded
+    def get_author_summary(self, author: str) -> dict:
+        summary = protocol.OPERATIONS["get_author_summary"].default()
+        if not author:
+            return summary
+        for status, count, views, likes, bookmarks in self._query("""
+            SELECT status, COUNT(*), COALESCE(SUM(views), 0),
+                   COALESCE(SUM(like_count), 0), COALESCE(SUM(bookmark_count), 0)
+            FROM news WHERE author = ? GROUP BY status
+        """, (author,)):
+            summary['by_status'][status] = count
+            summary['total'] += count
+            summary['views'] += views
+            summary['likes'] += likes
+            summary['bookmarks'] += bookmarks
+        summary['published'] = summary['by_status'].get('published', 0)
+        summary['draft'] = summary['total'] - summary['published']
+        return summary
+
+    @_guarded
+    def list_published_news(self, limit: int = 50) -> List[tuple]:
+        return self._query(f"""
+            SELECT id, title, author, {_display('created_at')}
+            FROM news WHERE status = 'published'
+            ORDER BY created_at DESC LIMIT ?
+        """, (limit,))
+
+    _FEED_COLUMNS = f"id, title, author, views, like_count, bookmark_count, {_display('created_at')}"
+
+    @_guarded
+    def get_trending_articles(self, limit: int = 10, days: int = 7) -> List[Tuple]:
+        return self._query(f"""
+            SELECT {self._FEED_COLUMNS} FROM news
+            WHERE status = 'published'
+              AND created_at > strftime('%Y-%m-%dT%H:%M:%f', 'now', ?)
+            ORDER BY views DESC, like_count DESC LIMIT ?
+        """, (f"-{int(days)} days", limit))
+
+    @_guarded
+    def get_popular_articles(self, limit: int = 10) -> List[Tuple]:
+        return self._query(f"""
+            SELECT {self._FEED_COLUMNS} FROM news WHERE status = 'published'
+            ORDER BY views DESC, like_count DESC LIMIT ?
+        """, (limit,))
+
+    @_guarded
+    def get_most_liked_articles(self, limit: int = 10) -> List[Tuple]:
+        return self._query(f"""
+            SELECT {self._FEED_COLUMNS} FROM news WHERE status = 'published'
+            ORDER BY like_count DESC, views DESC LIMIT ?
+        """, (limit,))
+
+    @_guarded
+    def get_penerbit_stats(self, author: str) -> Dict[str, int]:
+        row = self._one("""
+            SELECT COUNT(*), COALESCE(SUM(views), 0), COALESCE(SUM(like_count), 0),
+                   COALESCE(SUM(bookmark_count), 0), COALESCE(AVG(views), 0), COALESCE(AVG(like_count), 0)
+            FROM news WHERE author = ? AND status = 'published'
+        """, (author,))
+        return {
+            'total_articles': row[0],
+            'total_views': row[1],
+            'total_likes': row[2],
+            'total_bookmarks': row[3],
+            'avg_views': round(float(row[4]), 1),
+            'avg_likes': round(float(row[5]), 1),
+        }
+
+    @_guarded
+    def get_news_changes(self, since: Optional[str] = None, after_id: int = 0,
+                         limit: int = 500) -> Optional[Dict]:
+        since = since or "1970-01-01T00:00:00"
+        rows = self._query("""
+            SELECT id, title, author, status, views, like_count, bookmark_count, created_at, updated_at
+            FROM news
+            WHERE updated_at > ? OR (updated_at = ? AND id > ?)
+            ORDER BY updated_at, id LIMIT ?
+        """, (since, since, after_id, limit))
+        deleted = []
+        if after_id == 0:
+            deleted = [r[0] for r in self._query(
+                "SELECT id FROM news_tombstones WHERE deleted_at > ?", (since,))]
+        return {'rows': rows, 'deleted': deleted}
+
+    @_guarded
+    def get_news_counters(self, after_id: int = 0, limit: int = 5000) -> Optional[List[Tuple]]:
+        return self._query("""
+            SELECT id, views, like_count, bookmark_count FROM news
+            WHERE status = 'published' AND id > ?
+            ORDER BY id LIMIT ?
+        """, (after_id, limit))
+
+    # ---------- Interactions ----------
+
+    def _insert_interaction(self, table: str, article_id: int, username: str) -> bool:
+        return self._write(f"INSERT OR IGNORE INTO {table} (article_id, username) VALUES (?, ?)",
+                           (article_id, username)).rowcount > 0
+
+    def _delete_interaction(self, table: str, article_id: int, username: str) -> bool:
+        return self._write(f"DELETE FROM {table} WHERE article_id = ? AND username = ?",
+                           (article_id, username)).rowcount > 0
+
+    def _has_interaction(self, table: str, article_id: int, username: str) -> bool:
+        return self._one(f"SELECT 1 FROM {table} WHERE article_id = ? AND username = ?",
+                         (article_id, username)) is not None
+
+    def _news_column(self, column: str, article_id: int) -> int:
+        row = self._one(f"SELECT {column} FROM news WHERE id = ?", (article_id,))
+        return row[0] if row else 0
+
+    @_guarded
+    def like_article(self, article_id: int, username: str) -> bool:
+        return self._insert_interaction("article_likes", article_id, username)
+
+    @_guarded
+    def unlike_article(self, article_id: int, username: str) -> bool:
+        return self._delete_interaction("article_likes", article_id, username)
+
+    @_guarded
+    def is_article_liked(self, article_id: int, username: str) -> bool:
+        return self._has_interaction("article_likes", article_id, username)
+
+    @_guarded
+    def get_article_likes_count(self, article_id: int) -> int:
+        return self._news_column("like_count", article_id)
+
+    @_guarded
+    def get_user_liked_articles(self, username: str, limit: int = 50) -> List[Tuple]:
+        return self._query(f"""
+            SELECT n.id, n.title, n.author, n.like_count, {_display('al.liked_at')}
+            FROM article_likes al JOIN news n ON al.article_id = n.id
+            WHERE al.username = ? AND n.status = 'published'
+            ORDER BY al.liked_at DESC LIMIT ?
+        """, (username, limit))
+
+    @_guarded
+    def get_article_likers(self, article_id: int, limit: int = 50) -> List[Tuple]:
+        return self._query(f"""
+            SELECT username, {_display('liked_at')} FROM article_likes
+            WHERE article_id = ? ORDER BY liked_at DESC LIMIT ?
+        """, (article_id, limit))
+
+    @_guarded
+    def bookmark_article(self, article_id: int, username: str) -> bool:
+        return self._insert_interaction("article_bookmarks", article_id, username)
+
+    @_guarded
+    def unbookmark_article(self, article_id: int, username: str) -> bool:
+        return self._delete_interaction("article_bookmarks", article_id, username)
+
+    @_guarded
+    def is_article_bookmarked(self, article_id: int, username: str) -> bool:
+        return self._has_interaction("article_bookmarks", article_id, username)
+
+    @_guarded
+    def get_article_bookmarks_count(self, article_id: int) -> int:
+        return self._news_column("bookmark_count", article_id)
+
+    @_guarded
+    def get_user_bookmarked_articles(self, username: str, limit: int = 50) -> List[Tuple]:
+        return self._query(f"""
+            SELECT n.id, n.title, n.author, n.bookmark_count, {_display('ab.bookmarked_at')}
+            FROM article_bookmarks ab JOIN news n ON ab.article_id = n.id
+            WHERE ab.username = ? AND n.status = 'published'
+            ORDER BY ab.bookmarked_at DESC LIMIT ?
+        """, (username, limit))
+
+    @_guarded
+    def track_article_view(self, article_id: int, username: Optional[str] = None,
+                           ip_address: str = "0.0.0.0") -> bool:
+        self._write("INSERT INTO article_views (article_id, username, ip_address) VALUES (?, ?, ?)",
+                    (article_id, username, ip_address))
+        return True
+
+    @_guarded
+    def get_article_views(self, article_id: int) -> int:
+        return self._news_column("views", article_id)
+
+    @_guarded
+    def get_article_stats(self, article_id: int) -> Dict[str, int]:
+        row = self._one("SELECT views, like_count, bookmark_count FROM news WHERE id = ?", (article_id,))
+        if not row:
+            return protocol.OPERATIONS["get_article_stats"].default()
+        return {'views': row[0], 'likes': row[1], 'bookmarks': row[2]}
+
+    def get_engagement_rate(self, article_id: int) -> float:
+        from app_db_interactions import _engagement_rate
+        stats = self.get_article_stats(article_id)
+        return _engagement_rate(stats['views'], stats['likes'], stats['bookmarks'])
+
+    @_guarded
+    def get_article_full_info(self, article_id: int, username: Optional[str] = None) -> Optional[Dict]:
+        from app_db_interactions import _article_full_info_from_row
+        row = self._one(f"""
+            SELECT n.id, n.title, n.content, n.author, {_display('n.created_at')},
+                   n.views, n.like_count, n.bookmark_count,
+                   EXISTS (SELECT 1 FROM article_likes l WHERE l.article_id = n.id AND l.username = ?),
+                   EXISTS (SELECT 1 FROM article_bookmarks b WHERE b.article_id = n.id AND b.username = ?)
+            FROM news n WHERE n.id = ? AND n.status = 'published'
+        """, (username, username, article_id))
+        if row:
+            row = row[:8] + (bool(row[8]), bool(row[9]))
+        return _article_full_info_from_row(row, username)
+
+    @_guarded
+    def get_user_interaction_summary(self, username: str) -> Dict[str, int]:
+        row = self._one("""
+            SELECT liked_count, bookmarked_count FROM user_interaction_counts WHERE username = ?
+        """, (username,))
+        liked, bookmarked = row if row else (0, 0)
+        return {'liked': liked, 'bookmarked': bookmarked}
+
+    @_guarded
+    def get_user_interaction_ids(self, username: str) -> Optional[Dict[str, Set[int]]]:
+        ids = {'liked': set(), 'bookmarked': set()}
+        for kind, article_id in self._query("""
+            SELECT 'liked', article_id FROM article_likes WHERE username = ?
+            UNION ALL
+            SELECT 'bookmarked', article_id FROM article_bookmarks WHERE username = ?
+        """, (username, username)):
+            ids[kind].add(article_id)
+        return ids
+
+    @_guarded
+    def get_user_interaction_changes(self, username: str, since: Optional[str] = None) -> Optional[Dict]:
+        row = self._one("SELECT updated_at FROM user_interaction_counts WHERE username = ?", (username,))
+        version = row[0] if row else None
+        if since is not None and (version or '') == since:
+            return {'version': version, 'changed': False, 'liked': [], 'bookmarked': []}
+        return {
+            'version': version,
+            'changed': True,
+            'liked': self._query(
+                "SELECT article_id, liked_at FROM article_likes WHERE username = ?", (username,)),
+            'bookmarked': self._query(
+                "SELECT article_id, bookmarked_at FROM article_bookmarks WHERE username = ?", (username,)),
+        }
+
+    # ---------- Data contoh ----------
+
+    def seed_demo_data(self, users: int = 100, authors: int = 10, articles: int = 500,
+                       likes_per_user: int = 20, bookmarks_per_user: int = 5,
+                       views: int = 5000, seed: int = 42) -> Dict[str, int]:
+        """
+        Isi data sintetis yang deterministik (seed sama → data sama).
+        User: user0001.. (password "password"), author: penerbit001.. (role penerbit).
+        Returns jumlah baris per tabel.
+        """
+        rng = random.Random(seed)
+        user_names = [f"user{i:04d}" for i in range(1, users + 1)]
+        author_names = [f"penerbit{i:03d}" for i in range(1, authors + 1)]
+        password = _hash("password")
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO users (username, password, role) VALUES (?, ?, ?)",
+                [(u, password, "user") for u in user_names]
+                + [(a, password, "penerbit") for a in author_names])
+            self._conn.executemany(f"""
+                INSERT INTO news (title, content, author, status, created_at)
+                VALUES (?, ?, ?, ?, strftime('%Y-%m-%dT%H:%M:%f', 'now', ?))
+            """, [(f"Crypto market update #{i}", f"Demo article {i}. " * 20,
+                   rng.choice(author_names),
+                   "published" if rng.random() < 0.9 else "draft",
+                   f"-{rng.randint(0, 30 * 24 * 60)} minutes")
+                  for i in range(1, articles + 1)])
+            article_ids = [r[0] for r in self._conn.execute("SELECT id FROM news")]
+            for user in user_names:
+                picks = rng.sample(article_ids, min(len(article_ids), likes_per_user + bookmarks_per_user))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO article_likes (article_id, username) VALUES (?, ?)",
+                    [(a, user) for a in picks[:likes_per_user]])
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO article_bookmarks (article_id, username) VALUES (?, ?)",
+                    [(a, user) for a in picks[likes_per_user:]])
+            self._conn.executemany(
+                "INSERT INTO article_views (article_id, username) VALUES (?, ?)",
+                [(rng.choice(article_ids), rng.choice(user_names)) for _ in range(views)])
+            return {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                    for table in ("users", "news", "article_likes", "article_bookmarks", "article_views")}
@@ -0,0 +1,355 @@
+# startup_profiler.py — Profiler fase startup + breakdown waktu import
+"""
+Profiler bawaan untuk cold start aplikasi desktop. Mati secara default
+(semua fungsi no-op murah). Nyalakan dengan salah satu:
+
+    CRYPTO_INSIGHT_PROFILE_STARTUP=1 python main.py
+    CRYPTO_INSIGHT_PROFILE_STARTUP=startup.json python main.py   # + laporan JSON
+    python main.py --profile-startup[=startup.json]
+
+Yang dicatat (detik sejak proses mulai):
+- fase: interpreter start, imports, config load, db warm-up, schema check,
+  dashboard imports, splash, auth window construction, login, dashboard
+  construction, first paint & first data paint
+- waktu import per modul (self = tanpa sub-import, cumulative = dengan),
+  termasuk import di background thread (modul dashboard saat splash)
+
+Laporan dicetak sekali, begitu dashboard menampilkan data pertama kali
+(finish()), atau saat aplikasi keluar kalau belum sempat login.
+
+Dipakai dari kode aplikasi:
+    startup_profiler.begin("splash") ... startup_profiler.end("splash")
+    with startup_profiler.phase("auth window construction"): ...
+    @startup_profiler.timed("config load")
+    startup_profiler.watch_first_paint(window, "dashboard", ready=lambda: ...)
+"""
+
+import atexit
+import contextlib
+import functools
+import importlib.abc
+import json
+import os
+import sys
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+ENV_VAR = "CRYPTO_INSIGHT_PROFILE_STARTUP"
+FLAG = "--profile-startup"
+TOP_IMPORTS = 25
+
+_origin = time.perf_counter()
+_enabled = False
+_report_path: Optional[str] = None
+_reported = False
+_lock = threading.Lock()
+_spans: List[dict] = []            # {name, start, end, thread}
+_open: Dict[str, float] = {}       # begin() tanpa end()
+_imports: List[dict] = []          # {module, self, cumulative, start, parent, thread}
+_import_timer: Optional["_ImportTimer"] = None
+_paint_watchers = []
+
+
+def _now() -> float:
+    return time.perf_counter() - _origin
+
+
+def _process_age() -> Optional[float]:
+    """Detik sejak proses dibuat (Linux /proc), untuk fase 'interpreter start'"""
+    try:
+        with open("/proc/self/stat") as f:
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# ============================================
+# ENABLE
+# ============================================
+
+def enabled() -> bool:
+    return _enabled
+
+
+def enable(report_path: Optional[str] = None):
+    """Nyalakan profiler (panggil sedini mungkin, sebelum import PyQt5)"""
+    global _enabled, _report_path, _import_timer
+    if _enabled:
+        return
+    _enabled = True
+    _report_path = report_path
+    age = _process_age()
+    if age is not None and age > 0:
+        # Waktu sebelum modul ini di-import: exec interpreter + site + main.py
+        _spans.append({"name": "interpreter start", "start": -age, "end": 0.0,
+                       "thread": threading.current_thread().name})
+    _import_timer = _ImportTimer()
+    sys.meta_path.insert(0, _import_timer)
+    atexit.register(finish)
+
+
+def enable_from_environment(argv: Optional[List[str]] = None) -> bool:
+    """
+    Baca CRYPTO_INSIGHT_PROFILE_STARTUP / --profile-startup[=path].
+    Flag dibuang dari argv supaya tidak diteruskan ke QApplication.
+    """
+    argv = sys.argv if argv is None else argv
+    value = os.getenv(ENV_VAR, "").strip()
+    for arg in list(argv[1:]):
+        if arg == FLAG or arg.startswith(FLAG + "="):
+            value = arg.partition("=")[2] or value or "1"
+            argv.remove(arg)
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return False
+    enable(None if value.lower() in ("1", "true", "yes", "on") else value)
+    return True
+
+
+# ============================================
+# PHASES
+# ============================================
+
+def begin(name: str):
+    if _enabled:
+        with _lock:
+            _open[name] = _now()
+
+
+def end(name: str):
+    if not _enabled:
+        return
+    with _lock:
+        start = _open.pop(name, None)
+        if start is not None:
+            _spans.append({"name": name, "start": start, "end": _now(),
+                           "thread": threading.current_thread().name})
+
+
+def mark(name: str):
+    """Titik waktu (durasi 0), mis. 'first paint'"""
+    if _enabled:
+        with _lock:
+            now = _now()
+            _spans.append({"name": name, "start": now, "end": now,
+                           "thread": threading.current_thread().name})
+
+
+@contextlib.contextmanager
+def phase(name: str):
+    if not _enabled:
+        yield
+        return
+    start = _now()
+    try:
+        yield
+    finally:
+        with _lock:
+            _spans.append({"name": name, "start": start, "end": _now(),
+                           "thread": threading.current_thread().name})
+
+
+def timed(name: str):
+    """Decorator: setiap panggilan fungsi dicatat sebagai fase `name`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def watch_first_paint(widget, name: str, ready: Optional[Callable[[], bool]] = None,
+                      finish_report: bool = False):
+    """
+    mark(name) pada paint event pertama widget (atau child-nya) — kalau ready
+    diberikan, paint pertama SETELAH ready() True (mis. kartu data sudah ada).
+    finish_report=True → cetak laporan setelahnya.
+    """
+    if not _enabled:
+        return
+    from PyQt5 import QtCore, QtWidgets
+
+    class _FirstPaint(QtCore.QObject):
+        def eventFilter(self, obj, event):
+            if (event.type() == QtCore.QEvent.Paint and obj.isWidgetType()
+                    and (obj is widget or widget.isAncestorOf(obj))
+                    and (ready is None or ready())):
+                mark(name)
+                QtWidgets.QApplication.instance().removeEventFilter(self)
+                _paint_watchers.remove(self)
+                if finish_report:
+                    # Setelah frame ini selesai digambar
+                    QtCore.QTimer.singleShot(0, finish)
+            return False
+
+    watcher = _FirstPaint()
+    _paint_watchers.append(watcher)
+    QtWidgets.QApplication.instance().installEventFilter(watcher)
+
+
+# ============================================
+# IMPORT TIMING
+# ============================================
+
+class _TimedLoader:
+    """Bungkus loader asli; exec_module diukur, atribut lain diteruskan"""
+
+    def __init__(self, loader, timer: "_ImportTimer", fullname: str):
+        self._loader = loader
+        self._timer = timer
+        self._fullname = fullname
+        self._created_at = None
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        # Extension module (PyQt5.QtCore, psycopg2._psycopg) berat di sini: dlopen + init
+        self._created_at = time.perf_counter()
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Kembalikan loader asli di modul (importlib.resources, inspect, ...)
+        module.__loader__ = self._loader
+        if getattr(module, "__spec__", None) is not None:
+            module.__spec__.loader = self._loader
+        self._timer.push(self._fullname, self._created_at)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timer.pop()
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Meta path finder yang mengukur exec_module setiap modul baru"""
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def find_spec(self, fullname, path, target=None):
+        if getattr(self._local, "finding", False):
+            return None
+        self._local.finding = True
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._local.finding = False
+        if spec.loader is None or not hasattr(spec.loader, "exec_module"):
+            return spec
+        spec.loader = _TimedLoader(spec.loader, self, fullname)
+        return spec
+
+    def _stack(self) -> list:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def push(self, fullname: str, start: Optional[float] = None):
+        # [nama, start, waktu sub-import]
+        self._stack().append([fullname, start or time.perf_counter(), 0.0])
+
+    def pop(self):
+        stack = self._stack()
+        fullname, start, children = stack.pop()
+        cumulative = time.perf_counter() - start
+        if stack:
+            stack[-1][2] += cumulative
+        with _lock:
+            _imports.append({
+                "module": fullname,
+                "self": cumulative - children,
+                "cumulative": cumulative,
+                "start": start - _origin,
+                "parent": stack[-1][0] if stack else None,
+                "thread": threading.current_thread().name,
+            })
+
+
+# ============================================
+# REPORT
+# ============================================
+
+def _phase_summary() -> List[dict]:
+    """Gabungkan span dengan nama sama (mis. config load dipanggil 3x)"""
+    merged: Dict[str, dict] = {}
+    for span in sorted(_spans, key=lambda s: s["start"]):
+        entry = merged.get(span["name"])
+        if entry is None:
+            merged[span["name"]] = dict(span, duration=span["end"] - span["start"], calls=1)
+        else:
+            entry["end"] = max(entry["end"], span["end"])
+            entry["duration"] += span["end"] - span["start"]
+            entry["calls"] += 1
+    return list(merged.values())
+
+
+def _top_level_packages() -> List[dict]:
+    """Self time dijumlah per paket teratas (PyQt5, psycopg2, modul aplikasi, ...)"""
+    totals: Dict[str, float] = {}
+    for entry in _imports:
+        root = entry["module"].split(".")[0]
+        totals[root] = totals.get(root, 0.0) + entry["self"]
+    return [{"package": k, "self": v} for k, v in sorted(totals.items(), key=lambda kv: -kv[1])]
+
+
+def report() -> dict:
+    with _lock:
+        phases = _phase_summary()
+        imports = sorted(_imports, key=lambda e: -e["self"])
+        return {
+            "total": _now(),
+            "phases": phases,
+            "imports": imports,
+            "packages": _top_level_packages(),
+            "import_total": sum(e["self"] for e in imports),
+        }
+
+
+def print_report(data: dict):
+    print()
+    print(f"⏱️ Startup profile — {data['total'] * 1000:.0f} ms since profiler start")
+    print(f"{'phase':<32}{'start ms':>10}{'end ms':>10}{'took ms':>10}  thread")
+    for p in data["phases"]:
+        calls = f" ×{p['calls']}" if p["calls"] > 1 else ""
+        print(f"{p['name'] + calls:<32}{p['start'] * 1000:>10.1f}{p['end'] * 1000:>10.1f}"
+              f"{p['duration'] * 1000:>10.1f}  {p['thread']}")
+    print(f"\n📦 Imports: {len(data['imports'])} modules, {data['import_total'] * 1000:.0f} ms total self time")
+    print(f"{'package':<32}{'self ms':>10}")
+    for pkg in data["packages"][:10]:
+        print(f"{pkg['package']:<32}{pkg['self'] * 1000:>10.1f}")
+    print(f"\n{'slowest modules':<40}{'self ms':>9}{'cum ms':>9}  imported by / thread")
+    for e in data["imports"][:TOP_IMPORTS]:
+        print(f"{e['module']:<40}{e['self'] * 1000:>9.1f}{e['cumulative'] * 1000:>9.1f}"
+              f"  {e['parent'] or '-'} / {e['thread']}")
+
+
+def finish():
+    """Cetak (dan simpan) laporan sekali; panggilan berikutnya diabaikan"""
+    global _reported
+    if not _enabled or _reported:
+        return
+    _reported = True
+    data = report()
+    print_report(data)
+    if _report_path:
+        try:
+            with open(_report_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            print(f"💾 Startup profile written to {_report_path}")
+        except OSError as e:
+            print(f"⚠️ Could not write {_report_path}: {e}")
@@ -0,0 +1,255 @@
+# storage_backend.py — Interface storage backend untuk helper app_db_*
+"""
+Helper publik app_db_fixed / app_db_interactions (login, list_published_news,
+like_article, ...) adalah satu interface: StorageBackend. Implementasinya:
+
+- PostgresBackend  fungsi asli di app_db_* (psycopg2, DATABASE_URL)
+- SqliteBackend    in-process sqlite3 (sqlite_backend.py), tanpa server —
+                   untuk benchmark UI dan load test di mesin tanpa Postgres
+
+Pilih lewat config.ini:
+
+    [storage]
+    BACKEND = sqlite
+    SQLITE_PATH = :memory:
+
+Dengan BACKEND = sqlite, app_db_* mengganti helper publiknya dengan method
+backend saat import, jadi UI tidak perlu diubah. Fungsi Postgres aslinya tetap
+terdaftar, jadi keduanya bisa dibandingkan langsung:
+
+    from storage_backend import get_backend
+    pg, lite = get_backend("postgres"), get_backend("sqlite")
+    pg.list_published_news(20); lite.list_published_news(20)
+
+Daftar operasi = gateway_protocol.OPERATIONS (default saat error juga sama).
+"""
+
+import importlib
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import gateway_protocol as protocol
+
+# Fungsi Postgres asli per nama helper (diisi app_db_* saat import)
+_postgres_functions: Dict[str, object] = {}
+_backends: Dict[str, "StorageBackend"] = {}
+_backends_lock = threading.Lock()
+
+
+class StorageBackend:
+    """
+    Interface penyimpanan. Nama, argumen, format hasil, dan default saat
+    error sama persis dengan helper app_db_* yang digantikannya.
+    """
+
+    name = ""
+
+    # ---------- Lifecycle ----------
+
+    def ensure_schema(self) -> bool:
+        raise NotImplementedError
+
+    def health_check(self) -> bool:
+        raise NotImplementedError
+
+    def warm_pool(self, connections: int = 2) -> int:
+        raise NotImplementedError
+
+    def close_pool(self):
+        raise NotImplementedError
+
+    # ---------- Users ----------
+
+    def user_exists(self, username: str) -> bool:
+        raise NotImplementedError
+
+    def create_user(self, username: str, password: str, role: str = "user") -> bool:
+        raise NotImplementedError
+
+    def verify_user(self, username: str, password: str) -> Optional[str]:
+        raise NotImplementedError
+
+    def login(self, username: str, password: str) -> Tuple[Optional[str], Optional[int], str]:
+        raise NotImplementedError
+
+    def register(self, username: str, password: str, role: str = "user",
+                 open_session: bool = True) -> Tuple[Optional[str], Optional[int], str]:
+        raise NotImplementedError
+
+    # ---------- Sessions ----------
+
+    def start_session(self, username: str) -> Optional[int]:
+        raise NotImplementedError
+
+    def heartbeat(self, session_id: int) -> bool:
+        raise NotImplementedError
+
+    def end_session(self, session_id: int) -> bool:
+        raise NotImplementedError
+
+    def latest_presence_per_user(self) -> List[tuple]:
+        raise NotImplementedError
+
+    # ---------- News ----------
+
+    def create_news(self, author: str, title: str, content: str, publish: bool = True) -> bool:
+        raise NotImplementedError
+
+    def list_my_news(self, author: str, limit: int = 50) -> List[tuple]:
+        raise NotImplementedError
+
+    def get_author_summary(self, author: str) -> dict:
+        raise NotImplementedError
+
+    def list_published_news(self, limit: int = 50) -> List[tuple]:
+        raise NotImplementedError
+
+    def get_trending_articles(self, limit: int = 10, days: int = 7) -> List[Tuple]:
+        raise NotImplementedError
+
+    def get_popular_articles(self, limit: int = 10) -> List[Tuple]:
+        raise NotImplementedError
+
+    def get_most_liked_articles(self, limit: int = 10) -> List[Tuple]:
+        raise NotImplementedError
+
+    def get_penerbit_stats(self, author: str) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def get_news_changes(self, since: Optional[str] = None, after_id: int = 0,
+                         limit: int = 500) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def get_news_counters(self, after_id: int = 0, limit: int = 5000) -> Optional[List[Tuple]]:
+        raise NotImplementedError
+
+    # ---------- Interactions ----------
+
+    def like_article(self, article_id: int, username: str) -> bool:
+        raise NotImplementedError
+
+    def unlike_article(self, article_id: int, username: str) -> bool:
+        raise NotImplementedError
+
+    def is_article_liked(self, article_id: int, username: str) -> bool:
+        raise NotImplementedError
+
+    def get_article_likes_count(self, article_id: int) -> int:
+        raise NotImplementedError
+
+    def get_user_liked_articles(self, username: str, limit: int = 50) -> List[Tuple]:
+        raise NotImplementedError
+
+    def get_article_likers(self, article_id: int, limit: int = 50) -> List[Tuple]:
+        raise NotImplementedError
+
+    def bookmark_article(self, article_id: int, username: str) -> bool:
+        raise NotImplementedError
+
+    def unbookmark_article(self, article_id: int, username: str) -> bool:
+        raise NotImplementedError
+
+    def is_article_bookmarked(self, article_id: int, username: str) -> bool:
+        raise NotImplementedError
+
+    def get_article_bookmarks_count(self, article_id: int) -> int:
+        raise NotImplementedError
+
+    def get_user_bookmarked_articles(self, username: str, limit: int = 50) -> List[Tuple]:
+        raise NotImplementedError
+
+    def track_article_view(self, article_id: int, username: Optional[str] = None,
+                           ip_address: str = "0.0.0.0") -> bool:
+        raise NotImplementedError
+
+    def get_article_views(self, article_id: int) -> int:
+        raise NotImplementedError
+
+    def get_article_stats(self, article_id: int) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def get_engagement_rate(self, article_id: int) -> float:
+        raise NotImplementedError
+
+    def get_article_full_info(self, article_id: int, username: Optional[str] = None) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def get_user_interaction_summary(self, username: str) -> Dict[str, int]:
+        raise NotImplementedError
+
+    def get_user_interaction_ids(self, username: str) -> Optional[Dict[str, Set[int]]]:
+        raise NotImplementedError
+
+    def get_user_interaction_changes(self, username: str, since: Optional[str] = None) -> Optional[Dict]:
+        raise NotImplementedError
+
+
+# Lifecycle yang bukan operasi gateway tapi tetap diganti di app_db_fixed
+_LIFECYCLE = {"warm_pool": "app_db_fixed", "close_pool": "app_db_fixed"}
+
+
+def _interface_module(name: str) -> Optional[str]:
+    op = protocol.OPERATIONS.get(name)
+    return op.module if op is not None else _LIFECYCLE.get(name)
+
+
+class PostgresBackend(StorageBackend):
+    """Delegasi ke fungsi psycopg2 asli di app_db_fixed / app_db_interactions"""
+
+    name = "postgres"
+
+    def __getattribute__(self, name):
+        if not name.startswith("_") and _interface_module(name) is not None:
+            return _postgres_function(name)
+        return super().__getattribute__(name)
+
+
+def _postgres_function(name: str):
+    if name not in _postgres_functions:
+        # Modulnya mendaftarkan diri saat di-import
+        importlib.import_module(_interface_module(name))
+    return _postgres_functions[name]
+
+
+# ============================================
+# REGISTRY
+# ============================================
+
+def register_postgres_functions(namespace: dict, module_name: str):
+    """Simpan fungsi Postgres asli modul `module_name` (dipanggil app_db_* sebelum stub dipasang)"""
+    for name in list(protocol.OPERATIONS) + list(_LIFECYCLE):
+        if _interface_module(name) == module_name and name in namespace:
+            _postgres_functions[name] = namespace[name]
+
+
+def configured_backend_name() -> str:
+    from app_db_fixed import STORAGE_SETTINGS
+    return STORAGE_SETTINGS["backend"]
+
+
+def get_backend(name: Optional[str] = None) -> StorageBackend:
+    """Backend `name` (default: [storage] BACKEND di config.ini), dibuat sekali per proses"""
+    # Import app_db_fixed di luar lock: saat di-import ia sendiri memanggil
+    # get_backend() (install_backend_functions), jadi import di dalam lock deadlock
+    from app_db_fixed import STORAGE_SETTINGS
+    name = name or STORAGE_SETTINGS["backend"]
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            if name == "postgres":
+                backend = PostgresBackend()
+            elif name == "sqlite":
+                from sqlite_backend import SqliteBackend
+                backend = SqliteBackend(STORAGE_SETTINGS["sqlite_path"])
+            else:
+                raise ValueError(f"Unknown storage backend: {name}")
+            _backends[name] = backend
+    return backend
+
+
+def install_backend_functions(namespace: dict, module_name: str, name: Optional[str] = None):
+    """Ganti helper publik modul `module_name` dengan method backend terpilih"""
+    backend = get_backend(name)
+    for op_name in list(protocol.OPERATIONS) + list(_LIFECYCLE):
+        if _interface_module(op_name) == module_name and op_name in namespace:
+            namespace[op_name] = getattr(backend, op_name)
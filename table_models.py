@@ -0,0 +1,86 @@
+# table_models.py — Model Qt ringan untuk tabel yang di-refresh berkala
+"""
+CappedTableModel: model tabel berbasis list untuk QTableView.
+- prepend_rows(): baris baru masuk di atas, baris lama terpotong di bawah
+  (max_rows), jadi refresh hanya menyentuh baris yang berubah
+- Setiap cell bisa punya warna background sendiri
+
+Dipakai admin dashboard bersama high-water mark (id terakhir yang sudah
+dimuat) supaya refresh tidak membangun ulang seluruh tabel.
+"""
+
+from PyQt5 import QtCore, QtGui
+from typing import List, Optional, Sequence
+
+
+class CappedTableModel(QtCore.QAbstractTableModel):
+    """Model read-only dengan jumlah baris maksimum"""
+
+    def __init__(self, headers: Sequence[str], max_rows: int = 500, parent=None):
+        super().__init__(parent)
+        self.headers = list(headers)
+        self.max_rows = max_rows
+        self._rows: List[list] = []
+        self._backgrounds: List[list] = []
+
+    # ---------- Qt model API ----------
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == QtCore.Qt.DisplayRole:
+            return self._rows[index.row()][index.column()]
+        if role == QtCore.Qt.BackgroundRole:
+            color = self._backgrounds[index.row()][index.column()]
+            return QtGui.QBrush(QtGui.QColor(color)) if color else None
+        return None
+
+    def headerData(self, section, orientation, role=QtCore.Qt.DisplayRole):
+        if role == QtCore.Qt.DisplayRole and orientation == QtCore.Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    # ---------- Update ----------
+
+    def prepend_rows(self, rows: Sequence[Sequence], backgrounds: Optional[Sequence[Sequence]] = None):
+        """
+        Tambah baris di atas (rows sudah urut terbaru dulu), lalu potong
+        baris terlama kalau melebihi max_rows.
+        """
+        rows = [[str(v) for v in r] for r in rows[:self.max_rows]]
+        if not rows:
+            return
+        if backgrounds is None:
+            backgrounds = [[None] * len(self.headers) for _ in rows]
+        else:
+            backgrounds = [list(b) for b in backgrounds[:len(rows)]]
+
+        overflow = len(self._rows) + len(rows) - self.max_rows
+        if overflow > 0:
+            first = len(self._rows) - overflow
+            self.beginRemoveRows(QtCore.QModelIndex(), first, len(self._rows) - 1)
+            del self._rows[first:]
+            del self._backgrounds[first:]
+            self.endRemoveRows()
+
+        self.beginInsertRows(QtCore.QModelIndex(), 0, len(rows) - 1)
+        self._rows[0:0] = rows
+        self._backgrounds[0:0] = backgrounds
+        self.endInsertRows()
+
+    def clear(self):
+        """Kosongkan model (dipakai saat full reload)"""
+        self.beginResetModel()
+        self._rows = []
+        self._backgrounds = []
+        self.endResetModel()
+
+    def row_values(self, row: int) -> List[str]:
+        """Nilai display satu baris (untuk copy ke clipboard)"""
+        return list(self._rows[row])
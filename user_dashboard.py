@@ -11,8 +11,12 @@ Version: 2.0 - Performance Optimized
 """
 
 from PyQt5 import QtWidgets, QtCore, QtGui
+from types import SimpleNamespace
 from typing import Optional, List, Tuple
 from app_db_fixed import heartbeat, end_session
+from qt_workers import run_in_background
+from db_status import OfflineBanner
+from feed_replica import FeedReplica
 from app_db_interactions import (
     get_trending_articles,
     get_popular_articles,
@@ -20,16 +24,116 @@ from app_db_interactions import (
     get_user_liked_articles,
     get_user_bookmarked_articles,
     get_user_interaction_summary,
+    get_user_interaction_ids,
     like_article,
     unlike_article,
     bookmark_article,
     unbookmark_article,
     is_article_liked,
     is_article_bookmarked,
-    track_article_view
+    track_article_view_async
 )
 
 
+# Halaman trending pertama yang di-prefetch saat login
+TRENDING_PREFETCH_LIMIT = 50
+TRENDING_DAYS = 7
+FEED_LIMIT = 50
+# Delta sync replica feed lokal (feed_replica.py)
+REPLICA_SYNC_INTERVAL_MS = 60000
+
+# Write langsung ke server, dipakai kartu kalau replica tidak tersedia
+_DIRECT_WRITES = SimpleNamespace(
+    like_article=like_article,
+    unlike_article=unlike_article,
+    bookmark_article=bookmark_article,
+    unbookmark_article=unbookmark_article,
+)
+
+
+class InteractionState:
+    """
+    Status like/bookmark user untuk semua kartu artikel (dibagi antar tab).
+    loaded=False → belum diketahui, kartu query sendiri saat diklik.
+    """
+    
+    def __init__(self):
+        self.loaded = False
+        self.liked = set()
+        self.bookmarked = set()
+    
+    def load(self, ids: dict):
+        self.liked = set(ids.get('liked', ()))
+        self.bookmarked = set(ids.get('bookmarked', ()))
+        self.loaded = True
+
+
+class DashboardPrefetch(QtCore.QObject):
+    """
+    Prefetch data dashboard di background thread, dimulai saat login
+    (sebelum widget dashboard dibangun). Tiga query jalan paralel:
+    - 'summary'  → get_user_interaction_summary
+    - 'trending' → halaman trending pertama
+    - 'states'   → ID artikel yang sudah di-like/bookmark
+    Hasil None berarti query gagal; dashboard fallback ke load biasa.
+    Kalau replica lokal sudah berisi, trending dibaca dari replica; summary
+    dan states juga, asalkan like/bookmark user ini sudah pernah di-sync.
+    """
+    
+    ready = QtCore.pyqtSignal(str, object)
+    
+    def __init__(self, username: str, replica: Optional[FeedReplica] = None, parent=None):
+        super().__init__(parent)
+        self.username = username
+        self.replica = replica
+        self.results = {}
+        self.workers = []
+    
+    def start(self):
+        tasks = {
+            'summary': (get_user_interaction_summary, (self.username,), {}),
+            'trending': (get_trending_articles, (), {'limit': TRENDING_PREFETCH_LIMIT, 'days': TRENDING_DAYS}),
+            'states': (get_user_interaction_ids, (self.username,), {}),
+        }
+        if self.replica is not None and self.replica.has_data():
+            del tasks['trending']
+            self._finish('trending', self.replica.trending(limit=TRENDING_PREFETCH_LIMIT, days=TRENDING_DAYS))
+            if self.replica.has_interactions():
+                del tasks['summary'], tasks['states']
+                self._finish('summary', self.replica.summary())
+                self._finish('states', self.replica.interaction_ids())
+        for key, (func, args, kwargs) in tasks.items():
+            self.workers.append(run_in_background(
+                func, *args,
+                on_result=lambda result, key=key: self._finish(key, result),
+                on_error=lambda message, key=key: self._finish(key, None),
+                parent=self,
+                **kwargs
+            ))
+    
+    def is_pending(self, key: str) -> bool:
+        return key not in self.results
+    
+    def attach(self, callback):
+        """Panggil callback(key, result) untuk hasil yang sudah ada dan yang akan datang"""
+        for key, result in list(self.results.items()):
+            callback(key, result)
+        self.ready.connect(callback)
+    
+    def _finish(self, key: str, result):
+        self.results[key] = result
+        self.ready.emit(key, result)
+    
+    def wait(self, msecs: int = 2000):
+        """Tunggu worker yang masih jalan (dipanggil saat dashboard ditutup)"""
+        for worker in self.workers:
+            try:
+                worker.wait(msecs)
+            except RuntimeError:
+                # Worker sudah selesai dan dihapus (deleteLater)
+                pass
+
+
 class LoadingWidget(QtWidgets.QWidget):
     """Simple loading indicator"""
     
@@ -59,7 +163,8 @@ class ArticleCardCompact(QtWidgets.QFrame):
     
     def __init__(self, article_id: int, title: str, author: str, 
                  username: str, views: int = 0, likes: int = 0, 
-                 bookmarks: int = 0, parent=None):
+                 bookmarks: int = 0, states: Optional[InteractionState] = None,
+                 replica: Optional[FeedReplica] = None, parent=None):
         super().__init__(parent)
         self.article_id = article_id
         self.title = title
@@ -68,17 +173,27 @@ class ArticleCardCompact(QtWidgets.QFrame):
         self.views = views
         self.likes = likes
         self.bookmarks = bookmarks
+        # Write lewat replica: tetap jalan (diantrekan) saat offline
+        self.replica = replica
         
-        # OPTIMIZATION: Jangan query like/bookmark status di __init__
-        # Nanti di-load on-demand saat user interact
+        # OPTIMIZATION: Jangan query like/bookmark status di __init__.
+        # Pakai status hasil prefetch kalau ada, kalau tidak di-load
+        # on-demand saat user interact
+        self.states = states
         self.is_liked = False
         self.is_bookmarked = False
         self.status_loaded = False
+        if states is not None and states.loaded:
+            self.is_liked = article_id in states.liked
+            self.is_bookmarked = article_id in states.bookmarked
+            self.status_loaded = True
         
         self.setObjectName("articleCard")
         self.setCursor(QtCore.Qt.PointingHandCursor)
         self._setup_ui()
         self._apply_styles()
+        if self.status_loaded:
+            self._update_buttons()
     
     def _setup_ui(self):
         """Setup UI"""
@@ -167,8 +282,13 @@ class ArticleCardCompact(QtWidgets.QFrame):
     def _load_status_if_needed(self):
         """Load like/bookmark status only when needed"""
         if not self.status_loaded:
-            self.is_liked = is_article_liked(self.article_id, self.username)
-            self.is_bookmarked = is_article_bookmarked(self.article_id, self.username)
+            if self.replica is not None and self.replica.has_interactions():
+                ids = self.replica.interaction_ids()
+                self.is_liked = self.article_id in ids['liked']
+                self.is_bookmarked = self.article_id in ids['bookmarked']
+            else:
+                self.is_liked = is_article_liked(self.article_id, self.username)
+                self.is_bookmarked = is_article_bookmarked(self.article_id, self.username)
             self.status_loaded = True
             self._update_buttons()
     
@@ -184,36 +304,51 @@ class ArticleCardCompact(QtWidgets.QFrame):
     
     def _toggle_like(self):
         """Toggle like"""
+        writes = self.replica or _DIRECT_WRITES
         if self.is_liked:
-            success = unlike_article(self.article_id, self.username)
+            success = writes.unlike_article(self.article_id, self.username)
             if success:
                 self.is_liked = False
                 self.likes = max(0, self.likes - 1)
         else:
-            success = like_article(self.article_id, self.username)
+            success = writes.like_article(self.article_id, self.username)
             if success:
                 self.is_liked = True
                 self.likes += 1
         
         if success:
+            self._sync_states()
             self._update_buttons()
     
     def _toggle_bookmark(self):
         """Toggle bookmark"""
+        writes = self.replica or _DIRECT_WRITES
         if self.is_bookmarked:
-            success = unbookmark_article(self.article_id, self.username)
+            success = writes.unbookmark_article(self.article_id, self.username)
             if success:
                 self.is_bookmarked = False
                 self.bookmarks = max(0, self.bookmarks - 1)
         else:
-            success = bookmark_article(self.article_id, self.username)
+            success = writes.bookmark_article(self.article_id, self.username)
             if success:
                 self.is_bookmarked = True
                 self.bookmarks += 1
         
         if success:
+            self._sync_states()
             self._update_buttons()
     
+    def _sync_states(self):
+        """Update status bersama supaya kartu di tab lain ikut benar"""
+        if self.states is None or not self.states.loaded:
+            return
+        for ids, active in ((self.states.liked, self.is_liked),
+                            (self.states.bookmarked, self.is_bookmarked)):
+            if active:
+                ids.add(self.article_id)
+            else:
+                ids.discard(self.article_id)
+    
     def _update_buttons(self):
         """Update button appearance"""
         # Like button
@@ -235,8 +370,8 @@ class ArticleCardCompact(QtWidgets.QFrame):
     def mousePressEvent(self, event):
         """Handle card click"""
         if event.button() == QtCore.Qt.LeftButton:
-            # Track view (async, don't wait for result)
-            QtCore.QTimer.singleShot(0, lambda: track_article_view(self.article_id, self.username))
+            # Track view (non-blocking, don't wait for result)
+            track_article_view_async(self.article_id, self.username)
             self.article_clicked.emit(self.article_id)
         super().mousePressEvent(event)
 
@@ -246,9 +381,12 @@ class ArticleListWidget(QtWidgets.QWidget):
     OPTIMIZED: Widget untuk menampilkan list dengan lazy loading
     """
     
-    def __init__(self, username: str, parent=None):
+    def __init__(self, username: str, states: Optional[InteractionState] = None,
+                 replica: Optional[FeedReplica] = None, parent=None):
         super().__init__(parent)
         self.username = username
+        self.states = states
+        self.replica = replica
         self.is_loaded = False  # Track if data has been loaded
         self._setup_ui()
     
@@ -339,7 +477,9 @@ class ArticleListWidget(QtWidgets.QWidget):
                 username=self.username,
                 views=views,
                 likes=likes,
-                bookmarks=bookmarks
+                bookmarks=bookmarks,
+                states=self.states,
+                replica=self.replica
             )
             card.article_clicked.connect(self._on_article_clicked)
             self.container_layout.insertWidget(self.container_layout.count() - 1, card)
@@ -385,17 +525,82 @@ class FastUserDashboard(QtWidgets.QMainWindow):
         self.setWindowTitle("Crypto Insight — User Dashboard")
         self.resize(1100, 700)
         
+        # Replica lokal: feed dibaca dari SQLite, sync delta di background
+        self.replica = self._open_replica()
+        self.sync_worker = None
+        self.sync_reload_pending = False
+        
+        # Prefetch dimulai SEBELUM widget dibangun, jadi query jalan paralel
+        # dengan setup UI dan first paint sudah ada datanya
+        self.states = InteractionState()
+        self.prefetch = DashboardPrefetch(self.username, self.replica, parent=self)
+        self.prefetch.start()
+        self.stats_worker = None
+        
         self._setup_ui()
         self._apply_styles()
         
-        # OPTIMIZATION: Hanya load stats, jangan load articles yet!
-        self._update_stats()
+        self.prefetch.attach(self._on_prefetched)
         
         # Heartbeat timer
         if self.session_id:
             self.hb_timer = QtCore.QTimer(self)
             self.hb_timer.timeout.connect(lambda: heartbeat(self.session_id))
             self.hb_timer.start(20000)
+        
+        if self.replica is not None:
+            self.sync_timer = QtCore.QTimer(self)
+            self.sync_timer.timeout.connect(self._sync_replica)
+            self.sync_timer.start(REPLICA_SYNC_INTERVAL_MS)
+            QtCore.QTimer.singleShot(0, self._sync_replica)
+    
+    def _open_replica(self) -> Optional[FeedReplica]:
+        try:
+            return FeedReplica(self.username)
+        except Exception as e:
+            # Replica rusak / disk read-only → dashboard tetap jalan online
+            print(f"⚠️ Feed replica unavailable: {e}")
+            return None
+    
+    def _local_feed(self) -> bool:
+        return self.replica is not None and self.replica.has_data()
+    
+    def _local_interactions(self) -> bool:
+        """Like/bookmark user ini sudah ada di replica (bukan hanya feed)"""
+        return self.replica is not None and self.replica.has_interactions()
+    
+    def _sync_replica(self):
+        """Delta sync replica di background; tab yang tampil di-reload kalau ada perubahan"""
+        if self.sync_worker is not None:
+            return
+        self.sync_worker = run_in_background(
+            self.replica.sync,
+            on_result=self._on_replica_synced,
+            parent=self
+        )
+        self.sync_worker.finished.connect(self._on_sync_finished)
+    
+    def _on_sync_finished(self):
+        self.sync_worker = None
+        if self.sync_reload_pending:
+            self.sync_reload_pending = False
+            self._sync_replica()
+    
+    def _on_replica_synced(self, result: dict):
+        if not (result['news'] or result['deleted'] or result['counters']
+                or result['interactions'] or result['replayed']):
+            return
+        if (result['interactions'] or result['replayed']) and self.replica.has_interactions():
+            self.states.load(self.replica.interaction_ids())
+            self._show_stats(self.replica.summary())
+        # Tab lain di-load ulang saat dibuka
+        for widget in self._article_lists():
+            widget.is_loaded = False
+        self._on_tab_changed(self.tabs.currentIndex())
+    
+    def _article_lists(self) -> List[ArticleListWidget]:
+        return [self.trending_list, self.popular_list, self.most_liked_list,
+                self.liked_tab, self.saved_tab]
     
     def _setup_ui(self):
         """Setup UI"""
@@ -438,6 +643,9 @@ class FastUserDashboard(QtWidgets.QMainWindow):
         
         layout.addLayout(header_layout)
         
+        # Banner degraded state (muncul saat database offline)
+        layout.addWidget(OfflineBanner())
+        
         # Tabs
         self.tabs = QtWidgets.QTabWidget()
         self.tabs.setObjectName("mainTabs")
@@ -448,11 +656,11 @@ class FastUserDashboard(QtWidgets.QMainWindow):
         self.tabs.addTab(self.news_feed_tab, "📰 News Feed")
         
         # Tab 2: Liked Articles
-        self.liked_tab = ArticleListWidget(self.username)
+        self.liked_tab = ArticleListWidget(self.username, self.states, self.replica)
         self.tabs.addTab(self.liked_tab, "❤️ Liked")
         
         # Tab 3: Saved Articles
-        self.saved_tab = ArticleListWidget(self.username)
+        self.saved_tab = ArticleListWidget(self.username, self.states, self.replica)
         self.tabs.addTab(self.saved_tab, "🔖 Saved")
         
         layout.addWidget(self.tabs)
@@ -469,15 +677,15 @@ class FastUserDashboard(QtWidgets.QMainWindow):
         self.sub_tabs.currentChanged.connect(self._on_subtab_changed)
         
         # Trending
-        self.trending_list = ArticleListWidget(self.username)
+        self.trending_list = ArticleListWidget(self.username, self.states, self.replica)
         self.sub_tabs.addTab(self.trending_list, "🔥 Trending")
         
         # Popular
-        self.popular_list = ArticleListWidget(self.username)
+        self.popular_list = ArticleListWidget(self.username, self.states, self.replica)
         self.sub_tabs.addTab(self.popular_list, "⭐ Popular")
         
         # Most Liked
-        self.most_liked_list = ArticleListWidget(self.username)
+        self.most_liked_list = ArticleListWidget(self.username, self.states, self.replica)
         self.sub_tabs.addTab(self.most_liked_list, "❤️ Most Liked")
         
         layout.addWidget(self.sub_tabs)
@@ -551,28 +759,75 @@ class FastUserDashboard(QtWidgets.QMainWindow):
             }
         """)
     
+    def _on_prefetched(self, key: str, result):
+        """Terapkan hasil DashboardPrefetch (dipanggil di UI thread)"""
+        if key == 'summary':
+            if result is None:
+                self._update_stats()
+            else:
+                self._show_stats(result)
+        elif key == 'states':
+            if result is not None:
+                self.states.load(result)
+            # Kartu trending mungkin sudah dibuat sebelum status datang
+            self._refresh_card_states()
+        elif key == 'trending':
+            if self.trending_list.is_loaded:
+                return
+            if result is None:
+                self._load_trending()
+            else:
+                self.trending_list.load_articles(result, limit=10)
+    
+    def _refresh_card_states(self):
+        """Set status like/bookmark di kartu yang sudah tampil"""
+        if not self.states.loaded:
+            return
+        for card in self.findChildren(ArticleCardCompact):
+            if not card.status_loaded:
+                card.is_liked = card.article_id in self.states.liked
+                card.is_bookmarked = card.article_id in self.states.bookmarked
+                card.status_loaded = True
+                card._update_buttons()
+    
     def _update_stats(self):
-        """Update user stats (async)"""
-        def update():
-            try:
-                summary = get_user_interaction_summary(self.username)
-                liked = summary.get('liked', 0)
-                bookmarked = summary.get('bookmarked', 0)
-                self.stats_label.setText(f"❤️ {liked} liked  •  🔖 {bookmarked} saved")
-            except Exception as e:
-                print(f"Error updating stats: {e}")
-                self.stats_label.setText("Stats unavailable")
-        
-        # Run in background (non-blocking)
-        QtCore.QTimer.singleShot(0, update)
+        """Update user stats (background thread, non-blocking)"""
+        if self.prefetch.is_pending('summary'):
+            return
+        if self._local_interactions():
+            self._show_stats(self.replica.summary())
+            return
+        if self.stats_worker is not None:
+            return
+        self.stats_worker = run_in_background(
+            get_user_interaction_summary, self.username,
+            on_result=self._show_stats,
+            on_error=lambda message: self.stats_label.setText("Stats unavailable"),
+            parent=self
+        )
+        self.stats_worker.finished.connect(self._on_stats_finished)
+    
+    def _on_stats_finished(self):
+        self.stats_worker = None
+    
+    def _show_stats(self, summary: dict):
+        liked = summary.get('liked', 0)
+        bookmarked = summary.get('bookmarked', 0)
+        self.stats_label.setText(f"❤️ {liked} liked  •  🔖 {bookmarked} saved")
     
     def _load_trending(self):
         """Load trending articles - LAZY"""
         if self.trending_list.is_loaded:
             return
+        if self.prefetch.is_pending('trending'):
+            # Hasil prefetch akan di-load oleh _on_prefetched
+            return
         
         try:
-            articles = get_trending_articles(limit=50, days=7)
+            if self._local_feed():
+                articles = self.replica.trending(limit=TRENDING_PREFETCH_LIMIT, days=TRENDING_DAYS)
+            else:
+                articles = get_trending_articles(limit=TRENDING_PREFETCH_LIMIT, days=TRENDING_DAYS)
             self.trending_list.load_articles(articles, limit=10)  # Show 10 first
         except Exception as e:
             print(f"Error loading trending: {e}")
@@ -583,7 +838,10 @@ class FastUserDashboard(QtWidgets.QMainWindow):
             return
         
         try:
-            articles = get_popular_articles(limit=50)
+            if self._local_feed():
+                articles = self.replica.popular(limit=FEED_LIMIT)
+            else:
+                articles = get_popular_articles(limit=FEED_LIMIT)
             self.popular_list.load_articles(articles, limit=10)
         except Exception as e:
             print(f"Error loading popular: {e}")
@@ -594,7 +852,10 @@ class FastUserDashboard(QtWidgets.QMainWindow):
             return
         
         try:
-            articles = get_most_liked_articles(limit=50)
+            if self._local_feed():
+                articles = self.replica.most_liked(limit=FEED_LIMIT)
+            else:
+                articles = get_most_liked_articles(limit=FEED_LIMIT)
             self.most_liked_list.load_articles(articles, limit=10)
         except Exception as e:
             print(f"Error loading most liked: {e}")
@@ -605,7 +866,10 @@ class FastUserDashboard(QtWidgets.QMainWindow):
             return
         
         try:
-            articles = get_user_liked_articles(self.username, limit=50)
+            if self._local_interactions():
+                articles = self.replica.liked(limit=FEED_LIMIT)
+            else:
+                articles = get_user_liked_articles(self.username, limit=FEED_LIMIT)
             self.liked_tab.load_articles(articles, limit=10)
         except Exception as e:
             print(f"Error loading liked articles: {e}")
@@ -616,7 +880,10 @@ class FastUserDashboard(QtWidgets.QMainWindow):
             return
         
         try:
-            articles = get_user_bookmarked_articles(self.username, limit=50)
+            if self._local_interactions():
+                articles = self.replica.bookmarked(limit=FEED_LIMIT)
+            else:
+                articles = get_user_bookmarked_articles(self.username, limit=FEED_LIMIT)
             self.saved_tab.load_articles(articles, limit=10)
         except Exception as e:
             print(f"Error loading saved articles: {e}")
@@ -650,6 +917,13 @@ class FastUserDashboard(QtWidgets.QMainWindow):
     
     def _refresh_current_tab(self):
         """Refresh current tab"""
+        if self.replica is not None:
+            # Tarik delta sekarang; tab di-reload di _on_replica_synced kalau berubah
+            if self.sync_worker is not None:
+                self.sync_reload_pending = True
+            else:
+                self._sync_replica()
+        
         current_tab = self.tabs.currentIndex()
         
         if current_tab == 0:  # News Feed
@@ -689,13 +963,25 @@ class FastUserDashboard(QtWidgets.QMainWindow):
     def closeEvent(self, event):
         """Handle window close"""
         self._logout()
+        self.prefetch.wait()
+        if self.stats_worker is not None:
+            self.stats_worker.wait(2000)
+        if self.sync_worker is not None:
+            self.sync_worker.wait(5000)
+        if self.replica is not None:
+            self.replica.close()
         event.accept()
     
+    def initial_data_shown(self) -> bool:
+        """Tab trending sudah berisi (dipakai startup_profiler untuk 'first data paint')"""
+        return self.trending_list.is_loaded
+    
     def showEvent(self, event):
         """Handle window show - load first tab"""
         super().showEvent(event)
         # Load trending articles saat pertama kali show
-        if not self.trending_list.is_loaded:
+        # (biasanya sudah terisi / sedang diisi oleh prefetch)
+        if not self.trending_list.is_loaded and not self.prefetch.is_pending('trending'):
             QtCore.QTimer.singleShot(100, self._load_trending)
 
 
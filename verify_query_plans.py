@@ -0,0 +1,366 @@
+# verify_query_plans.py — Cek plan query setiap helper data layer (PostgreSQL)
+"""
+Jalankan setiap helper app_db_fixed / app_db_interactions (daftar =
+gateway_protocol.OPERATIONS) dengan koneksi yang mengganti setiap
+cur.execute(sql, params) menjadi EXPLAIN (FORMAT JSON) sql. Tidak ada
+statement yang benar-benar dieksekusi (EXPLAIN tanpa ANALYZE), jadi aman
+juga untuk helper write (like, login, create_news, ...).
+
+Setiap scan atas tabel harus Index Scan / Index Only Scan / Bitmap Scan;
+Seq Scan = gagal (exit 1). Sort di atas index ikut ditampilkan sebagai info.
+
+Default: enable_seqscan = off, jadi yang dicek adalah "ada index yang bisa
+melayani query ini" — di database kecil planner tetap memilih Seq Scan
+walaupun index-nya ada. --natural memakai pilihan planner apa adanya
+(berguna di database hasil seed_data.py skala besar).
+
+Pakai:
+    python verify_query_plans.py
+    python verify_query_plans.py --natural --database-url postgresql://localhost/crypto_bench
+    python verify_query_plans.py --only get_user_liked_articles get_article_likers --show-plans
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+from collections import namedtuple
+from types import SimpleNamespace
+from typing import Dict, List
+
+# Helper yang tidak dicek + alasannya
+SKIP = {
+    "ensure_schema": "reads schema_migrations; checked before verification",
+}
+
+# ctx → argumen helper. Nilai diambil dari database (lihat _sample_context),
+# jadi planner melihat id/username yang benar-benar ada.
+ARGS = {
+    # ---------- app_db_fixed ----------
+    "health_check": lambda c: (),
+    "user_exists": lambda c: (c.user,),
+    "create_user": lambda c: ("plan_check_user", "password"),
+    "verify_user": lambda c: (c.user, "password"),
+    "login": lambda c: (c.user, "password"),
+    "register": lambda c: ("plan_check_user", "password"),
+    "start_session": lambda c: (c.user,),
+    "heartbeat": lambda c: (c.session_id,),
+    "end_session": lambda c: (c.session_id,),
+    "latest_presence_per_user": lambda c: (),
+    "create_news": lambda c: (c.author, "Plan check", "Plan check content", True),
+    "list_my_news": lambda c: (c.author, 50),
+    "get_author_summary": lambda c: (c.author,),
+    "list_published_news": lambda c: (50,),
+
+    # ---------- app_db_interactions ----------
+    "like_article": lambda c: (c.article, c.user),
+    "unlike_article": lambda c: (c.article, c.user),
+    "bookmark_article": lambda c: (c.article, c.user),
+    "unbookmark_article": lambda c: (c.article, c.user),
+    "track_article_view": lambda c: (c.article, c.user),
+    "is_article_liked": lambda c: (c.article, c.user),
+    "is_article_bookmarked": lambda c: (c.article, c.user),
+    "get_article_likes_count": lambda c: (c.article,),
+    "get_article_bookmarks_count": lambda c: (c.article,),
+    "get_article_views": lambda c: (c.article,),
+    "get_article_stats": lambda c: (c.article,),
+    "get_engagement_rate": lambda c: (c.article,),
+    "get_article_full_info": lambda c: (c.article, c.user),
+    "get_user_liked_articles": lambda c: (c.user, 50),
+    "get_user_bookmarked_articles": lambda c: (c.user, 50),
+    "get_article_likers": lambda c: (c.article, 50),
+    "get_user_interaction_summary": lambda c: (c.user,),
+    "get_user_interaction_ids": lambda c: (c.user,),
+    "get_trending_articles": lambda c: (10, 7),
+    "get_popular_articles": lambda c: (10,),
+    "get_most_liked_articles": lambda c: (10,),
+    "get_penerbit_stats": lambda c: (c.author,),
+
+    # ---------- replica sync ----------
+    "get_news_changes": lambda c: (None, 0, 500),
+    "get_news_counters": lambda c: (0, 5000),
+    "get_user_interaction_changes": lambda c: (c.user, None),
+}
+
+SEQUENTIAL_SCANS = ("Seq Scan", "Sample Scan")
+
+# Satu statement yang di-EXPLAIN: sql asli, sql dengan parameter literal
+# (bisa di-EXPLAIN ulang, mis. oleh app_db_index_advisor), root plan (dict JSON)
+Statement = namedtuple("Statement", "sql query plan error")
+
+
+def missing_args() -> List[str]:
+    """Helper di OPERATIONS yang belum punya ARGS/SKIP (harusnya kosong)"""
+    from gateway_protocol import OPERATIONS
+    return sorted(set(OPERATIONS) - set(ARGS) - set(SKIP))
+
+
+# ============================================
+# EXPLAIN CONNECTION
+# ============================================
+
+class _ExplainCursor:
+    """execute() → EXPLAIN; fetch*() kosong (helper melihat 'tidak ada baris')"""
+
+    def __init__(self, cursor, statements: List[Statement]):
+        self._cursor = cursor
+        self._statements = statements
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def execute(self, sql, params=None):
+        query = self._cursor.mogrify(sql, params).decode()
+        try:
+            self._cursor.execute("EXPLAIN (FORMAT JSON) " + query)
+        except Exception as e:
+            self._statements.append(Statement(sql, query, None, str(e).strip()))
+            raise
+        self._statements.append(Statement(sql, query, self._cursor.fetchone()[0][0]["Plan"], ""))
+
+    def fetchone(self):
+        return None
+
+    def fetchall(self):
+        return []
+
+
+class _ExplainConnection:
+    """Pengganti koneksi pool untuk helper; koneksi asli autocommit"""
+
+    def __init__(self, conn, statements: List[Statement]):
+        self._conn = conn
+        self._statements = statements
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __setattr__(self, name, value):
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+        # autocommit dsb. diabaikan: koneksi asli tetap autocommit
+
+    def cursor(self, *args, **kwargs):
+        return _ExplainCursor(self._conn.cursor(*args, **kwargs), self._statements)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class _ThreadMutedStdout(io.TextIOBase):
+    """Pengganti sys.stdout: output thread capture dibuang, thread lain diteruskan"""
+
+    def __init__(self, target, thread: threading.Thread):
+        self._target = target
+        self._thread = thread
+
+    def write(self, text):
+        if threading.current_thread() is self._thread:
+            return len(text)
+        return self._target.write(text)
+
+    def flush(self):
+        self._target.flush()
+
+
+def capture_plans(conn, name: str, args: tuple) -> List[Statement]:
+    """
+    Panggil helper `name` dengan connect() yang mengembalikan _ExplainConnection.
+    Override hanya di thread ini (connection_override), jadi aman dijalankan
+    dari worker di aplikasi yang sedang dipakai.
+    """
+    import app_db_fixed
+    import app_db_interactions
+    from gateway_protocol import OPERATIONS
+
+    statements: List[Statement] = []
+    explain_connect = lambda: (_ExplainConnection(conn, statements), "postgresql")
+    module = app_db_fixed if OPERATIONS[name].module == "app_db_fixed" else app_db_interactions
+    # Helper mencetak error karena fetch*() kosong — bukan urusan verifikasi
+    muted = _ThreadMutedStdout(sys.stdout, threading.current_thread())
+    with app_db_fixed.connection_override(explain_connect), contextlib.redirect_stdout(muted):
+        getattr(module, name)(*args)
+    return statements
+
+
+# ============================================
+# PLAN CHECK
+# ============================================
+
+def walk_plan(plan: dict):
+    """Semua node plan (depth-first, root dulu)"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from walk_plan(child)
+
+
+def describe_scans(plan: dict) -> List[str]:
+    """Scan tabel + sort di plan, mis. 'Index Only Scan news_pkey on news'"""
+    parts = []
+    for node in walk_plan(plan):
+        node_type = node["Node Type"]
+        relation = node.get("Relation Name")
+        if node_type == "Sort":
+            parts.append("Sort")
+        elif relation:
+            index = node.get("Index Name")
+            parts.append(f"{node_type}{' ' + index if index else ''} on {relation}")
+        elif node_type == "Bitmap Index Scan":
+            parts.append(f"Bitmap Index Scan {node.get('Index Name')}")
+    return parts
+
+
+def sequential_scans(plan: dict) -> List[str]:
+    return [node.get("Relation Name", "?") for node in walk_plan(plan)
+            if node["Node Type"] in SEQUENTIAL_SCANS]
+
+
+def format_plan(plan: dict, depth: int = 0) -> List[str]:
+    """Plan sebagai teks ringkas (mirip EXPLAIN biasa)"""
+    node = plan["Node Type"]
+    if plan.get("Index Name"):
+        node += f" using {plan['Index Name']}"
+    if plan.get("Relation Name"):
+        node += f" on {plan['Relation Name']}"
+    lines = [f"{'  ' * depth}-> {node}  (cost={plan.get('Total Cost', 0):.2f} rows={plan.get('Plan Rows', 0)})"]
+    for key in ("Index Cond", "Filter", "Sort Key"):
+        if plan.get(key):
+            value = ", ".join(plan[key]) if isinstance(plan[key], list) else plan[key]
+            lines.append(f"{'  ' * depth}     {key}: {value}")
+    for child in plan.get("Plans", []):
+        lines.extend(format_plan(child, depth + 1))
+    return lines
+
+
+def _sample_context(cur) -> SimpleNamespace:
+    """User/artikel/author/session yang ada di database (fallback demo data)"""
+    from seed_data import demo_user, demo_author
+    cur.execute("""
+        SELECT
+            (SELECT u.username FROM article_likes l JOIN users u ON u.id = l.user_id LIMIT 1),
+            (SELECT article_id FROM article_likes LIMIT 1),
+            (SELECT author FROM news WHERE status = 'published' LIMIT 1),
+            (SELECT MAX(id) FROM user_sessions);
+    """)
+    user, article, author, session_id = cur.fetchone()
+    return SimpleNamespace(user=user or demo_user(1), article=article or 1,
+                           author=author or demo_author(1), session_id=session_id or 1)
+
+
+def capture_all(conn, names: List[str] = None) -> Dict[str, List[Statement]]:
+    """Statement + plan setiap helper (semua helper di ARGS kalau names kosong)"""
+    ctx = _sample_context(conn.cursor())
+    return {name: capture_plans(conn, name, ARGS[name](ctx)) for name in names or ARGS}
+
+
+def verify(names: List[str], natural: bool = False) -> Dict[str, dict]:
+    """
+    Cek plan setiap helper.
+    Returns: {name: {'ok': bool, 'scans': [...], 'seq_scans': [...],
+                     'errors': [...], 'statements': [Statement, ...]}}
+    """
+    from app_db_fixed import _new_connection
+    conn = _new_connection()
+    conn.autocommit = True
+    results = {}
+    try:
+        if not natural:
+            conn.cursor().execute("SET enable_seqscan = off;")
+        for name, statements in capture_all(conn, names).items():
+            plans = [s.plan for s in statements if s.plan]
+            result = {
+                'statements': statements,
+                'scans': [part for plan in plans for part in describe_scans(plan)],
+                'seq_scans': [rel for plan in plans for rel in sequential_scans(plan)],
+                'errors': [s.error for s in statements if s.error],
+            }
+            result['ok'] = bool(statements) and not result['seq_scans'] and not result['errors']
+            results[name] = result
+    finally:
+        conn.close()
+    return results
+
+
+def print_results(results: Dict[str, dict], show_plans: bool = False):
+    print(f"{'':3}{'helper':<32}{'stmts':>6}  plan")
+    for name, r in results.items():
+        icon = "✅" if r['ok'] else "❌"
+        if r['errors']:
+            summary = f"EXPLAIN failed: {r['errors'][0]}"
+        elif not r['statements']:
+            summary = "no statement executed"
+        else:
+            summary = ", ".join(dict.fromkeys(r['scans'])) or "(no table scan)"
+        print(f"{icon} {name:<32}{len(r['statements']):>6}  {summary}")
+        if show_plans or not r['ok']:
+            for statement in r['statements']:
+                if statement.plan:
+                    for line in format_plan(statement.plan):
+                        print(f"      {line}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Assert every data-layer helper uses index scans")
+    parser.add_argument("--only", nargs="+", metavar="HELPER", help="cek helper ini saja")
+    parser.add_argument("--natural", action="store_true",
+                        help="jangan matikan enable_seqscan (pakai pilihan planner apa adanya)")
+    parser.add_argument("--show-plans", action="store_true", help="tampilkan plan setiap statement")
+    parser.add_argument("--database-url", help="Postgres tujuan (menimpa config.ini)")
+    args = parser.parse_args()
+
+    os.environ["CRYPTO_INSIGHT_BACKEND"] = "postgres"
+    os.environ["CRYPTO_INSIGHT_TRANSPORT"] = "direct"
+    if args.database_url:
+        os.environ["CRYPTO_INSIGHT_DATABASE_URL"] = args.database_url
+
+    missing = missing_args()
+    if missing:
+        print(f"❌ Helpers without plan-check arguments: {', '.join(missing)}")
+        return 1
+    names = args.only or list(ARGS)
+    unknown = [name for name in names if name not in ARGS]
+    if unknown:
+        print(f"❌ Unknown helper(s): {', '.join(unknown)}")
+        return 1
+
+    from app_db_migrations import pending_migrations
+    pending = pending_migrations()
+    if pending is None:
+        print("❌ Cannot connect to database")
+        return 1
+    if pending:
+        print(f"❌ {len(pending)} pending migration(s) — run python run_migration.py first")
+        return 1
+
+    try:
+        results = verify(names, natural=args.natural)
+    except Exception as e:
+        print(f"❌ Plan verification failed: {e}")
+        return 1
+
+    mode = "planner choice" if args.natural else "enable_seqscan=off"
+    print(f"🔍 Query plans for {len(results)} helpers ({mode})")
+    for name, reason in SKIP.items():
+        print(f"   skipped {name}: {reason}")
+    print()
+    print_results(results, args.show_plans)
+
+    failed = [name for name, r in results.items() if not r['ok']]
+    print()
+    if failed:
+        print(f"❌ {len(failed)} helper(s) without an index plan: {', '.join(failed)}")
+        return 1
+    print("✅ Every helper plan uses index scans")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())